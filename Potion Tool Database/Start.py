@@ -2,38 +2,42 @@
 from __future__ import annotations
 
 import sys
-from PySide6.QtWidgets import QApplication
-from qt_material import apply_stylesheet
 
 from config import Config
+from startup_profile import StartupProfiler
 
-# Infrastructure
-from infrastructure.repositories import JsonIngredientRepo, JsonRecipeRepo, JsDataRepo
+# Les modules lourds (PySide6, services, presenters, onglets) sont importés dans
+# build_container() / main() : importer Start reste quasi gratuit et le profileur
+# de démarrage peut mesurer chaque import.
 
-# Application services
-from application.validators import ValidationService
-from application.integrity import IntegrityService
+def build_container(cfg: Config):
+    # Infrastructure
+    from infrastructure.repositories import JsonIngredientRepo, JsonRecipeRepo, JsDataRepo
 
-# Presenters
-from adapters.presenters import (
-    BooksPresenter,
-    IngredientsPresenter,
-    OriginsPresenter,
-    InspectionPresenter,
-    RecipesPresenter,
-)
+    # Application services
+    from application.validators import ValidationService
+    from application.integrity import IntegrityService
+    from application.suggestions import SuggestionsService
+    from application.search import SearchService
+    from application.where_used import WhereUsedIndex
+    from application.usage_counters import UsageCounters
 
-# UI
-from UI.main_window import MainWindow
+    # Presenters
+    from adapters.presenters import (
+        BooksPresenter,
+        IngredientsPresenter,
+        OriginsPresenter,
+        InspectionPresenter,
+        RecipesPresenter,
+    )
 
-from application.use_cases import (
-    CreateIngredient, UpdateIngredient, DeleteIngredient, DuplicateIngredient,
-    CreateRecipe, UpdateRecipe, DeleteRecipe, DuplicateRecipe,
-    AddBook, RenameBook, RemoveBook, MigrateBookRefs,
-    AddOrigin, RenameOrigin, RemoveOrigin, MigrateOriginRefs
-)
+    from application.use_cases import (
+        CreateIngredient, UpdateIngredient, DeleteIngredient, DuplicateIngredient,
+        CreateRecipe, UpdateRecipe, DeleteRecipe, DuplicateRecipe,
+        AddBook, RenameBook, RemoveBook, MigrateBookRefs,
+        AddOrigin, RenameOrigin, RemoveOrigin, MigrateOriginRefs
+    )
 
-def build_container(cfg: Config):
     # Repositories
     ingredients_repo = JsonIngredientRepo(cfg.ingredients_path)
     recipes_repo = JsonRecipeRepo(cfg.recipes_path)
@@ -50,18 +54,22 @@ def build_container(cfg: Config):
         recipes_repo=recipes_repo,
         data_repo=data_repo,
     )
+    suggestions = SuggestionsService(ingredients_repo, recipes_repo)
+    search = SearchService(ingredients_repo, recipes_repo, data_repo)
+    where_used = WhereUsedIndex(recipes_repo)
+    usage = UsageCounters(ingredients_repo, recipes_repo)
 
     # Presenters
-    books_presenter = BooksPresenter(data_repo, ingredients_repo)
-    ingredients_presenter = IngredientsPresenter(ingredients_repo, data_repo, recipes_repo)
-    origins_presenter = OriginsPresenter(data_repo, ingredients_repo)
+    books_presenter = BooksPresenter(data_repo, ingredients_repo, usage)
+    ingredients_presenter = IngredientsPresenter(ingredients_repo, data_repo, recipes_repo, search)
+    origins_presenter = OriginsPresenter(data_repo, ingredients_repo, usage)
     inspection_presenter = InspectionPresenter(integrity)
-    recipes_presenter = RecipesPresenter(recipes_repo, ingredients_repo)
+    recipes_presenter = RecipesPresenter(recipes_repo, ingredients_repo, search)
 
     # Use-cases (ingrédients – ceux nécessaires pour ce tab)
     uc_create_ing = CreateIngredient(ingredients_repo, validator)
     uc_update_ing = UpdateIngredient(ingredients_repo, validator)
-    uc_delete_ing = DeleteIngredient(ingredients_repo, validator)
+    uc_delete_ing = DeleteIngredient(ingredients_repo, validator, where_used)
     uc_duplicate_ing = DuplicateIngredient(ingredients_repo, validator)
 
     return {
@@ -73,6 +81,10 @@ def build_container(cfg: Config):
         "services": {
             "validator": validator,
             "integrity": integrity,
+            "suggestions": suggestions,
+            "search": search,
+            "where_used": where_used,
+            "usage": usage,
             },
         "presenters": {
             "books": books_presenter,
@@ -97,7 +109,7 @@ def build_container(cfg: Config):
             "books": {
                 "add":          AddBook(data_repo, validator),
                 "rename":       RenameBook(data_repo, validator),
-                "remove":       RemoveBook(data_repo, validator),
+                "remove":       RemoveBook(data_repo, validator, usage),
                 "migrate_refs": MigrateBookRefs(data_repo, ingredients_repo, recipes_repo, validator),
                 },
             "origins": {
@@ -113,11 +125,24 @@ def build_container(cfg: Config):
 
 
 def main():
+    # POTION_PROFILE_STARTUP=1 : rapport imports + phases au premier affichage
+    profiler = StartupProfiler.from_env()
+    profiler.start()
+
+    from PySide6.QtWidgets import QApplication
+    from UI.main_window import MainWindow
+    profiler.mark("imports UI")
+
     app = QApplication(sys.argv)
+    profiler.mark("QApplication")
     cfg = Config.load()
+    profiler.mark("config")
     container = build_container(cfg)
+    profiler.mark("container")
 
     win = MainWindow(cfg, container, app)
+    profiler.mark("fenêtre")
+    profiler.watch_first_paint(win, app)
     win.show()
     sys.exit(app.exec())
 
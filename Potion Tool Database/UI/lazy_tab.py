@@ -0,0 +1,91 @@
+"""
+Onglets construits à la demande.
+
+LazyTab est un emplacement léger ajouté au QTabWidget : l'onglet réel (et son
+refresh() initial) n'est construit qu'à la première activation, ou plus tôt en
+tâche de fond par TabPrebuilder, un onglet par passage de la boucle d'événements.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QTabWidget, QVBoxLayout, QWidget
+
+
+class LazyTab(QWidget):
+    """Emplacement d'onglet : factory() n'est appelée qu'une fois, par ensure_built()."""
+
+    built = Signal(QWidget)
+
+    def __init__(self, factory: Callable[[], QWidget], parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._factory = factory
+        self._widget: Optional[QWidget] = None
+        self._lay = QVBoxLayout(self)
+        self._lay.setContentsMargins(0, 0, 0, 0)
+
+    def is_built(self) -> bool:
+        return self._widget is not None
+
+    def widget(self) -> Optional[QWidget]:
+        """Onglet réel, ou None s'il n'est pas encore construit."""
+        return self._widget
+
+    def ensure_built(self) -> QWidget:
+        if self._widget is None:
+            w = self._factory()
+            self._factory = None  # libère les références capturées
+            self._lay.addWidget(w)
+            self._widget = w
+            self.built.emit(w)
+        return self._widget
+
+    def refresh(self) -> None:
+        """Construit l'onglet s'il ne l'est pas (le constructeur rafraîchit déjà), sinon le rafraîchit."""
+        if self._widget is None:
+            self.ensure_built()
+        elif hasattr(self._widget, "refresh"):
+            self._widget.refresh()
+
+
+class TabPrebuilder(QObject):
+    """
+    Construit les LazyTab restants quand l'application est inactive : un onglet par
+    tick de minuterie, pour que la fenêtre reste réactive entre deux constructions.
+    """
+
+    def __init__(self, tabs: QTabWidget, delay_ms: int = 300, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent or tabs)
+        self._tabs = tabs
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._build_next)
+
+    def start(self) -> None:
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def _pending(self) -> List[LazyTab]:
+        out: List[LazyTab] = []
+        for i in range(self._tabs.count()):
+            w = self._tabs.widget(i)
+            if isinstance(w, LazyTab) and not w.is_built():
+                out.append(w)
+        return out
+
+    def _build_next(self) -> None:
+        pending = self._pending()
+        if not pending:
+            return
+        try:
+            pending[0].ensure_built()
+        except Exception:
+            return  # retenté (erreur visible) à l'activation de l'onglet
+        if len(pending) > 1:
+            self._timer.setInterval(0)
+            self._timer.start()
@@ -0,0 +1,347 @@
+"""
+Listes Qt model/view adossées aux view-models des presenters.
+
+ViewModelListModel expose directement la liste de VMs (aucun QListWidgetItem par ligne) ;
+un rafraîchissement ne fait qu'émettre dataChanged / layoutChanged, la sélection
+étant reportée par nom. DeletableListView remplace DeletableList (QListWidget)
+pour les grandes listes : lignes de hauteur uniforme, peinture virtualisée.
+
+CheckListModel + CheckListDelegate : listes cochables (livres, origines, réactifs)
+sans QCheckBox par ligne ; l'indentation de profondeur est peinte par le délégué.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import Qt, QAbstractListModel, QEvent, QModelIndex, QSize, Signal
+from PySide6.QtWidgets import QAbstractItemView, QListView, QStyledItemDelegate, QStyleOptionViewItem
+
+
+class ViewModelListModel(QAbstractListModel):
+    """
+    Modèle de liste sur des VMs ayant un attribut .name.
+    - text(vm)    : libellé affiché
+    - tooltip(vm) : info-bulle (optionnelle, calculée à l'affichage seulement)
+    Qt.UserRole renvoie le nom, comme les items des anciennes QListWidget.
+    """
+
+    NameRole = Qt.UserRole
+
+    def __init__(
+        self,
+        text: Callable[[Any], str],
+        tooltip: Optional[Callable[[Any], Optional[str]]] = None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self._text = text
+        self._tooltip = tooltip
+        self._items: List[Any] = []
+        self._rows: Optional[Dict[str, int]] = None   # nom -> 1re ligne, construit à la demande
+
+    # --- API Qt ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        vm = self._items[index.row()]
+        if role == Qt.DisplayRole:
+            return self._text(vm)
+        if role == Qt.ToolTipRole:
+            return self._tooltip(vm) if self._tooltip else None
+        if role == self.NameRole:
+            return vm.name
+        return None
+
+    # --- API ---
+
+    def items(self) -> List[Any]:
+        return list(self._items)
+
+    def name_at(self, row: int) -> Optional[str]:
+        return self._items[row].name if 0 <= row < len(self._items) else None
+
+    def row_of(self, name: str) -> int:
+        """Ligne du nom (1re occurrence), -1 si absent."""
+        if self._rows is None:
+            rows: Dict[str, int] = {}
+            for i, vm in enumerate(self._items):
+                rows.setdefault(vm.name, i)
+            self._rows = rows
+        return self._rows.get(name, -1)
+
+    def set_items(self, items: Sequence[Any]) -> None:
+        """
+        Remplace les VMs. Mêmes noms dans le même ordre : un seul dataChanged.
+        Sinon : retrait des lignes disparues, ajout des nouvelles en fin de liste
+        (le nombre de lignes ne change jamais pendant un layoutChanged), puis
+        layoutChanged vers l'ordre final ; les index persistants (sélection,
+        courant) suivent leur nom.
+        """
+        items = list(items)
+        old = self._items
+        if len(old) == len(items) and all(a.name == b.name for a, b in zip(old, items)):
+            self._items = items
+            if items:
+                self.dataChanged.emit(self.index(0), self.index(len(items) - 1))
+            return
+
+        wanted = Counter(vm.name for vm in items)
+        gone = []
+        for row, vm in enumerate(old):
+            if wanted[vm.name] > 0:
+                wanted[vm.name] -= 1
+            else:
+                gone.append(row)
+        for first, last in reversed(_row_ranges(gone)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del old[first:last + 1]
+            self._rows = None
+            self.endRemoveRows()
+        added = []   # noms nouveaux (ou doublons en plus) : les VMs elles-mêmes sont remplacées ensuite
+        for vm in items:
+            if wanted[vm.name] > 0:
+                wanted[vm.name] -= 1
+                added.append(vm)
+        if added:
+            self.beginInsertRows(QModelIndex(), len(old), len(old) + len(added) - 1)
+            old.extend(added)
+            self._rows = None
+            self.endInsertRows()
+
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        names = [old[p.row()].name if 0 <= p.row() < len(old) else None for p in persistent]
+        self._items = items
+        self._rows = None
+        moved = []
+        for name in names:
+            row = self.row_of(name) if name is not None else -1
+            moved.append(self.index(row) if row >= 0 else QModelIndex())
+        self.changePersistentIndexList(persistent, moved)
+        self.layoutChanged.emit()
+
+    def put(self, item: Any, key: Callable[[Any], Any]) -> int:
+        """
+        Insère ou remplace (même nom) une seule ligne dans une liste triée par key :
+        dataChanged si elle reste à sa place, sinon retrait + insertion. Renvoie la ligne.
+        """
+        items = self._items
+        row = self.row_of(item.name)
+        if row >= 0:
+            k = key(item)
+            if (row == 0 or key(items[row - 1]) <= k) and (row + 1 == len(items) or k <= key(items[row + 1])):
+                items[row] = item
+                self.dataChanged.emit(self.index(row), self.index(row))
+                return row
+            self.remove(item.name)
+        row = bisect.bisect_right([key(vm) for vm in items], key(item))   # pas de key= : Python < 3.10
+        self.beginInsertRows(QModelIndex(), row, row)
+        items.insert(row, item)
+        self._rows = None
+        self.endInsertRows()
+        return row
+
+    def remove(self, name: str) -> bool:
+        """Retire la ligne de ce nom (1re occurrence) ; False si absente."""
+        row = self.row_of(name)
+        if row < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._items[row]
+        self._rows = None
+        self.endRemoveRows()
+        return True
+
+
+def _row_ranges(rows: List[int]) -> List[Tuple[int, int]]:
+    """Lignes croissantes -> plages contiguës (première, dernière)."""
+    out: List[Tuple[int, int]] = []
+    for row in rows:
+        if out and out[-1][1] == row - 1:
+            out[-1] = (out[-1][0], row)
+        else:
+            out.append((row, row))
+    return out
+
+
+class DeletableListView(QListView):
+    """
+    QListView multi-sélection avec suppression via 'Del' ; double-clic / Entrée -> callback.
+    Lignes de hauteur uniforme : seules les lignes visibles sont mesurées et peintes.
+    """
+
+    def __init__(self, model: ViewModelListModel, on_delete_callback=None, on_activate_callback=None, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setUniformItemSizes(True)
+        self._on_delete = on_delete_callback
+        if on_activate_callback:
+            self.doubleClicked.connect(lambda _: on_activate_callback())
+
+    def keyPressEvent(self, e):
+        if e.key() in (Qt.Key_Delete, Qt.Key_Backspace):
+            if self._on_delete:
+                self._on_delete()
+            e.accept()
+            return
+        super().keyPressEvent(e)
+
+    def selected_names(self) -> List[str]:
+        model = self.model()
+        rows = sorted(i.row() for i in self.selectionModel().selectedRows())
+        return [n for n in (model.name_at(r) for r in rows) if n]
+
+    def select_name(self, name: str) -> bool:
+        row = self.model().row_of(name)
+        if row < 0:
+            return False
+        index = self.model().index(row)
+        self.setCurrentIndex(index)
+        self.scrollTo(index)
+        return True
+
+
+class CheckListModel(QAbstractListModel):
+    """
+    Lignes cochables (libellé, clé, profondeur) + ensemble des clés cochées.
+    - exclusive  : une seule clé cochée à la fois (filtre d'origine)
+    - toggled    : émis sur coche utilisateur uniquement (pas sur set_checked)
+    - set_filter : n'affiche qu'une partie des lignes ; les coches masquées sont conservées
+    """
+
+    toggled = Signal()
+
+    KeyRole = Qt.UserRole
+    DepthRole = Qt.UserRole + 1
+
+    def __init__(self, *, exclusive: bool = False, size_hint: Optional[QSize] = None, parent=None) -> None:
+        super().__init__(parent)
+        self.exclusive = exclusive
+        self._size_hint = size_hint
+        self._all: List[Tuple[str, str, int]] = []
+        self._rows: List[Tuple[str, str, int]] = []     # lignes affichées (filtre)
+        self._checked: set = set()
+
+    # --- API Qt ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        label, key, depth = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return label
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if key in self._checked else Qt.Unchecked
+        if role == self.KeyRole:
+            return key
+        if role == self.DepthRole:
+            return depth
+        if role == Qt.SizeHintRole:
+            return self._size_hint
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        key = self._rows[index.row()][1]
+        if Qt.CheckState(value) == Qt.Checked:
+            if self.exclusive and self._checked - {key}:
+                self._checked = {key}
+                self._all_changed()
+            else:
+                self._checked.add(key)
+                self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        else:
+            self._checked.discard(key)
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.toggled.emit()
+        return True
+
+    # --- API ---
+
+    def set_rows(self, rows: Iterable[Tuple[str, str, int]]) -> None:
+        """(libellé, clé, profondeur) ; rien n'est coché après."""
+        self.beginResetModel()
+        self._all = list(rows)
+        self._rows = self._all
+        self._checked = set()
+        self.endResetModel()
+
+    def set_filter(self, keep: Optional[Callable[[Tuple[str, str, int]], bool]]) -> None:
+        """N'affiche que les lignes où keep(ligne) est vrai (None : toutes)."""
+        self.beginResetModel()
+        self._rows = self._all if keep is None else [row for row in self._all if keep(row)]
+        self.endResetModel()
+
+    def visible_count(self) -> int:
+        return len(self._rows)
+
+    def keys(self) -> List[str]:
+        """Toutes les clés, filtre ignoré."""
+        return [key for _, key, _ in self._all]
+
+    def checked_keys(self) -> List[str]:
+        """Clés cochées, dans l'ordre des lignes (masquées comprises)."""
+        if not self._checked:
+            return []
+        return [key for _, key, _ in self._all if key in self._checked]
+
+    def set_checked(self, keys: Iterable[str]) -> None:
+        """Coche exactement ces clés (sans émettre toggled)."""
+        checked = set(keys)
+        if checked != self._checked:
+            self._checked = checked
+            self._all_changed()
+
+    def _all_changed(self) -> None:
+        if self._rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1), [Qt.CheckStateRole])
+
+
+class CheckListDelegate(QStyledItemDelegate):
+    """
+    Case + libellé peints (pas de widget), décalés de indent px par niveau de profondeur ;
+    un clic n'importe où sur la ligne bascule la coche, comme le libellé d'une QCheckBox.
+    """
+
+    def __init__(self, indent: int = 0, parent=None) -> None:
+        super().__init__(parent)
+        self.indent = indent
+
+    def _shifted(self, option, index) -> QStyleOptionViewItem:
+        opt = QStyleOptionViewItem(option)
+        depth = index.data(CheckListModel.DepthRole) or 0
+        if self.indent and depth:
+            opt.rect = opt.rect.adjusted(self.indent * depth, 0, 0, 0)
+        return opt
+
+    def paint(self, painter, option, index) -> None:
+        super().paint(painter, self._shifted(option, index), index)
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        etype = event.type()
+        if etype in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick, QEvent.MouseButtonRelease):
+            opt = self._shifted(option, index)
+            if event.button() != Qt.LeftButton or not opt.rect.contains(event.position().toPoint()):
+                return False
+            if etype == QEvent.MouseButtonRelease:
+                checked = index.data(Qt.CheckStateRole) == Qt.Checked
+                model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+            return True
+        return super().editorEvent(event, model, self._shifted(option, index), index)
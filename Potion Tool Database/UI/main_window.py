@@ -1,18 +1,23 @@
 # UI/main_window.py
 from __future__ import annotations
+import importlib
 from PySide6.QtWidgets import (
     QMainWindow, QTabWidget, QWidget, QToolButton, QDialog, QVBoxLayout,
     QHBoxLayout, QLabel, QComboBox, QCheckBox, QDialogButtonBox
 )
 from PySide6.QtCore import Qt, QSettings
 from PySide6.QtGui import QIcon
-from qt_material import apply_stylesheet
 
-from UI.tabs.inspection import InspectionTab
-from UI.tabs.ingredients import IngredientsTab
-from UI.tabs.recipes import RecipesTab
-from UI.tabs.books import BooksTab
-from UI.tabs.origins import OriginsTab
+from UI.lazy_tab import LazyTab, TabPrebuilder
+from UI.theme_cache import ThemeCache, default_cache_dir
+
+
+def _tab_factory(module: str, cls: str, container):
+    """Fabrique d'onglet : le module (et ses dialogues) n'est importé qu'à la construction."""
+    def build():
+        return getattr(importlib.import_module(module), cls)(container)
+    return build
+
 
 class MainWindow(QMainWindow):
     THEMES = ("red", "pink", "purple", "blue", "cyan", "teal", "lightgreen", "yellow", "amber")
@@ -31,6 +36,7 @@ class MainWindow(QMainWindow):
         self.settings = QSettings("UnifoxGameStudio", "PotionDBTool")
         self._is_dark = self.settings.value("ui/is_dark", True, type=bool)
         self._theme_color = self.settings.value("ui/theme_color", "teal", type=str)
+        self._themes = ThemeCache(default_cache_dir("UnifoxGameStudio", "PotionDBTool"))
         # **NE PAS** appeler _update_theme_button_caption ici (le bouton n’existe pas encore)
         self._apply_theme()
 
@@ -45,23 +51,31 @@ class MainWindow(QMainWindow):
             }
             """)
 
-        self._tab_inspection = InspectionTab(container)
+        # onglets construits à la première activation (LazyTab) : au démarrage,
+        # seul l'onglet visible paie son refresh() initial
+        self._tab_inspection = LazyTab(_tab_factory("UI.tabs.inspection", "InspectionTab", container))
         self._tabs.addTab(self._tab_inspection, QIcon(), "Analyse")
 
-        self._tab_ingredients = IngredientsTab(container)
+        self._tab_ingredients = LazyTab(_tab_factory("UI.tabs.ingredients", "IngredientsTab", container))
         self._tabs.addTab(self._tab_ingredients, QIcon(), "Ingrédients")
 
-        self._tab_recipes = RecipesTab(container)
+        self._tab_recipes = LazyTab(_tab_factory("UI.tabs.recipes", "RecipesTab", container))
         self._tabs.addTab(self._tab_recipes, QIcon(), "Recettes")
 
-        self._tab_books = BooksTab(container)
+        self._tab_books = LazyTab(_tab_factory("UI.tabs.books", "BooksTab", container))
         self._tabs.addTab(self._tab_books, QIcon(), "Livres")
 
-        self._tab_origins = OriginsTab(container)
+        self._tab_origins = LazyTab(_tab_factory("UI.tabs.origins", "OriginsTab", container))
         self._tabs.addTab(self._tab_origins, QIcon(), "Origines")
 
+        self._tabs.currentWidget().ensure_built()
         self._tabs.currentChanged.connect(self._maybe_refresh)
 
+        # les autres onglets se construisent pendant les temps morts (désactivable)
+        self._prebuilder = TabPrebuilder(self._tabs)
+        if self.settings.value("ui/prebuild_tabs", True, type=bool):
+            self._prebuilder.start()
+
         # ----- Panneau corner: [Dark/Light] [Config] -----
         corner = QWidget(self)
         hlay = QHBoxLayout(corner)
@@ -86,15 +100,15 @@ class MainWindow(QMainWindow):
         corner.setFixedHeight(46)
         self._tabs.setCornerWidget(corner, Qt.TopRightCorner)
 
-        # maintenant que les boutons existent, on peut MAJ le libellé et appliquer thème
-        self._apply_theme()
-        self._update_theme_button_caption()
-
         # maintenant que le bouton existe, on peut MAJ le libellé
+        # (le thème est déjà appliqué : la feuille de style de l'app couvre les nouveaux widgets)
         self._update_theme_button_caption()
 
     def _maybe_refresh(self, idx: int):
         w: QWidget = self._tabs.widget(idx)
+        if isinstance(w, LazyTab) and not w.is_built():
+            w.ensure_built()  # le constructeur de l'onglet rafraîchit déjà
+            return
         if hasattr(w, "refresh"):
             try:
                 w.refresh()
@@ -118,11 +132,12 @@ class MainWindow(QMainWindow):
         if c not in self.THEMES:
             c = "blue"
         theme_name = f"{'dark' if is_dark else 'light'}_{c}.xml"
+        # QSS rendu une fois par thème (cache mémoire + disque), appliqué par setStyleSheet
         try:
-            apply_stylesheet(self.app, theme=theme_name, invert_secondary=(not is_dark and False))
+            self._themes.apply(self.app, theme_name, invert_secondary=(not is_dark and False))
         except Exception:
             # fallback sûr
-            apply_stylesheet(self.app, theme='dark_blue.xml' if is_dark else 'light_blue.xml')
+            self._themes.apply(self.app, 'dark_blue.xml' if is_dark else 'light_blue.xml')
 
     def _preview_theme(self, *, is_dark: bool | None = None, color: str | None = None):
         """
@@ -0,0 +1,247 @@
+"""
+Requêtes de liste hors du thread GUI (QThreadPool), avec anti-rebond.
+
+LatestQuery : chaque frappe relance l'anti-rebond ; à son expiration, prepare() lit
+les widgets (thread GUI) et renvoie la fonction de requête, exécutée sur le pool.
+Seul le résultat de la requête la plus récente est appliqué : une requête en file
+est retirée quand une plus récente arrive, une requête déjà lancée voit son
+résultat ignoré.
+
+BackgroundJob : un calcul long (analyse) sur le pool, avec progression et annulation.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+DEFAULT_DELAY_MS = 150
+
+
+class _Signals(QObject):
+    finished = Signal(int, bool, object)    # génération, succès, résultat ou exception
+
+
+class _QueryTask(QRunnable):
+    def __init__(self, generation: int, fn: Callable[[], Any], signals: _Signals, is_current) -> None:
+        super().__init__()
+        self.generation = generation
+        self.fn = fn
+        self.signals = signals
+        self.is_current = is_current
+
+    def run(self) -> None:
+        if not self.is_current(self.generation):
+            self.signals.finished.emit(self.generation, True, None)  # dépassée avant de démarrer
+            return
+        try:
+            result = self.fn()
+        except Exception as e:
+            self.signals.finished.emit(self.generation, False, e)
+            return
+        self.signals.finished.emit(self.generation, True, result)
+
+
+class LatestQuery(QObject):
+    """
+    - prepare() : thread GUI ; lit filtres / texte et renvoie une fonction sans argument
+    - apply(result) : thread GUI ; reçoit le résultat de la dernière requête seulement
+    La fonction renvoyée ne doit pas toucher aux widgets (elle tourne sur le pool).
+    """
+
+    def __init__(
+        self,
+        prepare: Callable[[], Callable[[], Any]],
+        apply: Callable[[Any], None],
+        *,
+        delay_ms: int = DEFAULT_DELAY_MS,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self._prepare = prepare
+        self._apply = apply
+        self._on_error = on_error
+        self._generation = 0
+        self._tasks: Dict[int, _QueryTask] = {}   # lancées, gardées en vie jusqu'à finished
+
+        # un seul thread : les requêtes s'exécutent dans l'ordre, les anciennes en file se retirent
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        self._signals = _Signals(self)
+        self._signals.finished.connect(self._on_finished)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+
+    def request(self, *_) -> None:
+        """Relance l'anti-rebond (connectable directement à textChanged & co)."""
+        self._timer.start()
+
+    def run_now(self) -> None:
+        """Exécute tout de suite, dans le thread courant ; les requêtes en cours deviennent obsolètes."""
+        self._timer.stop()
+        self._cancel_pending()
+        self._generation += 1
+        self._apply(self._prepare()())
+
+    def cancel(self) -> None:
+        self._timer.stop()
+        self._cancel_pending()
+        self._generation += 1
+
+    def pending(self) -> bool:
+        """Anti-rebond armé ou requête en file / en cours."""
+        return self._timer.isActive() or bool(self._tasks)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Attend la fin des requêtes lancées (tests, fermeture)."""
+        return self._pool.waitForDone(msecs)
+
+    # --- internals ---
+
+    def _is_current(self, generation: int) -> bool:
+        return generation == self._generation
+
+    def _cancel_pending(self) -> None:
+        """Retire de la file les requêtes pas encore démarrées."""
+        for generation, task in list(self._tasks.items()):
+            if self._pool.tryTake(task):
+                del self._tasks[generation]
+
+    def _start(self) -> None:
+        self._cancel_pending()
+        self._generation += 1
+        task = _QueryTask(self._generation, self._prepare(), self._signals, self._is_current)
+        task.setAutoDelete(False)  # gardée côté Python (tryTake, durée de vie)
+        self._tasks[self._generation] = task
+        self._pool.start(task)
+
+    def _on_finished(self, generation: int, ok: bool, payload: Any) -> None:
+        self._tasks.pop(generation, None)
+        if generation != self._generation:
+            return  # une requête plus récente a été lancée entre-temps
+        if ok:
+            self._apply(payload)
+        elif self._on_error is not None:
+            self._on_error(payload)
+        else:
+            sys.excepthook(type(payload), payload, payload.__traceback__)
+
+
+# ---------------------------
+# Calcul long avec progression
+# ---------------------------
+
+class JobCancelled(Exception):
+    """Levée par report() dans un BackgroundJob annulé : interrompt le calcul."""
+
+
+class _JobSignals(QObject):
+    progress = Signal(int, int, int)        # génération, fait, total
+    finished = Signal(int, bool, object)    # génération, succès, résultat ou exception
+
+
+class _JobTask(QRunnable):
+    def __init__(self, generation: int, fn: Callable[[Callable[[int, int], None]], Any],
+                 signals: _JobSignals) -> None:
+        super().__init__()
+        self.generation = generation
+        self.fn = fn
+        self.signals = signals
+        self.stop = threading.Event()
+
+    def report(self, done: int, total: int) -> None:
+        if self.stop.is_set():
+            raise JobCancelled()
+        self.signals.progress.emit(self.generation, done, total)
+
+    def run(self) -> None:
+        try:
+            result = self.fn(self.report)
+        except Exception as e:  # JobCancelled compris : ignoré côté GUI (génération dépassée)
+            self.signals.finished.emit(self.generation, False, e)
+            return
+        self.signals.finished.emit(self.generation, True, result)
+
+
+class BackgroundJob(QObject):
+    """
+    - start(fn) : fn(report) tourne sur le pool ; report(fait, total) publie la progression
+      et lève JobCancelled une fois le calcul annulé (fn la laisse simplement remonter)
+    - progress / finished / failed / cancelled : émis dans le thread GUI, pour le
+      calcul courant uniquement ; start() annule le calcul précédent.
+    """
+
+    progress = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(object)
+    cancelled = Signal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._generation = 0
+        self._current: Optional[_JobTask] = None
+        self._tasks: Dict[int, _JobTask] = {}   # lancées, gardées en vie jusqu'à finished
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        self._signals = _JobSignals(self)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.finished.connect(self._on_finished)
+
+    def start(self, fn: Callable[[Callable[[int, int], None]], Any]) -> None:
+        self._stop_current()
+        self._generation += 1
+        task = _JobTask(self._generation, fn, self._signals)
+        task.setAutoDelete(False)
+        self._tasks[self._generation] = task
+        self._current = task
+        self._pool.start(task)
+
+    def cancel(self) -> None:
+        """Annule le calcul courant (s'il y en a un) et émet cancelled tout de suite."""
+        if self._current is None:
+            return
+        self._stop_current()
+        self._generation += 1
+        self.cancelled.emit()
+
+    def is_running(self) -> bool:
+        """Un calcul courant (non annulé) est en file ou en cours."""
+        return self._current is not None
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Attend la fin des calculs lancés (tests, fermeture)."""
+        return self._pool.waitForDone(msecs)
+
+    # --- internals ---
+
+    def _stop_current(self) -> None:
+        task, self._current = self._current, None
+        if task is None:
+            return
+        task.stop.set()
+        if self._pool.tryTake(task):   # pas encore démarré
+            self._tasks.pop(task.generation, None)
+
+    def _on_progress(self, generation: int, done: int, total: int) -> None:
+        if generation == self._generation and self._current is not None:
+            self.progress.emit(done, total)
+
+    def _on_finished(self, generation: int, ok: bool, payload: Any) -> None:
+        self._tasks.pop(generation, None)
+        if generation != self._generation or self._current is None:
+            return  # annulé ou remplacé entre-temps
+        self._current = None
+        if ok:
+            self.finished.emit(payload)
+        else:
+            self.failed.emit(payload)
@@ -10,6 +10,7 @@ from PySide6.QtWidgets import (
 )
 
 from domain.errors import PotionDBError, DuplicateNameError, ValidationError
+from application.search_index import fold
 
 
 # ---------- helpers ----------
@@ -123,12 +124,14 @@ class BooksTab(QWidget):
         self._refresh_list()
 
     def _refresh_list(self):
-        q = (self.search.text() or "").strip().lower()
+        q = fold((self.search.text() or "").strip())
         self.list.clear()
         for row in self._all_rows:
-            if q and q not in row.title.lower():
+            if q and q not in fold(row.title):
                 continue
             text = f"{row.title} — {row.usage_count} ingrédient(s)"
+            if row.recipe_count:
+                text += f", {row.recipe_count} recette(s)"
             it = QListWidgetItem(text)
             it.setData(Qt.UserRole, row.title)
             self.list.addItem(it)
@@ -180,18 +183,28 @@ class BooksTab(QWidget):
         titles = self._selected_titles()
         if not titles:
             return
+        rows = {r.title: r for r in self._all_rows}
+        n_ing = sum(rows[t].usage_count for t in titles if t in rows)
+        n_rec = sum(rows[t].recipe_count for t in titles if t in rows)
         reply = QMessageBox.question(
             self, "Confirmer la suppression",
             f"Supprimer {len(titles)} livre(s) sélectionné(s) ?\n"
-            "Les références résiduelles seront nettoyées.",
+            f"Référencé(s) par {n_ing} ingrédient(s) et {n_rec} recette(s).\n"
+            "Les références résiduelles des ingrédients seront nettoyées.",
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No
         )
         if reply != QMessageBox.Yes:
             return
         try:
-            for t in titles:
-                self.uc_books["remove"].execute(t)
-            info(self, "Suppression effectuée.")
+            removed = [self.uc_books["remove"].execute(t) for t in titles]
+            cleaned = sorted({n for u in removed if u for n in u.ingredients}, key=str.lower)
+            recipes = sorted({n for u in removed if u for n in u.recipes}, key=str.lower)
+            msg = "Suppression effectuée."
+            if cleaned:
+                msg += f"\nIngrédients nettoyés : {', '.join(cleaned)}"
+            if recipes:
+                msg += f"\nRecettes qui citent encore ce(s) livre(s) : {', '.join(recipes)}"
+            info(self, msg)
             self.refresh()
         except PotionDBError as e:
             error(self, str(e))
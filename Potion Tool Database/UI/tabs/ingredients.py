@@ -4,13 +4,15 @@ from typing import List, Optional, Tuple
 from PySide6.QtCore import Qt, QSize, QTimer, Signal
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QGridLayout,
-    QListWidget, QListWidgetItem, QListView, QLineEdit, QLabel,
+    QListView, QLineEdit, QLabel,
     QPushButton, QToolButton, QFrame, QGroupBox, QComboBox,
-    QTextEdit, QMessageBox, QSplitter, QMenu, QCheckBox, QWidgetAction,
+    QTextEdit, QMessageBox, QSplitter, QMenu, QWidgetAction,
     QSizePolicy
 )
 
 from domain.errors import PotionDBError, ValidationError, DuplicateNameError
+from UI.list_models import CheckListDelegate, CheckListModel, DeletableListView, ViewModelListModel
+from UI.query_worker import LatestQuery
 
 
 # ---------- Small helpers ----------
@@ -25,25 +27,6 @@ def error(self, text: str, title: str = "Erreur"):
     QMessageBox.critical(self, title, text)
 
 
-class DeletableList(QListWidget):
-    """
-    QListWidget multi-sélection avec suppression via 'Del'.
-    """
-    def __init__(self, on_delete_callback, on_activate_callback, parent=None):
-        super().__init__(parent)
-        self.setSelectionMode(QListWidget.ExtendedSelection)
-        self._on_delete = on_delete_callback
-        self.itemDoubleClicked.connect(lambda _: on_activate_callback())
-
-    def keyPressEvent(self, e):
-        if e.key() in (Qt.Key_Delete, Qt.Key_Backspace):
-            if self._on_delete:
-                self._on_delete()
-            e.accept()
-            return
-        super().keyPressEvent(e)
-
-
 class CategoryToggle(QFrame):
     """
     3 toggles exclusifs : 💧 Liant / ⚗️ Catalyseur / 🧬 Réactif
@@ -84,75 +67,60 @@ class CategoryToggle(QFrame):
         return ""
 
 
-class BooksChecklist(QListWidget):
+class BooksChecklist(QListView):
     """
-    Liste de livres avec de vrais QCheckBox, en *deux rangées* (flow LTR + wrap).
+    Liste de livres cochables, en *deux rangées* (flow LTR + wrap).
+    Cases peintes par le délégué : aucun widget par livre.
     """
     changed = Signal()  # ///summary: émis quand une coche livre change
 
     def __init__(self, books: List[str], parent=None):
         super().__init__(parent)
-        # Vue en mode icônes pour activer Flow + Wrapping
-        self.setViewMode(QListView.IconMode)
+        # taille d'une "tuile" livre (largeur ~ 300px, hauteur ~ 40px)
+        self._tile_size = QSize(300, 40)
+        self._model = CheckListModel(size_hint=self._tile_size, parent=self)
+        self._model.toggled.connect(self._emit_changed)  # ///summary: autosave hook
+        self.setModel(self._model)
+        self.setItemDelegate(CheckListDelegate(parent=self))
+
+        # Flow + Wrapping : tuiles de gauche à droite, retour à la ligne
         self.setFlow(QListView.LeftToRight)
         self.setWrapping(True)
         self.setResizeMode(QListView.Adjust)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.setUniformItemSizes(True)
-
-        # taille d'une "tuile" livre (largeur ~ 300px, hauteur ~ 40px)
-        self._tile_size = QSize(300, 40)
         self.setGridSize(self._tile_size)
 
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.MinimumExpanding)
 
-        self.setSelectionMode(QListWidget.NoSelection)
+        self.setSelectionMode(QListView.NoSelection)
         self.setAlternatingRowColors(False)
         self.populate(books)
 
         self.setStyleSheet("""
-            QListWidget { padding: 2px; }
-            QListWidget::item { margin: 2px; }
-            QCheckBox { font-size: 14px; padding: 0px; }
+            QListView { padding: 2px; font-size: 14px; }
+            QListView::item { margin: 2px; }
         """)
 
     def _emit_changed(self, *_):
         self.changed.emit()
 
     def populate(self, books: List[str]):
-        self.clear()
-        for title in books:
-            item = QListWidgetItem(self)
-            item.setSizeHint(self._tile_size)
-            cb = QCheckBox(title)
-            cb.setProperty("book_title", title)
-            cb.toggled.connect(self._emit_changed)  # ///summary: autosave hook
-            self.setItemWidget(item, cb)
+        self._model.set_rows((title, title, 0) for title in books)
 
     def set_checked(self, selected: List[str]):
-        wanted = set(selected or [])
-        for i in range(self.count()):
-            cb: QCheckBox = self.itemWidget(self.item(i))
-            if cb:
-                cb.blockSignals(True)
-                cb.setChecked(cb.text() in wanted)
-                cb.blockSignals(False)
+        self._model.set_checked(selected or [])
 
     def get_checked(self) -> List[str]:
-        out: List[str] = []
-        for i in range(self.count()):
-            cb: QCheckBox = self.itemWidget(self.item(i))
-            if cb and cb.isChecked():
-                out.append(cb.text())
-        return out
+        return self._model.checked_keys()
 
 
-class OriginList(QListWidget):
+class OriginList(QListView):
     """
-    Liste aplatie de l'arbre des origines avec de vrais QCheckBox.
+    Liste aplatie de l'arbre des origines, cochable.
     - Tous les niveaux sont cochables (parents + feuilles)
-    - Hiérarchie rendue par indentation (espaces)
+    - Hiérarchie rendue par indentation (peinte par le délégué, 14 px par niveau)
     - Mode multi (par défaut) ou mono (utilisé par le filtre)
     """
     changed = Signal()  # ///summary: émis à tout toggle
@@ -161,83 +129,42 @@ class OriginList(QListWidget):
         super().__init__(parent)
         self.tree = tree or {}
         self.multi = multi
-        self.setSelectionMode(QListWidget.NoSelection)
+        # un peu plus compact
+        self._model = CheckListModel(exclusive=not multi, size_hint=QSize(26, 22), parent=self)
+        self._model.toggled.connect(self.changed.emit)
+        self.setModel(self._model)
+        self.setItemDelegate(CheckListDelegate(indent=14, parent=self))
+        self.setSelectionMode(QListView.NoSelection)
         self.setUniformItemSizes(True)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.rebuild()
-        self.setStyleSheet("QListWidget::item { padding: 0px 0px; font-size: 12px; }")
+        self.setStyleSheet("QListView { font-size: 11px; } QListView::item { padding: 0px 0px; }")
 
     def rebuild(self):
-        self.clear()
+        rows = []
         def walk(node: dict, prefix: str, depth: int):
             for label, children in (node or {}).items():
                 path = f"{prefix}/{label}" if prefix else label
-                item = QListWidgetItem(self)
-                item.setSizeHint(QSize(26, 22))  # un peu plus compact
-
-                cb = QCheckBox(label)  # <-- plus d'espaces dans le libellé
-                cb.setProperty("origin_path", path)
-
-                # décalage réel du checkbox (icône + texte) selon la profondeur
-                indent_px = 14 * depth
-                cb.setStyleSheet(f"QCheckBox {{ margin-left: {indent_px}px; font-size: 11px; padding: 0px; }}")
-
-                if self.multi:
-                    cb.toggled.connect(lambda _ch: self.changed.emit())
-                else:
-                    cb.toggled.connect(self._on_toggle)
-
-                self.setItemWidget(item, cb)
-
+                rows.append((label, path, depth))
                 if isinstance(children, dict) and children:
                     walk(children, path, depth + 1)
 
         walk(self.tree, "", 0)
-
-    def _on_toggle(self, checked: bool):
-        if not checked:
-            self.changed.emit()
-            return
-        sender: QCheckBox = self.sender()  # type: ignore
-        for i in range(self.count()):
-            cb: QCheckBox = self.itemWidget(self.item(i))
-            if cb is not None and cb is not sender and cb.isChecked():
-                cb.blockSignals(True)
-                cb.setChecked(False)
-                cb.blockSignals(False)
-        self.changed.emit()
+        self._model.set_rows(rows)
 
     def set_checked_paths(self, paths: list[str]):
         """Accepte chemins complets ET labels courts."""
         wanted = set(paths or [])
         wanted_last = {p.split("/")[-1] for p in wanted}
-        for i in range(self.count()):
-            cb: QCheckBox = self.itemWidget(self.item(i))
-            if not cb:
-                continue
-            path = cb.property("origin_path")
-            last = str(path).split("/")[-1] if path else ""
-            cb.blockSignals(True)
-            cb.setChecked(path in wanted or last in wanted_last)
-            cb.blockSignals(False)
+        self._model.set_checked(
+            path for path in self._model.keys()
+            if path in wanted or path.split("/")[-1] in wanted_last
+        )
 
     def get_checked_paths(self) -> List[str]:
-        out: List[str] = []
-        for i in range(self.count()):
-            cb: QCheckBox = self.itemWidget(self.item(i))
-            if cb and cb.isChecked():
-                path = cb.property("origin_path")
-                if path:
-                    out.append(path)
-        # unique en gardant l'ordre
-        seen = set()
-        uniq = []
-        for p in out:
-            if p not in seen:
-                seen.add(p)
-                uniq.append(p)
-        return uniq
+        # clés uniques, dans l'ordre de l'arbre
+        return list(dict.fromkeys(self._model.checked_keys()))
 
     def set_tree(self, tree: dict):
         self.tree = tree or {}
@@ -245,6 +172,8 @@ class OriginList(QListWidget):
 
 
 class OriginFilterButton(QToolButton):
+    changed = Signal()  # ///summary: émis quand l'origine filtrée change (UI)
+
     def __init__(self, tree: dict, parent=None):
         super().__init__(parent)
         self.setText("Origine (toutes)")
@@ -259,6 +188,7 @@ class OriginFilterButton(QToolButton):
         lay.setContentsMargins(6, 6, 6, 6)
 
         self._list = OriginList(tree, multi=False, parent=content)
+        self._list.changed.connect(self.changed.emit)
         lay.addWidget(self._list)
 
         btn_clear = QPushButton("Aucune", parent=content)
@@ -275,8 +205,11 @@ class OriginFilterButton(QToolButton):
         self._menu.aboutToHide.connect(self._sync_caption)
 
     def clear_selection(self):
+        had = bool(self._list.get_checked_paths())
         self._list.set_checked_paths([])
         self.setText("Origine (toutes)")
+        if had:
+            self.changed.emit()
 
     def set_selected_path(self, path: Optional[str]):
         self._list.set_checked_paths([path] if path else [])
@@ -297,6 +230,22 @@ class OriginFilterButton(QToolButton):
         self.setText(label if label else "Origine (toutes)")
 
 
+_CATEGORY_ORDER = {"Liant": 0, "Catalyseur": 1, "Réactif": 2}
+
+
+def _list_order(vm) -> tuple:
+    """Ordre de la liste : Liant, Catalyseur, Réactif, puis nom."""
+    return (_CATEGORY_ORDER.get(vm.category, 99), vm.name.lower())
+
+
+def _usage_summary(usages) -> str:
+    """'Recette A (alt. 1, 3), Recette B (alt. 2)'"""
+    by_recipe = {}
+    for u in usages:
+        by_recipe.setdefault(u.recipe, []).append(str(u.alternative + 1))
+    return ", ".join(f"{r} (alt. {', '.join(alts)})" for r, alts in by_recipe.items())
+
+
 # ---------- Main tab ----------
 
 class IngredientsTab(QWidget):
@@ -306,6 +255,7 @@ class IngredientsTab(QWidget):
         self.presenters = container["presenters"]
         self.repos = container["repos"]
         self.uc = container["use_cases"]["ingredients"]
+        self.where_used = container.get("services", {}).get("where_used")
 
         self._current_original_name: Optional[str] = None  # pour gérer rename
         self._is_loading = False                            # ///summary: évite autosave pendant chargements
@@ -313,6 +263,10 @@ class IngredientsTab(QWidget):
         self._autosave_timer.setSingleShot(True)
         self._autosave_timer.setInterval(300)               # ///summary: debounce autosave 300ms
         self._autosave_timer.timeout.connect(lambda: self._save(autosave=True))
+        # ///summary: recherche / filtres hors thread GUI, anti-rebond, dernier résultat seulement
+        self._list_query = LatestQuery(
+            self._prepare_list_query, lambda vms: self.list_model.set_items(vms), parent=self,
+        )
 
         self._build_ui()
         self._wire_autosave()  # ///summary: branche les signaux utilisateurs -> autosave
@@ -368,7 +322,11 @@ class IngredientsTab(QWidget):
         left_lay.addWidget(self.filters)
 
         # List
-        self.list = DeletableList(self._delete_selected, self._activate_selected)
+        self.list_model = ViewModelListModel(
+            lambda vm: f"{self._cat_emoji(vm.category)} {vm.name}".strip(),
+            lambda vm: f"{vm.category} • Diff {vm.difficulty}",
+        )
+        self.list = DeletableListView(self.list_model, self._delete_selected, self._activate_selected)
         left_lay.addWidget(self.list, 1)
 
         splitter.addWidget(left)
@@ -446,8 +404,13 @@ class IngredientsTab(QWidget):
             btns.addWidget(b)
         btns.addStretch(1)  # ///summary: centrer les boutons (stretch droite)
 
+        self.lbl_used = QLabel("")
+        self.lbl_used.setStyleSheet("color: gray;")
+        self.lbl_used.setWordWrap(True)
+
         form_box = QVBoxLayout()
         form_box.addWidget(form_panel, 1)
+        form_box.addWidget(self.lbl_used, 0)
         form_box.addLayout(btns, 0)
         form_wrap = QWidget()
         form_wrap.setLayout(form_box)
@@ -469,16 +432,17 @@ class IngredientsTab(QWidget):
         splitter.setStretchFactor(1, 2) # panneau de droite
 
         # Interactions
-        self.search.textChanged.connect(self._refresh_list)
-        self.cmb_cat.currentIndexChanged.connect(self._refresh_list)
-        self.cmb_book.currentIndexChanged.connect(self._refresh_list)
+        self.search.textChanged.connect(self._list_query.request)
+        self.cmb_cat.currentIndexChanged.connect(self._list_query.request)
+        self.cmb_book.currentIndexChanged.connect(self._list_query.request)
+        self._origin_filter_btn.changed.connect(self._list_query.request)
 
         form_panel.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         form_wrap.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
         # style léger
         self.setStyleSheet("""
-        QListWidget { min-height: 140px; }
+        QListView { min-height: 140px; }
 
         /* Effet détaillé : pas de bord en idle, léger au survol, bleu au focus */
         #EffectEdit {
@@ -541,6 +505,7 @@ class IngredientsTab(QWidget):
         self._origin_filter_btn.set_tree(tree)
         # books checklist refresh
         self.books_check.populate(fs.books)
+        self._show_usage(self._current_original_name)
 
         self._refresh_list()
 
@@ -555,27 +520,49 @@ class IngredientsTab(QWidget):
         return (q, cat, book if book != "(Tous)" else None, origin_label)
 
     def _refresh_list(self):
-        q = self.search.text().strip()
-        cat = self.cmb_cat.currentText()
-        book = self.cmb_book.currentText()
-        origin_label = self._origin_filter_btn.selected_label()  # label court
-
-        vms = self.presenters["ingredients"].list_ingredients(
-            query=q,
-            cat=cat,
-            book=(None if book in ("", "(Tous)") else book),
-            origin=origin_label,
-        )
-
-        order = {"Liant": 0, "Catalyseur": 1, "Réactif": 2}
-        vms.sort(key=lambda vm: (order.get(vm.category, 99), vm.name.lower()))
-        self.list.clear()
-        for vm in vms:
-            text = f"{self._cat_emoji(vm.category)} {vm.name}".strip()
-            it = QListWidgetItem(text)
-            it.setData(Qt.UserRole, vm.name)
-            it.setToolTip(f"{vm.category} • Diff {vm.difficulty}")
-            self.list.addItem(it)
+        """///summary: Rafraîchit tout de suite (après sauvegarde, suppression...) ; la saisie passe par _list_query."""
+        self._list_query.run_now()
+
+    def _prepare_list_query(self):
+        """///summary: Lit les filtres (thread GUI) ; la requête renvoyée tourne sur le pool."""
+        q, cat, book, origin_label = self._current_filters()  # origine : label court
+        presenter = self.presenters["ingredients"]
+
+        def query():
+            vms = presenter.list_ingredients(query=q, cat=cat, book=book, origin=origin_label)
+            if not q:
+                # sans recherche : ordre de liste ; avec recherche : classement du presenter
+                vms.sort(key=_list_order)
+            return vms
+
+        # pas d'item Qt par ligne : le modèle expose les VMs (appliqué par LatestQuery)
+        return query
+
+    def _patch_list(self, ing, *, replaces: Optional[str] = None):
+        """///summary: Après sauvegarde : insère / met à jour / retire la seule ligne touchée."""
+        q, cat, book, origin_label = self._current_filters()
+        if q or self._list_query.pending():
+            # classement de recherche, ou requête en vol qui ignorerait la sauvegarde : liste seule
+            self._refresh_list()
+            return
+        presenter = self.presenters["ingredients"]
+        if replaces and replaces != ing.name:
+            self.list_model.remove(replaces)
+        vm = presenter.card(ing)
+        if presenter.matches_filters(vm, cat=cat, book=book, origin=origin_label):
+            self.list_model.put(vm, _list_order)
+        else:
+            self.list_model.remove(vm.name)
+        self._ensure_category(vm.category)
+
+    def _ensure_category(self, cat: str):
+        """///summary: Ajoute au filtre une catégorie apparue avec cet ingrédient (sans recharger les filtres)."""
+        if not cat or self.cmb_cat.findText(cat) >= 0:
+            return
+        cats = sorted([self.cmb_cat.itemText(i) for i in range(1, self.cmb_cat.count())] + [cat])
+        self.cmb_cat.blockSignals(True)
+        self.cmb_cat.insertItem(1 + cats.index(cat), cat)
+        self.cmb_cat.blockSignals(False)
 
     # ---- Selection / load ----
 
@@ -586,12 +573,7 @@ class IngredientsTab(QWidget):
         self._load_into_editor(names[0])
 
     def _selected_names(self) -> List[str]:
-        out = []
-        for it in self.list.selectedItems():
-            name = it.data(Qt.UserRole)
-            if name:
-                out.append(name)
-        return out
+        return self.list.selected_names()
 
     def _load_into_editor(self, name: str):
         try:
@@ -611,9 +593,19 @@ class IngredientsTab(QWidget):
             self.ed_effect.setPlainText(ing.effect or "")
             self.books_check.set_checked(ing.books or [])
             self.origins_tree.set_checked_paths(ing.origins or [])
+            self._show_usage(ing.name)
         finally:
             self._is_loading = False
 
+    def _show_usage(self, name: Optional[str]):
+        if not name or self.where_used is None:
+            self.lbl_used.setText("")
+            return
+        usages = self.where_used.where_used(name)
+        self.lbl_used.setText(
+            f"Utilisé dans : {_usage_summary(usages)}" if usages else "Utilisé dans aucune recette."
+        )
+
     def _new(self):
         self._is_loading = True
         try:
@@ -625,6 +617,7 @@ class IngredientsTab(QWidget):
             self.ed_effect.clear()
             self.books_check.set_checked([])
             self.origins_tree.set_checked_paths([])
+            self._show_usage(None)
         finally:
             self._is_loading = False
 
@@ -667,16 +660,16 @@ class IngredientsTab(QWidget):
 
             if self._current_original_name is None:
                 # CREATE
-                self.uc["create"].execute(
+                saved = self.uc["create"].execute(
                     name=name, cat=cat, difficulty=difficulty,
                     shortEffect=shortEffect, effect=effect,
                     books=books, origins=origins
                 )
 
-                # Mise à jour de la liste
+                # Mise à jour de la liste : la seule ligne créée
                 self._is_loading = True
                 try:
-                    self.refresh()
+                    self._patch_list(saved)
                     # ///summary: remise à zéro pour enchaîner une nouvelle saisie
                     self._new()
                     # garder Catégorie + Livres + (option) Origines si utile
@@ -696,7 +689,7 @@ class IngredientsTab(QWidget):
             original = self._current_original_name
             if name == original:
                 # UPDATE
-                self.uc["update"].execute(
+                saved = self.uc["update"].execute(
                     name=name, cat=cat, difficulty=difficulty,
                     shortEffect=shortEffect, effect=effect,
                     books=books, origins=origins
@@ -707,25 +700,22 @@ class IngredientsTab(QWidget):
                     if autosave:
                         return
                     raise DuplicateNameError(f"Un ingrédient nommé {name!r} existe déjà.")
-                self.uc["create"].execute(
+                saved = self.uc["create"].execute(
                     name=name, cat=cat, difficulty=difficulty,
                     shortEffect=shortEffect, effect=effect,
                     books=books, origins=origins
                 )
-                self.uc["delete"].execute(original)
+                self.uc["delete"].execute(original, force=True)
                 self._current_original_name = name
                 if not autosave:
                     info(self, f"Ingrédient renommé en {name!r} et enregistré.")
 
-            # ///summary: refresh en conservant l’état UI (Livres/Origines visibles)
+            # ///summary: seule la ligne touchée change ; filtres, livres et origines restent tels quels
             self._is_loading = True
             try:
-                self.refresh()
+                self._patch_list(saved, replaces=original)
                 self._select_in_list(self._current_original_name or name)
-                # Restaure visuellement (au cas où refresh reconstruit les widgets)
-                self.cat_toggle.set_value(kept_cat)
-                self.books_check.set_checked(kept_books)
-                self.origins_tree.set_checked_paths(kept_origins_paths)
+                self._show_usage(self._current_original_name)
             finally:
                 self._is_loading = False
 
@@ -740,11 +730,7 @@ class IngredientsTab(QWidget):
                 error(self, f"Erreur inattendue : {e}")
 
     def _select_in_list(self, name: str):
-        for i in range(self.list.count()):
-            it = self.list.item(i)
-            if it.data(Qt.UserRole) == name:
-                self.list.setCurrentItem(it)
-                break
+        self.list.select_name(name)
 
     def _delete_current(self):
         if not self._current_original_name:
@@ -761,16 +747,24 @@ class IngredientsTab(QWidget):
     def _delete_by_names(self, names: List[str]):
         if not names:
             return
+        text = f"Supprimer {len(names)} ingrédient(s) sélectionné(s) ?"
+        used = {n: self.where_used.where_used(n) for n in names} if self.where_used is not None else {}
+        used = {n: u for n, u in used.items() if u}
+        if used:
+            lines = [f"• {n} — {_usage_summary(u)}" for n, u in used.items()]
+            text += (
+                "\n\nEncore utilisé(s) par des recettes :\n" + "\n".join(lines)
+                + "\n\nCes alternatives référenceront un ingrédient manquant."
+            )
         reply = QMessageBox.question(
-            self, "Confirmer la suppression",
-            f"Supprimer {len(names)} ingrédient(s) sélectionné(s) ?",
+            self, "Confirmer la suppression", text,
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No
         )
         if reply != QMessageBox.Yes:
             return
         try:
             for n in names:
-                self.uc["delete"].execute(n)
+                self.uc["delete"].execute(n, force=True)  # usages confirmés ci-dessus
             info(self, "Suppression effectuée.")
             if self._current_original_name in names:
                 self._new()
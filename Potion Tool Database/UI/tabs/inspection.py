@@ -1,15 +1,15 @@
 # ui_qt/tabs/inspection.py
 from __future__ import annotations
 
-from typing import List, Dict, Set, Tuple
+from typing import List
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
-    QGroupBox, QGridLayout, QPushButton, QFrame, QScrollArea
+    QGroupBox, QGridLayout, QPushButton, QFrame, QScrollArea, QProgressBar
 )
 
-from domain.rules import find_duplicates
+from UI.query_worker import BackgroundJob
 
 
 class StatCard(QFrame):
@@ -40,6 +40,12 @@ class InspectionTab(QWidget):
     - Livres sans ingrédients
     - Ingrédients non utilisés
     - Doublons : livres, ingrédients/recettes (IntegrityService), origines (dans un même ingrédient)
+    - Combinaisons ambiguës entre recettes, alternatives en double dans une recette
+    - Noms quasi identiques (casse, accents, espaces, fautes de frappe)
+
+    L'analyse tourne hors du thread GUI (BackgroundJob), avec progression et annulation ;
+    le résultat est mis en cache par version du dataset (InspectionPresenter.analyse) :
+    revenir sur l'onglet sans modification ne recalcule rien.
     """
 
     def __init__(self, container, parent=None):
@@ -54,6 +60,13 @@ class InspectionTab(QWidget):
         self.repos = container["repos"]
         self.services = container["services"]
 
+        self._job = BackgroundJob(self)
+        self._job.progress.connect(self._on_progress)
+        self._job.finished.connect(self._show)
+        self._job.failed.connect(self._on_failed)
+        self._job.cancelled.connect(lambda: self._set_busy(False, "Analyse annulée."))
+        self._job_version = None   # version du dataset analysée par le calcul en cours
+
         self._build_ui()
         self.refresh()
 
@@ -102,13 +115,35 @@ class InspectionTab(QWidget):
         self._list_dup_origins = QListWidget()
         grid.addWidget(self._make_group("➿ Doublons — Origines (dans un même ingrédient)", self._list_dup_origins), 2, 0, 1, 2)
 
+        # 6) Combinaisons ambiguës (même ensemble d'ingrédients, plusieurs recettes)
+        self._list_conflicting_combos = QListWidget()
+        grid.addWidget(self._make_group("⚠️ Combinaisons revendiquées par plusieurs recettes", self._list_conflicting_combos), 3, 0)
+
+        # 7) Doublons — Alternatives (dans une même recette)
+        self._list_dup_alternatives = QListWidget()
+        grid.addWidget(self._make_group("➿ Doublons — Alternatives (dans une même recette)", self._list_dup_alternatives), 3, 1)
+
+        # 8) Noms quasi identiques (Ingrédients & Recettes)
+        self._list_near_dup_names = QListWidget()
+        grid.addWidget(self._make_group("≈ Noms quasi identiques — Ingrédients & Recettes", self._list_near_dup_names), 4, 0, 1, 2)
+
         root.addWidget(scroll)
 
-        # Bouton refresh manuel
+        # Progression de l'analyse + bouton refresh manuel
         btns = QHBoxLayout()
+        self._status = QLabel("")
+        btns.addWidget(self._status)
+        self._progress = QProgressBar()
+        self._progress.setMaximumWidth(280)
+        self._progress.setVisible(False)
+        btns.addWidget(self._progress)
+        self._btn_cancel = QPushButton("Annuler")
+        self._btn_cancel.clicked.connect(self._job.cancel)
+        self._btn_cancel.setVisible(False)
+        btns.addWidget(self._btn_cancel)
+        btns.addStretch(1)
         btn_refresh = QPushButton("Rafraîchir")
         btn_refresh.clicked.connect(self.refresh)
-        btns.addStretch(1)
         btns.addWidget(btn_refresh)
         root.addLayout(btns)
 
@@ -141,45 +176,65 @@ class InspectionTab(QWidget):
     # ---------- Data refresh ----------
 
     def refresh(self):
-        # Recalcule tout à partir des presenters/services
-        books = list(self.repos["data"].get_books())
-        origin_tree = self.repos["data"].get_origin_tree()
-        ingredients = list(self.repos["ingredients"].list_all())
-        recipes = list(self.repos["recipes"].list_all())
+        presenter = self.inspection_presenter
+        version = presenter.dataset_version()
+        cached = presenter.cached_analysis(version)
+        if cached is not None:
+            self._job.cancel()  # calcul éventuel sur une version précédente
+            self._show(cached)
+            return
+        if self._job.is_running() and version is not None and version == self._job_version:
+            return  # déjà en cours sur ces données
+        # Une seule lecture du dataset + une seule passe du moteur de règles, sur le pool
+        self._job_version = version
+        self._set_busy(True, "Analyse en cours…")
+        self._job.start(presenter.analyse)
+
+    def _set_busy(self, busy: bool, status: str = ""):
+        self._status.setText(status)
+        self._progress.setVisible(busy)
+        self._btn_cancel.setVisible(busy)
+        if busy:
+            self._progress.setRange(0, 0)  # indéterminé jusqu'au 1er rapport (lecture du snapshot)
+
+    def _on_progress(self, done: int, total: int):
+        self._progress.setRange(0, max(total, 1))
+        self._progress.setValue(done)
+
+    def _on_failed(self, error: Exception):
+        self._set_busy(False, f"Analyse impossible : {error}")
+
+    def _show(self, result):
+        self._set_busy(False)
+        report = result.report
 
         # Compteurs
-        nb_books = len(books)
-        nb_origins = _count_nodes(origin_tree)  # tous les nœuds
-        nb_ings = len(ingredients)
-        nb_recs = len(recipes)
-
-        self._card_books.set_value(nb_books)
-        self._card_origins.set_value(nb_origins)
-        self._card_ingredients.set_value(nb_ings)
-        self._card_recipes.set_value(nb_recs)
+        self._card_books.set_value(report.counts["books"])
+        self._card_origins.set_value(report.counts["origins"])  # tous les nœuds
+        self._card_ingredients.set_value(report.counts["ingredients"])
+        self._card_recipes.set_value(report.counts["recipes"])
 
-        # Livres sans ingrédients (via BooksPresenter usages)
-        table_vm = self.books_presenter.make_books_table()
-        books_unused = [row.title for row in table_vm.rows if int(row.usage_count or 0) == 0]
-        self._fill_list(self._list_books_unused, books_unused)
+        # Livres sans ingrédients
+        self._fill_list(self._list_books_unused, result.unused_books)
 
-        # Ingrédients non utilisés (via IntegrityService)
-        report = self.inspection_presenter.integrity.inspect()
-        self._fill_list(self._list_ing_unused, report.unused_ingredients)
+        # Ingrédients non utilisés
+        self._fill_list(self._list_ing_unused, report.findings("unused_ingredients"))
 
         # Doublons — Livres (BOOKS)
-        dup_books = find_duplicates(books)
-        self._fill_list(self._list_dup_books, dup_books)
+        self._fill_list(self._list_dup_books, report.findings("duplicate_books"))
 
         # Doublons — Noms (Ingrédients & Recettes)
-        dup_names = sorted(set(report.duplicate_names))
-        self._fill_list(self._list_dup_names, dup_names)
+        self._fill_list(self._list_dup_names, report.findings("duplicate_names"))
 
-        # Doublons — Origines (dans un même ingrédient)
-        dup_orig_pairs = _find_per_ingredient_origin_duplicates(ingredients)
-        # Affichage sous forme "Ingrédient — /Chemin/Origine"
-        dup_origin_items = [f"{ing} — {origin}" for ing, origin in dup_orig_pairs]
-        self._fill_list(self._list_dup_origins, dup_origin_items)
+        # Doublons — Origines (dans un même ingrédient), "Ingrédient — Origine"
+        self._fill_list(self._list_dup_origins, report.findings("duplicate_origins"))
+
+        # Combinaisons ambiguës / alternatives en double
+        self._fill_list(self._list_conflicting_combos, report.findings("conflicting_combos"))
+        self._fill_list(self._list_dup_alternatives, report.findings("duplicate_alternatives"))
+
+        # Noms quasi identiques
+        self._fill_list(self._list_near_dup_names, report.findings("near_duplicate_names"))
 
     def _fill_list(self, widget: QListWidget, items: List[str]):
         widget.clear()
@@ -190,36 +245,3 @@ class InspectionTab(QWidget):
             return
         for s in items:
             widget.addItem(QListWidgetItem(s))
-
-
-# ---------- helpers ----------
-
-def _count_nodes(tree: dict) -> int:
-    """Compte tous les nœuds (parents + feuilles) d'un dict imbriqué."""
-    if not isinstance(tree, dict) or not tree:
-        return 0
-    total = 0
-    for _, children in tree.items():
-        total += 1
-        if isinstance(children, dict):
-            total += _count_nodes(children)
-    return total
-
-
-def _find_per_ingredient_origin_duplicates(ingredients) -> List[tuple[str, str]]:
-    """
-    Retourne une liste de (ingredient_name, origin_path) lorsqu'une même origine
-    apparaît plusieurs fois dans ing.origins. Utile pour 'doublon d'origine'.
-    """
-    out: List[tuple[str, str]] = []
-    for ing in ingredients:
-        seen: Set[str] = set()
-        dups: Set[str] = set()
-        for o in (ing.origins or []):
-            if o in seen:
-                dups.add(o)
-            else:
-                seen.add(o)
-        for d in sorted(dups):
-            out.append((ing.name, d))
-    return out
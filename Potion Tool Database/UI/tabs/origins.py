@@ -1,14 +1,18 @@
 from __future__ import annotations
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
     QTreeWidget, QTreeWidgetItem, QLineEdit, QLabel,
-    QPushButton, QMessageBox, QInputDialog, QComboBox, QDialog, QDialogButtonBox
+    QPushButton, QMessageBox, QInputDialog, QComboBox, QDialog, QDialogButtonBox,
+    QHeaderView
 )
 
 from domain.errors import PotionDBError
+from application.origin_index import ROOT, OriginTreeDiff, OriginTreeIndex, parent_path
+
+_COUNT_ALIGN = Qt.AlignRight | Qt.AlignVCenter
 
 
 # ---------- helpers ----------
@@ -55,6 +59,13 @@ class OriginsTab(QWidget):
         self.repos = container["repos"]
         self.uc = container["use_cases"]["origins"]       # add / rename / remove / migrate_refs
 
+        # arbre affiché = miroir de l'index : seuls les nœuds modifiés sont recréés
+        self._index = OriginTreeIndex()
+        self._items: Dict[str, QTreeWidgetItem] = {}      # chemin -> item
+        self._hidden: Set[str] = set()                    # chemins masqués par le filtre
+        self._usage: Dict[str, int] = {}
+        self._tree_version: Optional[tuple] = None
+
         self._build_ui()
         self.refresh()
 
@@ -81,6 +92,10 @@ class OriginsTab(QWidget):
         # Tree (compact, sans flèches visibles)
         self.tree = QTreeWidget()
         self.tree.setHeaderHidden(True)
+        self.tree.setColumnCount(2)                  # libellé | nb d'ingrédients
+        self.tree.header().setStretchLastSection(False)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.tree.setIndentation(14)
         self.tree.setUniformRowHeights(True)
         self.tree.setRootIsDecorated(True) 
@@ -102,43 +117,116 @@ class OriginsTab(QWidget):
 
     # Data
     def refresh(self):
-        self._tree_dict = self.presenters["origins"].get_origin_tree()
-        self._all_labels = self._collect_labels(self._tree_dict)
-        self._rebuild_tree()
+        origins = self.presenters["origins"]
+        previous = self._usage
+        self._usage = origins.get_origin_usage()
+        version = origins.origin_tree_version()   # relire data.js seulement s'il a changé
+        if version is None or version != self._tree_version:
+            diff = self._index.sync(origins.get_origin_tree())
+            self._tree_version = version
+            if diff:
+                self._apply_diff(diff)
+        self._update_counts(previous)
         self._filter_tree()  # applique filtre courant (vide au départ)
 
-    def _rebuild_tree(self):
-        self.tree.clear()
-        def add_children(node: dict, parent_item: Optional[QTreeWidgetItem], prefix: str):
-            for label, children in (node or {}).items():
-                path = f"{prefix}/{label}" if prefix else label
-                item = QTreeWidgetItem([label])  # affichage du dernier nom uniquement
-                item.setData(0, Qt.UserRole, path)  # on garde le chemin complet pour les use-cases
-                if parent_item is None:
-                    self.tree.addTopLevelItem(item)
-                else:
-                    parent_item.addChild(item)
-                if isinstance(children, dict) and children:
-                    add_children(children, item, path)
-
-        add_children(self._tree_dict, None, "")
-        self.tree.expandAll()
+    def _apply_diff(self, diff: OriginTreeDiff):
+        """Reporte ajouts / suppressions / renommages sur les items, sans reconstruire le reste."""
+        first = not self._items
+        items = self._items
+
+        # suppressions : détacher la racine emporte son sous-arbre
+        for path in diff.removed_roots():
+            item = items[path]
+            owner = item.parent() if item.parent() is not None else self.tree.invisibleRootItem()
+            owner.takeChild(owner.indexOfChild(item))
+        for path in diff.removed:
+            items.pop(path, None)
+            self._hidden.discard(path)
+
+        # renommages : mêmes items, chemins à jour (libellé : racine du sous-arbre seulement)
+        relocated = {old: items.pop(old) for old, _ in diff.moved}
+        for old, new in diff.moved:
+            item = items[new] = relocated[old]
+            item.setData(0, Qt.UserRole, new)
+            label = self._index.labels[new]
+            if item.text(0) != label:
+                item.setText(0, label)
+                self._set_count(item, label)
+            if old in self._hidden:
+                self._hidden.discard(old)
+                self._hidden.add(new)
+
+        # ajouts (ordre préfixe) : sous un nouvel item rien n'est encore affiché ;
+        # sous un item existant, rattachement groupé par parent
+        fresh = set(diff.added)
+        pending: Dict[str, List[QTreeWidgetItem]] = {}
+        for path in diff.added:
+            parent = parent_path(path)
+            if parent in fresh:
+                self._new_item(path, items[parent])
+            else:
+                pending.setdefault(parent, []).append(self._new_item(path))
+        for parent, new_items in pending.items():
+            if parent == ROOT:
+                self.tree.addTopLevelItems(new_items)
+            else:
+                items[parent].addChildren(new_items)
+
+        for parent in diff.reordered:
+            self._sync_order(parent)
+        if first:
+            self.tree.expandAll()
+        else:
+            for path in diff.added:
+                items[path].setExpanded(True)
+
+    def _new_item(self, path: str, parent: Optional[QTreeWidgetItem] = None) -> QTreeWidgetItem:
+        label = self._index.labels[path]
+        item = QTreeWidgetItem(parent) if parent is not None else QTreeWidgetItem()
+        item.setText(0, label)                  # affichage du dernier nom uniquement
+        item.setData(0, Qt.UserRole, path)      # on garde le chemin complet pour les use-cases
+        item.setTextAlignment(1, _COUNT_ALIGN)
+        self._set_count(item, label)
+        self._items[path] = item
+        return item
+
+    def _set_count(self, item: QTreeWidgetItem, label: str):
+        count = self._usage.get(label, 0)
+        item.setText(1, str(count) if count else "")
+        item.setToolTip(0, f"{count} ingrédient(s)")
+
+    def _update_counts(self, previous: Dict[str, int]):
+        """Compteurs d'usage : seuls les libellés dont le nombre a changé."""
+        for label in set(previous) | set(self._usage):
+            if previous.get(label, 0) != self._usage.get(label, 0):
+                for path in self._index.paths_for_label(label):
+                    self._set_count(self._items[path], label)
+
+    def _sync_order(self, parent: str):
+        """Ordre des frères = ordre du dict (data.js est réécrit clés triées)."""
+        owner = self._items[parent] if parent else self.tree.invisibleRootItem()
+        for i, path in enumerate(self._index.children.get(parent, [])):
+            current = owner.child(i)
+            if current is not None and current.data(0, Qt.UserRole) == path:
+                continue
+            item = self._items[path]
+            expanded = [it for it in _subtree_items(item) if it.isExpanded()]
+            owner.insertChild(i, owner.takeChild(owner.indexOfChild(item)))
+            for it in expanded:
+                it.setExpanded(True)
 
     def _filter_tree(self):
-        q = (self.search.text() or "").strip().lower()
-        def visit(item: QTreeWidgetItem) -> bool:
-            # visible si lui ou un descendant match
-            text = (item.text(0) or "").lower()
-            visible_here = (q in text) if q else True
-            visible_child = False
-            for i in range(item.childCount()):
-                if visit(item.child(i)):
-                    visible_child = True
-            visible = visible_here or visible_child
-            item.setHidden(not visible)
-            return visible
-        for i in range(self.tree.topLevelItemCount()):
-            visit(self.tree.topLevelItem(i))
+        # nœuds qui matchent + ancêtres visibles ; on ne masque que la frontière
+        # (un item masqué cache son sous-arbre) et on ne touche qu'à ce qui change
+        visible = self._index.visible_paths(self.search.text())
+        hidden = self._index.hidden_frontier(visible)
+        for path in self._hidden - hidden:
+            item = self._items.get(path)
+            if item is not None:
+                item.setHidden(False)
+        for path in hidden - self._hidden:
+            self._items[path].setHidden(True)
+        self._hidden = hidden
 
     # Utils
     def _selected_item(self) -> Optional[QTreeWidgetItem]:
@@ -153,31 +241,21 @@ class OriginsTab(QWidget):
         path = self._selected_path()
         return path.split("/")[-1] if path else ""
 
-    def _collect_labels(self, node: dict) -> List[str]:
-        out: List[str] = []
-        def walk(n: dict):
-            for k, v in (n or {}).items():
-                out.append(str(k))
-                if isinstance(v, dict) and v:
-                    walk(v)
-        walk(node or {})
-        return sorted(set(out))
-
     # Actions
     def _add_child(self):
-        parent_path = self._selected_path()
-        if parent_path == "":
+        parent = self._selected_path()
+        if parent == "":
             # autoriser l’ajout à la racine
-            parent_path = ""  # AddOrigin accepte "" => racine
+            parent = ""  # AddOrigin accepte "" => racine
         name, ok = QInputDialog.getText(self, "Ajouter un enfant", "Nom du nouveau nœud :")
         name = (name or "").strip()
         if not ok or not name:
             return
         try:
-            self.uc["add"].execute(parent_path, name)
+            self.uc["add"].execute(parent, name)
             info(self, f"Enfant « {name} » créé.")
             self.refresh()
-            self._select_path(f"{parent_path}/{name}".strip("/"))
+            self._select_path(f"{parent}/{name}".strip("/"))
         except PotionDBError as e:
             error(self, str(e))
 
@@ -209,7 +287,7 @@ class OriginsTab(QWidget):
         if not src_label:
             warn(self, "Sélectionnez une origine à migrer.")
             return
-        dlg = MigrateOriginDialog(self._all_labels, src_label, self)
+        dlg = MigrateOriginDialog(self._index.all_labels(), src_label, self)
         if dlg.exec() != QDialog.Accepted:
             return
         dst_label = dlg.target_label()  # "" => suppression des références
@@ -249,18 +327,14 @@ class OriginsTab(QWidget):
             error(self, str(e))
 
     def _select_path(self, path: str):
-        # sélectionne l’item correspondant au chemin complet stocké dans UserRole
-        for i in range(self.tree.topLevelItemCount()):
-            it = self.tree.topLevelItem(i)
-            found = self._select_path_rec(it, path)
-            if found:
-                break
-
-    def _select_path_rec(self, it: QTreeWidgetItem, path: str) -> bool:
-        if (it.data(0, Qt.UserRole) or "") == path:
+        # sélectionne l’item correspondant au chemin complet
+        it = self._items.get(path)
+        if it is not None:
             self.tree.setCurrentItem(it)
-            return True
-        for i in range(it.childCount()):
-            if self._select_path_rec(it.child(i), path):
-                return True
-        return False
+
+
+def _subtree_items(item: QTreeWidgetItem) -> List[QTreeWidgetItem]:
+    out = [item]
+    for it in out:
+        out.extend(it.child(i) for i in range(it.childCount()))
+    return out
@@ -5,17 +5,37 @@ from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QIntValidator
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QGridLayout,
-    QListWidget, QListWidgetItem, QLineEdit, QLabel,
+    QListWidget, QListWidgetItem, QListView, QLineEdit, QLabel,
     QPushButton, QToolButton, QFrame, QComboBox, QDialog,
-    QMessageBox, QSplitter, QGroupBox, QDialogButtonBox, QCheckBox,
-    QScrollArea, QSizePolicy, QTextEdit
+    QMessageBox, QSplitter, QGroupBox, QDialogButtonBox,
+    QSizePolicy, QTextEdit
 )
 
 from domain.errors import PotionDBError, ValidationError, DuplicateNameError
+from application.search_index import fold
 from UI.tabs.ingredients import BooksChecklist
+from UI.list_models import CheckListDelegate, CheckListModel, DeletableListView, ViewModelListModel
+from UI.query_worker import LatestQuery
 
 # ---------- Small helpers ----------
 
+def _fmt_diff(v: Optional[float]) -> str:
+    if v is None:
+        return "—"
+    return str(int(v)) if float(v).is_integer() else f"{v:.1f}"
+
+
+def _difficulty_summary(stats) -> str:
+    if not stats.alternatives:
+        return "Difficulté : aucune alternative"
+    text = (f"Difficulté : min {_fmt_diff(stats.min_total)} • moy {_fmt_diff(stats.mean_total)}"
+            f" • max {_fmt_diff(stats.max_total)}")
+    if stats.bonus:
+        text += f" (bonus {_fmt_diff(stats.bonus)} inclus)"
+    if stats.missing:
+        text += f" — {stats.missing} ingrédient(s) inconnu(s)"
+    return text
+
 def info(self, text: str, title: str = "Info"):
     QMessageBox.information(self, title, text)
 
@@ -55,27 +75,23 @@ class ComboDialog(QDialog):
     ///summary: Édite une alternative d'ingrédients (liant?, catalyseur?, ≥1 réactif).
     Affiche l'effet court entre parenthèses *uniquement* dans ce dialog.
     On renvoie une liste concaténée: [liant?, catalyseur?, reactif...]
+    Réactifs : liste cochable virtualisée (pas de QCheckBox par ligne), filtrée à la frappe.
     """
     def __init__(
         self,
         recipes_presenter,
         parent=None,
         initial: Optional[List[str]] = None,
-        short_effects: Optional[Dict[str, str]] = None,
     ):
         super().__init__(parent)
         self.setWindowTitle("Alternative d'ingrédients")
         self.presenter = recipes_presenter
-        self.short_effects = short_effects or {}
 
-        # Sources (noms “bruts”)
-        liants = self.presenter.get_ingredients_by_category("Liant")
-        catas  = self.presenter.get_ingredients_by_category("Catalyseur")
-        reac   = self.presenter.get_ingredients_by_category("Réactif")
-
-        def label_for(name: str) -> str:
-            se = self.short_effects.get(name, "").strip()
-            return f"{name} ({se})" if se else name
+        # Sources : index par catégorie du presenter (noms bruts + libellés "Nom (effet)"),
+        # recalculé seulement quand les ingrédients changent
+        liants = self.presenter.get_combo_choices("Liant")
+        catas  = self.presenter.get_combo_choices("Catalyseur")
+        reac   = self.presenter.get_combo_choices("Réactif")
 
         lay = QVBoxLayout(self)
 
@@ -85,51 +101,48 @@ class ComboDialog(QDialog):
         # Liant
         self.cmb_liant = QComboBox()
         self.cmb_liant.addItem("(Aucun)", "")  # userData = nom brut (vide)
-        for n in liants:
-            self.cmb_liant.addItem(label_for(n), n)  # display “Nom (effet)”, data “Nom”
+        for c in liants:
+            self.cmb_liant.addItem(c.label, c.name)  # display “Nom (effet)”, data “Nom”
         grid.addWidget(QLabel("Liant (optionnel)"), row, 0)
         grid.addWidget(self.cmb_liant, row, 1); row += 1
 
         # Catalyseur
         self.cmb_cata = QComboBox()
         self.cmb_cata.addItem("(Aucun)", "")
-        for n in catas:
-            self.cmb_cata.addItem(label_for(n), n)
+        for c in catas:
+            self.cmb_cata.addItem(c.label, c.name)
         grid.addWidget(QLabel("Catalyseur (optionnel)"), row, 0)
         grid.addWidget(self.cmb_cata, row, 1); row += 1
 
-        # Réactifs multi: grille scrollable horizontale (10 lignes max)
-        reac_names = sorted(reac)
-
+        # Réactifs multi : filtre + liste cochable (clé = nom brut, libellé “Nom (effet)”)
         box = QGroupBox("Réactifs (au moins 1)")
         box_lay = QVBoxLayout(box)
 
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-
-        container = QWidget()
-        rGrid = QGridLayout(container)
-        rGrid.setContentsMargins(0, 0, 0, 0)
-        rGrid.setSpacing(6)
-
-        self.reac_checks: List[QCheckBox] = []
-        for i, name in enumerate(reac_names):
-            r = i % 10          # 10 lignes max
-            c = i // 10         # nouvelles colonnes à droite
-            cb = QCheckBox(label_for(name))
-            cb.setProperty("raw_name", name)  # ///summary: conserve le nom brut
-            self.reac_checks.append(cb)
-            rGrid.addWidget(cb, r, c)
-
-        container.setLayout(rGrid)
-        scroll.setWidget(container)
-
+        self.ed_filter = QLineEdit()
+        self.ed_filter.setPlaceholderText("Filtrer les réactifs (nom ou effet)…")
+        self.ed_filter.setClearButtonEnabled(True)
+        box_lay.addWidget(self.ed_filter)
+
+        self._reac_keys = {c.name: c.key for c in reac}   # nom -> libellé replié (filtre)
+        self.reac_model = CheckListModel(parent=self)
+        self.reac_model.set_rows((c.label, c.name, 0) for c in reac)
+        self.reac_list = QListView()
+        self.reac_list.setModel(self.reac_model)
+        self.reac_list.setItemDelegate(CheckListDelegate(parent=self.reac_list))
+        self.reac_list.setUniformItemSizes(True)
+        self.reac_list.setSelectionMode(QListView.NoSelection)
         # Hauteur confortable pour 10 lignes (ajuste si besoin)
-        scroll.setMinimumHeight(10 * 35 + 75)
+        self.reac_list.setMinimumHeight(10 * 35 + 75)
+        box_lay.addWidget(self.reac_list)
 
-        box_lay.addWidget(scroll)
+        # coches masquées par le filtre : rappelées ici
+        self.lbl_checked = QLabel("")
+        self.lbl_checked.setWordWrap(True)
+        self.lbl_checked.setStyleSheet("color: gray;")
+        box_lay.addWidget(self.lbl_checked)
+
+        self.ed_filter.textChanged.connect(self._apply_filter)
+        self.reac_model.toggled.connect(self._update_checked_label)
 
         lay.addLayout(grid)
         lay.addWidget(box)
@@ -144,31 +157,35 @@ class ComboDialog(QDialog):
         if initial:
             init_set = set(initial)
             # liant
-            idx = self.cmb_liant.findData(next((n for n in liants if n in init_set), ""), Qt.UserRole)
+            idx = self.cmb_liant.findData(next((c.name for c in liants if c.name in init_set), ""), Qt.UserRole)
             if idx >= 0:
                 self.cmb_liant.setCurrentIndex(idx)
             # cata
-            idx = self.cmb_cata.findData(next((n for n in catas if n in init_set), ""), Qt.UserRole)
+            idx = self.cmb_cata.findData(next((c.name for c in catas if c.name in init_set), ""), Qt.UserRole)
             if idx >= 0:
                 self.cmb_cata.setCurrentIndex(idx)
             # réactifs
-            for cb in self.reac_checks:
-                raw = cb.property("raw_name") or ""
-                cb.setChecked(raw in init_set)
+            self.reac_model.set_checked(n for n in self._reac_keys if n in init_set)
+            self._update_checked_label()
 
         # style
         self.setMinimumWidth(420)
+        self.ed_filter.setFocus()
+
+    def _apply_filter(self, text: str):
+        q = fold(text.strip())
+        keys = self._reac_keys
+        self.reac_model.set_filter((lambda row: q in keys[row[1]]) if q else None)
+
+    def _update_checked_label(self):
+        names = self.reac_model.checked_keys()
+        self.lbl_checked.setText(f"Cochés ({len(names)}) : " + ", ".join(names) if names else "")
 
     def _accept(self):
         liant = self.cmb_liant.currentData() or ""
         cata  = self.cmb_cata.currentData() or ""
 
-        reactifs = []
-        for cb in self.reac_checks:
-            if cb.isChecked():
-                raw = cb.property("raw_name") or ""
-                if raw:
-                    reactifs.append(raw)
+        reactifs = [n for n in self.reac_model.checked_keys() if n]
 
         if not reactifs:
             error(self, "Veuillez sélectionner au moins un réactif.")
@@ -197,6 +214,7 @@ class RecipesTab(QWidget):
         self.uc = container["use_cases"]["recipes"]   # {create, update, delete, duplicate}
 
         self._current_original_name: Optional[str] = None
+        self._difficulty: Dict[str, object] = {}   # nom -> RecipeDifficultyVM (recalculé au refresh)
 
         # ///summary: autosave (300ms debounce) + garde-fou pendant chargements
         self._is_loading = False
@@ -204,6 +222,10 @@ class RecipesTab(QWidget):
         self._autosave_timer.setSingleShot(True)
         self._autosave_timer.setInterval(300)
         self._autosave_timer.timeout.connect(lambda: self._save(autosave=True))
+        # ///summary: recherche hors thread GUI, anti-rebond, dernier résultat seulement
+        self._list_query = LatestQuery(
+            self._prepare_list_query, lambda vms: self.list_model.set_items(vms), parent=self,
+        )
 
         self._build_ui()
         self._wire_autosave()
@@ -226,7 +248,8 @@ class RecipesTab(QWidget):
         topbar.addWidget(self.search, 1)
         left_lay.addLayout(topbar)
 
-        self.list = DeletableList(self._delete_selected, self._activate_selected)
+        self.list_model = ViewModelListModel(lambda vm: vm.title, self._list_tooltip)
+        self.list = DeletableListView(self.list_model, self._delete_selected, self._activate_selected)
         left_lay.addWidget(self.list, 1)
 
         splitter.addWidget(left)
@@ -283,7 +306,10 @@ class RecipesTab(QWidget):
         btn_add_combo.clicked.connect(self._add_combo)
         combos_btns.addStretch(1)
         combos_btns.addWidget(btn_add_combo)
+        self.lbl_difficulty = QLabel("")
+        self.lbl_difficulty.setStyleSheet("color: gray;")
         combos_lay.addWidget(self.combos, 1)
+        combos_lay.addWidget(self.lbl_difficulty)
         combos_lay.addLayout(combos_btns)
 
         form.addWidget(combos_box, row, 0, 1, 2); row += 1
@@ -315,11 +341,11 @@ class RecipesTab(QWidget):
         splitter.setStretchFactor(1, 2)
 
         # interactions
-        self.search.textChanged.connect(self._refresh_list)
+        self.search.textChanged.connect(self._list_query.request)
 
         # style léger
         self.setStyleSheet("""
-        QListWidget { min-height: 140px; }
+        QListView { min-height: 140px; }
         #DescEdit {
             border: 1px solid transparent;
             border-radius: 6px;
@@ -361,6 +387,7 @@ class RecipesTab(QWidget):
     def refresh(self):
         # liste des recettes + livres
         self._refresh_books_checklist()
+        self._refresh_difficulty()
         self._refresh_list()
 
     def _refresh_books_checklist(self):
@@ -374,13 +401,53 @@ class RecipesTab(QWidget):
         self.books_widget.set_checked([b for b in current_checked if b in books])
 
     def _refresh_list(self):
+        """///summary: Rafraîchit tout de suite (après sauvegarde, suppression...) ; la saisie passe par _list_query."""
+        self._list_query.run_now()
+
+    def _prepare_list_query(self):
+        """///summary: Lit la recherche (thread GUI) ; la requête renvoyée tourne sur le pool."""
         q = self.search.text().strip()
-        vms = self.presenters["recipes"].list_recipes(query=q)
-        self.list.clear()
-        for vm in vms:
-            it = QListWidgetItem(vm.title)
-            it.setData(Qt.UserRole, vm.name)
-            self.list.addItem(it)
+        presenter = self.presenters["recipes"]
+        # pas d'item Qt par ligne : le modèle expose les VMs (appliqué par LatestQuery)
+        return lambda: presenter.list_recipes(query=q)
+
+    def _patch_list(self, recipe, *, replaces: Optional[str] = None):
+        """///summary: Après sauvegarde : insère / met à jour la seule ligne touchée (+ sa difficulté)."""
+        presenter = self.presenters["recipes"]
+        if replaces and replaces != recipe.name:
+            self._difficulty.pop(replaces, None)
+        stats = presenter.get_recipe_difficulty(recipe)
+        if stats is not None:
+            self._difficulty[recipe.name] = stats
+        self._show_difficulty(self._current_original_name)
+
+        if self.search.text().strip() or self._list_query.pending():
+            # classement de recherche, ou requête en vol qui ignorerait la sauvegarde : liste seule
+            self._refresh_list()
+            return
+        if replaces and replaces != recipe.name:
+            self.list_model.remove(replaces)
+        self.list_model.put(presenter.row(recipe), lambda vm: vm.name.lower())
+
+    def _list_tooltip(self, vm) -> Optional[str]:
+        stats = self._difficulty.get(vm.name)
+        return _difficulty_summary(stats) if stats is not None else None
+
+    def _refresh_difficulty(self):
+        """///summary: Difficultés de toutes les alternatives, en une passe (DifficultyEngine)."""
+        try:
+            self._difficulty = self.presenters["recipes"].get_difficulty_stats()
+        except PotionDBError:   # dataset illisible : pas d'infobulles ; un bug remonte
+            self._difficulty = {}
+        self._show_difficulty(self._current_original_name)
+
+    def _show_difficulty(self, name: Optional[str]):
+        stats = self._difficulty.get(name) if name else None
+        self.lbl_difficulty.setText(_difficulty_summary(stats) if stats is not None else "")
+        totals = list(getattr(stats, "combo_totals", []) or [])
+        for i in range(self.combos.count()):
+            it = self.combos.item(i)
+            it.setToolTip(f"Difficulté : {_fmt_diff(totals[i])}" if i < len(totals) else "")
 
     # ---- Selection / load ----
 
@@ -391,7 +458,7 @@ class RecipesTab(QWidget):
         self._load_into_editor(names[0])
 
     def _selected_names(self) -> List[str]:
-        return [it.data(Qt.UserRole) for it in self.list.selectedItems() if it.data(Qt.UserRole)]
+        return self.list.selected_names()
 
     def _load_into_editor(self, name: str):
         try:
@@ -409,6 +476,7 @@ class RecipesTab(QWidget):
             self.ed_desc.setPlainText(getattr(rec, "desc", "") or "")
             self.books_widget.set_checked(list(getattr(rec, "books", []) or []))
             self._set_combos(rec.combos or [])
+            self._show_difficulty(rec.name)
         finally:
             self._is_loading = False
 
@@ -423,6 +491,7 @@ class RecipesTab(QWidget):
             self.ed_desc.clear()
             self.books_widget.set_checked([])
             self._set_combos([])
+            self._show_difficulty(None)
         finally:
             self._is_loading = False
 
@@ -456,20 +525,8 @@ class RecipesTab(QWidget):
 
     # ---- Combos actions ----
 
-    def _short_effect_map(self) -> Dict[str, str]:
-        """///summary: Map {ing_name: short_effect} pour enrichir l'affichage du dialog."""
-        m: Dict[str, str] = {}
-        try:
-            for ing in self.repos["ingredients"].list_all():
-                se = getattr(ing, "short_effect", None) or getattr(ing, "shortEffect", None)
-                if se:
-                    m[ing.name] = str(se)
-        except Exception:
-            pass
-        return m
-
     def _add_combo(self):
-        dlg = ComboDialog(self.presenters["recipes"], self, short_effects=self._short_effect_map())
+        dlg = ComboDialog(self.presenters["recipes"], self)
         if dlg.exec() == QDialog.Accepted:
             combo = dlg.result_combo()
             self._append_combo_item(combo)
@@ -482,10 +539,7 @@ class RecipesTab(QWidget):
         row = rows[0]
         it = self.combos.item(row)
         initial = list(it.data(Qt.UserRole) or [])
-        dlg = ComboDialog(
-            self.presenters["recipes"], self,
-            initial=initial, short_effects=self._short_effect_map()
-        )
+        dlg = ComboDialog(self.presenters["recipes"], self, initial=initial)
         if dlg.exec() == QDialog.Accepted:
             combo = dlg.result_combo()
             it.setText(" • ".join(combo))
@@ -555,18 +609,18 @@ class RecipesTab(QWidget):
     def _uc_create(self, **kwargs):
         """///summary: Appelle create(...) et retombe sans 'desc' si non supporté."""
         try:
-            self.uc["create"].execute(**kwargs)
+            return self.uc["create"].execute(**kwargs)
         except TypeError:
             kwargs.pop("desc", None)
-            self.uc["create"].execute(**kwargs)
+            return self.uc["create"].execute(**kwargs)
 
     def _uc_update(self, **kwargs):
         """///summary: Appelle update(...) et retombe sans 'desc' si non supporté."""
         try:
-            self.uc["update"].execute(**kwargs)
+            return self.uc["update"].execute(**kwargs)
         except TypeError:
             kwargs.pop("desc", None)
-            self.uc["update"].execute(**kwargs)
+            return self.uc["update"].execute(**kwargs)
 
     def _save(self, *, autosave: bool=False):
         """
@@ -589,7 +643,7 @@ class RecipesTab(QWidget):
 
             if self._current_original_name is None:
                 # --- CREATE ---
-                self._uc_create(
+                saved = self._uc_create(
                     name=name, emoji=emoji, bonus=bonus, combos=combos,
                     books=books, desc=desc
                 )
@@ -597,7 +651,7 @@ class RecipesTab(QWidget):
                 # ///summary: passer en mode 'Nouveau' pour enchaîner une autre création
                 self._is_loading = True
                 try:
-                    self.refresh()      # le nouvel item apparaît en liste
+                    self._patch_list(saved)     # le nouvel item apparaît en liste
                     self._new()         # réinitialise le formulaire
                     self.ed_name.setFocus()
                 finally:
@@ -611,7 +665,7 @@ class RecipesTab(QWidget):
             original = self._current_original_name
             if name == original:
                 # UPDATE
-                self._uc_update(
+                saved = self._uc_update(
                     name=name, emoji=emoji, bonus=bonus, combos=combos,
                     books=books, desc=desc
                 )
@@ -623,7 +677,7 @@ class RecipesTab(QWidget):
                     if autosave:
                         return
                     raise DuplicateNameError(f"Une recette nommée {name!r} existe déjà.")
-                self._uc_create(
+                saved = self._uc_create(
                     name=name, emoji=emoji, bonus=bonus, combos=combos,
                     books=books, desc=desc
                 )
@@ -632,10 +686,10 @@ class RecipesTab(QWidget):
                 if not autosave:
                     info(self, f"Recette renommée en {name!r} et enregistrée.")
 
-            # ///summary: refresh liste et resélectionne l'élément courant
+            # ///summary: met à jour la seule ligne touchée et resélectionne l'élément courant
             self._is_loading = True
             try:
-                self.refresh()
+                self._patch_list(saved, replaces=original)
                 self._select_in_list(self._current_original_name or name)
             finally:
                 self._is_loading = False
@@ -651,11 +705,7 @@ class RecipesTab(QWidget):
                 error(self, f"Erreur inattendue : {e}")
 
     def _select_in_list(self, name: str):
-        for i in range(self.list.count()):
-            it = self.list.item(i)
-            if it.data(Qt.UserRole) == name:
-                self.list.setCurrentItem(it)
-                break
+        self.list.select_name(name)
 
     def _delete_current(self):
         if not self._current_original_name:
@@ -0,0 +1,141 @@
+"""
+Cache des feuilles de style qt_material.
+
+qt_material.apply_stylesheet régénère tout le QSS (jinja2 + templates) et les icônes
+à chaque appel. ThemeCache ne rend chaque thème (sombre/clair, accent) qu'une fois :
+le résultat est gardé en mémoire et sur disque, dans un dossier propre à la version de
+qt_material, puis appliqué directement par setStyleSheet. Les icônes sont générées
+dans un dossier par thème (~/.qt_material/theme_<thème>) au lieu d'être réécrites
+à chaque changement.
+
+qt_material (et jinja2) ne sont importés qu'en cas d'absence du cache.
+"""
+
+from __future__ import annotations
+
+import glob
+import importlib.util
+import json
+import os
+import shutil
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtCore import QDir, QStandardPaths
+from PySide6.QtGui import QColor, QFontDatabase, QGuiApplication, QPalette
+
+
+def qt_material_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("qt-material")
+    except Exception:
+        return "unknown"
+
+
+def default_cache_dir(organization: str, application: str) -> str:
+    base = QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation)
+    return os.path.join(base, organization, application, "qss")
+
+
+class ThemeCache:
+    """
+    apply(app, theme) : comme qt_material.apply_stylesheet(app, theme, invert_secondary)
+    (style Fusion, polices Roboto, icônes, couleur du texte de la palette, variables
+    QTMATERIAL_*), mais avec le QSS rendu une seule fois par thème et par version.
+    """
+
+    def __init__(self, cache_dir: str, version: Optional[str] = None) -> None:
+        self.version = version or qt_material_version()
+        self.cache_dir = os.path.join(cache_dir, self.version)
+        self._entries: Dict[Tuple[str, bool], dict] = {}
+        self._current: Optional[Tuple[str, bool]] = None
+        self._style_set = False
+        self._fonts_loaded = False
+
+    def apply(self, app, theme: str, invert_secondary: bool = False) -> None:
+        """Applique le thème ; ValueError si qt_material ne le connaît pas."""
+        key = (theme, bool(invert_secondary))
+        if key == self._current:
+            return
+        entry = self._entry(key)
+        if not self._style_set:
+            app.setStyle("Fusion")
+            self._style_set = True
+        if not self._fonts_loaded:
+            for font in entry["fonts"]:
+                QFontDatabase.addApplicationFont(font)
+            self._fonts_loaded = True
+        QDir.setSearchPaths("icon", [entry["icons"]])
+        os.environ.update(entry["environ"])
+
+        primary = entry["environ"]["QTMATERIAL_PRIMARYCOLOR"]
+        palette = QGuiApplication.palette()
+        palette.setColor(QPalette.ColorRole.Text,
+                         QColor(*[int(primary[i:i + 2], 16) for i in range(1, 6, 2)], 92))
+        QGuiApplication.setPalette(palette)
+
+        app.setStyleSheet(entry["qss"])
+        self._current = key
+
+    # --- cache ---
+
+    def _entry(self, key: Tuple[str, bool]) -> dict:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._read(key)
+            if entry is None:
+                entry = self._render(key)
+                self._write(key, entry)
+            self._entries[key] = entry
+        return entry
+
+    def _path(self, key: Tuple[str, bool]) -> str:
+        theme, invert = key
+        stem = os.path.splitext(os.path.basename(theme))[0]
+        return os.path.join(self.cache_dir, f"{stem}{'-inv' if invert else ''}.json")
+
+    def _read(self, key: Tuple[str, bool]) -> Optional[dict]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # icônes effacées entre-temps : on régénère
+        return entry if os.path.isdir(entry.get("icons", "")) else None
+
+    def _write(self, key: Tuple[str, bool], entry: dict) -> None:
+        try:
+            parent = os.path.dirname(self.cache_dir)
+            if os.path.isdir(parent):   # versions précédentes de qt_material
+                for old in os.listdir(parent):
+                    if old != self.version:
+                        shutil.rmtree(os.path.join(parent, old), ignore_errors=True)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self._path(key) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            pass  # cache disque best effort : le cache mémoire suffit pour la session
+
+    def _render(self, key: Tuple[str, bool]) -> dict:
+        theme, invert = key
+        stem = os.path.splitext(os.path.basename(theme))[0]
+        from qt_material import build_stylesheet, get_theme
+        from qt_material.resources import RESOURCES_PATH
+
+        colors = get_theme(theme, invert)
+        if colors is None:
+            raise ValueError(f"thème qt_material inconnu : {theme}")
+        icons_parent = f"theme_{stem}{'-inv' if invert else ''}"
+        qss = build_stylesheet(theme, invert, {}, parent=icons_parent)
+
+        # variables posées par qt_material (couleurs du thème + QTMATERIAL_*)
+        keys = set(colors) | {k for k in os.environ if k.startswith("QTMATERIAL_")}
+        package = os.path.dirname(importlib.util.find_spec("qt_material").origin)
+        return {
+            "qss": qss,
+            "icons": os.path.join(RESOURCES_PATH, icons_parent),
+            "fonts": sorted(glob.glob(os.path.join(package, "fonts", "roboto", "*.ttf"))),
+            "environ": {k: os.environ[k] for k in keys if k in os.environ},
+        }
@@ -9,10 +9,11 @@ Respecte la structure actuelle des fichiers:
 from __future__ import annotations
 
 from collections import OrderedDict
-from typing import Any, Dict, List, Mapping, Sequence
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
 # Domain models (snakes case)
 from domain.models import Ingredient, Recipe
+from domain.ingredient_table import IngredientTable
 
 
 # ---------------
@@ -35,21 +36,43 @@ def ingredient_to_dto(ing: Ingredient) -> Dict[str, Any]:
     return dict(dto)
 
 
-def ingredient_from_dto(d: Mapping[str, Any]) -> Ingredient:
+def ingredient_from_dto(d: Mapping[str, Any], pool: Optional[StringPool] = None) -> Ingredient:
     """
     DTO -> Domain Ingredient (normalisation minimale).
+    pool : partagé par tout un chargement, pour ne garder qu'une instance
+    de chaque catégorie / livre / origine.
     """
+    pool = pool if pool is not None else StringPool()
     return Ingredient(
         name=str(d.get("name", "")).strip(),
-        cat=str(d.get("cat", "")).strip(),
+        cat=pool(str(d.get("cat", "")).strip()),
         difficulty=int(d.get("difficulty", 0) or 0),
         short_effect=_norm_empty(d.get("shortEffect")),
         effect=_norm_empty(d.get("effect")),
-        origins=list(d.get("origins", []) or []),
-        books=list(d.get("books", []) or []),
+        origins=pool.strings(d.get("origins", []) or []),
+        books=pool.strings(d.get("books", []) or []),
     )
 
 
+def ingredient_table_from_dtos(dtos: Iterable[Mapping[str, Any]]) -> IngredientTable:
+    """
+    DTOs -> IngredientTable, sans objet Ingredient intermédiaire
+    (mêmes normalisations que ingredient_from_dto).
+    """
+    table = IngredientTable()
+    for d in dtos:
+        table.append(
+            name=str(d.get("name", "")).strip(),
+            cat=str(d.get("cat", "")).strip(),
+            difficulty=int(d.get("difficulty", 0) or 0),
+            short_effect=_norm_empty(d.get("shortEffect")),
+            effect=_norm_empty(d.get("effect")),
+            origins=list(d.get("origins", []) or []),
+            books=list(d.get("books", []) or []),
+        )
+    return table
+
+
 # ---------------
 # RECIPES
 # ---------------
@@ -69,12 +92,17 @@ def recipe_to_dto(rec: Recipe) -> Dict[str, Any]:
     return dict(dto)
 
 
-def recipe_from_dto(d: Mapping[str, Any]) -> Recipe:
+def recipe_from_dto(d: Mapping[str, Any], pool: Optional[StringPool] = None) -> Recipe:
+    """
+    DTO -> Domain Recipe.
+    pool : partagé par tout un chargement (références d'ingrédients, livres).
+    """
+    pool = pool if pool is not None else StringPool()
     combos_raw = list(d.get("ingredients", []) or [])
     norm: List[List[str]] = []
     for c in combos_raw:
         row = [str(x or "").strip() for x in (c if isinstance(c, (list, tuple)) else [])]
-        row = [x for x in row if x]  # supprime vides
+        row = [pool(x) for x in row if x]  # supprime vides
         if row:
             norm.append(row)
 
@@ -85,7 +113,7 @@ def recipe_from_dto(d: Mapping[str, Any]) -> Recipe:
             bonus_val = float(bonus)
     except Exception:
         bonus_val = None
-    books = list(d.get("books") or [])
+    books = pool.strings(d.get("books") or [])
 
     return Recipe(
         name=str(d.get("name", "")).strip(),
@@ -125,6 +153,31 @@ def ensure_books_list(books: Sequence[Any]) -> List[str]:
 # Utils
 # ---------------
 
+class StringPool:
+    """
+    Internement des chaînes répétées d'un même chargement (catégories, titres de livres,
+    origines, références d'ingrédients des recettes) : une seule instance par valeur.
+    Moins de mémoire, et les comparaisons d'instances identiques se résolvent à l'identité.
+    Un pool par chargement : rien n'est retenu d'un rechargement à l'autre.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self) -> None:
+        self._values: Dict[str, str] = {}
+
+    def __call__(self, value: str) -> str:
+        return self._values.setdefault(value, value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def strings(self, values: Iterable[Any]) -> List[Any]:
+        """Liste internée (les valeurs non textuelles sont gardées telles quelles)."""
+        get = self._values.setdefault
+        return [get(v, v) if isinstance(v, str) else v for v in values]
+
+
 def _norm_empty(val: Any) -> str | None:
     if val in ("", None):
         return None
@@ -5,8 +5,16 @@ Aucune dépendance à la GUI, uniquement des VMs (dataclasses).
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
-from typing import Any, Iterable, List, Optional
+from typing import Any, Dict, List, Optional
+
+from application.difficulty_engine import DifficultyEngine
+from application.rule_engine import Progress, RuleReport
+from application.search_index import TextIndex, fold
+from application.snapshot import repo_version
+from application.usage_counters import UsageCounters
+from domain.ingredient_table import IngredientTable
 
 
 # ---------------------------
@@ -22,6 +30,11 @@ def _get(obj: Any, key: str, default: Any = None) -> Any:
     return default
 
 
+# Recherche approchée (SearchService) : ajoutée après les résultats exacts s'ils sont rares
+FUZZY_BELOW = 10
+FUZZY_LIMIT = 10
+
+
 # ---------------------------
 # View Models
 # ---------------------------
@@ -29,7 +42,8 @@ def _get(obj: Any, key: str, default: Any = None) -> Any:
 @dataclass(frozen=True)
 class BookRowVM:
     title: str
-    usage_count: int
+    usage_count: int                 # ingrédients
+    recipe_count: int = 0
 
 
 @dataclass(frozen=True)
@@ -66,55 +80,86 @@ class RecipeRowVM:
     combos: List[List[str]]          # alternatives de taille variable (>=1)
 
 
+@dataclass(frozen=True)
+class RecipeDifficultyVM:
+    name: str
+    alternatives: int
+    bonus: float
+    min_total: Optional[float]       # None si aucune alternative
+    max_total: Optional[float]
+    mean_total: Optional[float]
+    combo_totals: List[float]        # difficulté finale de chaque alternative (ordre du fichier)
+    missing: int                     # ingrédients inconnus (comptés 0)
+
+
+@dataclass(frozen=True)
+class ComboChoiceVM:
+    name: str                        # nom brut (valeur de l'alternative)
+    label: str                       # "Nom (effet court)" pour le dialog d'alternative
+    key: str                         # fold(label) : filtre insensible aux accents / à la casse
+
+
+@dataclass(frozen=True)
+class InspectionVM:
+    report: RuleReport               # compteurs + constats de chaque règle
+    unused_books: List[str]          # "Titre — n recette(s)" si des recettes le citent encore
+
+
 # ---------------------------
 # Presenters
 # ---------------------------
 
 class BooksPresenter:
     """
-    Présente la table des livres et leur taux d'usage (nb d'ingrédients les référencent).
+    Présente la table des livres et leur taux d'usage (nb d'ingrédients / de recettes
+    qui les référencent).
     """
 
-    def __init__(self, data_repo, ingredients_repo) -> None:
+    def __init__(self, data_repo, ingredients_repo, usage: UsageCounters) -> None:
         self.data_repo = data_repo
         self.ingredients_repo = ingredients_repo
+        self.usage = usage   # partagé (composition root) : un seul abonné aux repos
 
     def make_books_table(self) -> BooksTableVM:
         books: List[str] = list(self.data_repo.get_books())
-        # Compter les usages par ingrédients
-        usage = {b: 0 for b in books}
-        for ing in self._list_ingredients():
-            ing_books = _get(ing, "books", []) or []
-            for b in ing_books:
-                if b in usage:
-                    usage[b] += 1
-                else:
-                    # livre référencé mais absent du référentiel -> on l'affiche aussi
-                    usage.setdefault(b, 0)
-                    usage[b] += 1
-                    if b not in books:
-                        books.append(b)
-
-        rows = [BookRowVM(title=b, usage_count=usage.get(b, 0)) for b in sorted(books)]
+        # Compteurs tenus à jour par deltas (UsageCounters)
+        usage = self.usage.book_counts()
+        recipe_usage = self.usage.recipe_book_counts()
+        # livre référencé mais absent du référentiel -> on l'affiche aussi
+        known = set(books)
+        for b in list(usage) + list(recipe_usage):
+            if b not in known:
+                known.add(b)
+                books.append(b)
+
+        rows = [
+            BookRowVM(title=b, usage_count=usage.get(b, 0), recipe_count=recipe_usage.get(b, 0))
+            for b in sorted(books)
+        ]
         return BooksTableVM(rows=rows)
 
-    def _list_ingredients(self) -> Iterable[Any]:
-        # Le repo devra fournir list_all()
-        return self.ingredients_repo.list_all()
-
 
 class OriginsPresenter:
     """
     Présente l'arbre d'origines et expose des listes de feuilles.
     """
 
-    def __init__(self, data_repo, ingredients_repo) -> None:
+    def __init__(self, data_repo, ingredients_repo, usage: UsageCounters) -> None:
         self.data_repo = data_repo
         self.ingredients_repo = ingredients_repo
+        self.usage = usage   # partagé (composition root) : un seul abonné aux repos
 
     def get_origin_tree(self) -> dict:
         return self.data_repo.get_origin_tree()
 
+    def origin_tree_version(self) -> Optional[tuple]:
+        """Version de data.js : inchangée => inutile de relire l'arbre (None : inconnue)."""
+        return repo_version(self.data_repo)
+
+    def get_origin_usage(self) -> Dict[str, int]:
+        """Libellé -> nb d'ingrédients qui le référencent."""
+        return self.usage.origin_counts()
+
     def get_all_leaves(self, *, exclude_path: Optional[str] = None) -> List[str]:
         tree = self.get_origin_tree()
         leaves = self._list_leaves(tree)
@@ -138,12 +183,17 @@ class OriginsPresenter:
 class IngredientsPresenter:
     """
     Liste, filtre et met en forme les ingrédients pour l'UI.
+    Utilisable hors du thread GUI : le cache (table + index plein texte) est protégé
+    par un verrou ; une requête lit une IngredientTable figée (une par version du repo).
     """
 
-    def __init__(self, ingredients_repo, data_repo, recipes_repo) -> None:
+    def __init__(self, ingredients_repo, data_repo, recipes_repo, search_service=None) -> None:
         self.ingredients_repo = ingredients_repo
         self.data_repo = data_repo
         self.recipes_repo = recipes_repo
+        self.search_service = search_service
+        self._cache = _IngredientTableCache(ingredients_repo)
+        self._lock = threading.RLock()
 
     # ---- Listing & filtres ----
 
@@ -159,58 +209,83 @@ class IngredientsPresenter:
         cat = None if (cat in (None, "", "(Toutes)")) else cat
         book = None if (book in (None, "", "(Tous)")) else book
         origin = None if (origin in (None, "", "(Toutes)")) else origin
+        with self._lock:
+            return self._list_ingredients(query, cat, book, origin)
 
-        out: List[IngredientCardVM] = []
-        for ing in self.ingredients_repo.list_all():
-            name = _get(ing, "name", "")
-            category = _get(ing, "cat", "")
-            difficulty = int(_get(ing, "difficulty", 0) or 0)
-            short_effect = _get(ing, "shortEffect", None)
-            effect = _get(ing, "effect", None)
-            books = list(_get(ing, "books", []) or [])
-            origins = list(_get(ing, "origins", []) or [])  # devrait être des libellés simples
-
-            if cat and category != cat:
-                continue
-            if book and book not in books:
-                continue
-
-            if origin:
-                # On accepte soit le chemin complet (au cas où), soit le dernier segment (libellé simple).
-                last = origin.split("/")[-1]
-                if (origin not in origins) and (last not in origins):
-                    continue
-
-            if query:
-                hay = " ".join([
-                    name or "",
-                    category or "",
-                    short_effect or "",
-                    effect or "",
-                    " ".join(books),
-                    " ".join(origins),
-                ]).lower()
-                if query not in hay:
-                    continue
-
-            title = f"{name} — {category} • Diff {difficulty}"
-            out.append(IngredientCardVM(
-                name=name,
-                title=title,
-                category=category,
-                difficulty=difficulty,
-                short_effect=short_effect,
-                effect=effect,
-                books=books,
-                origins=origins,
-            ))
-        # tri par nom
-        out.sort(key=lambda vm: vm.name.lower())
-        return out
+    def _list_ingredients(
+        self, query: str, cat: Optional[str], book: Optional[str], origin: Optional[str],
+    ) -> List[IngredientCardVM]:
+        table = self._cache.get()
+
+        # recherche : postings de l'index plein texte au lieu d'un scan de chaque ingrédient
+        ranks: Dict[int, tuple] = {}
+        candidates: Optional[List[int]] = None
+        if query:
+            for doc, rank in self._cache.text.search(query).items():
+                for pos in self._cache.positions.get(doc, ()):
+                    ranks[pos] = rank
+            # fautes de frappe : noms approchés, classés après toute correspondance exacte
+            for name, score in _fuzzy_names(self.search_service, "ingredients", query, len(ranks)):
+                for pos in table.positions(name):
+                    ranks.setdefault(pos, (_FUZZY_RANK, -score))
+            candidates = sorted(ranks)
+
+        # filtres en colonnes ; on accepte soit le chemin complet (au cas où),
+        # soit le dernier segment (libellé simple) pour l'origine
+        rows = table.filter(
+            cat=cat,
+            books=[book] if book else None,
+            origins=[origin, origin.split("/")[-1]] if origin else None,
+            rows=candidates,
+        )
+        # tri par nom ; avec requête : champ touché (nom d'abord), mot entier avant fragment, puis nom
+        rows = table.sort(rows, by="name")
+        if query:
+            rows.sort(key=ranks.__getitem__)
+        # VMs des seules lignes retenues
+        return [_card_vm(table, i) for i in rows]
+
+    # ---- Mise à jour ligne à ligne (après sauvegarde) ----
+
+    def card(self, ing: Any) -> IngredientCardVM:
+        """VM d'un ingrédient (entité renvoyée par un use-case), sans relire le repo."""
+        name = _get(ing, "name", "") or ""
+        category = _get(ing, "cat", "") or ""
+        difficulty = int(_get(ing, "difficulty", 0) or 0)
+        return IngredientCardVM(
+            name=name,
+            title=f"{name} — {category} • Diff {difficulty}",
+            category=category,
+            difficulty=difficulty,
+            short_effect=_get(ing, "short_effect", None),
+            effect=_get(ing, "effect", None),
+            books=list(_get(ing, "books", []) or []),
+            origins=list(_get(ing, "origins", []) or []),
+        )
+
+    @staticmethod
+    def matches_filters(
+        vm: IngredientCardVM,
+        *,
+        cat: Optional[str] = None,
+        book: Optional[str] = None,
+        origin: Optional[str] = None,
+    ) -> bool:
+        """Mêmes filtres que list_ingredients (hors recherche texte), pour une seule carte."""
+        cat = None if (cat in (None, "", "(Toutes)")) else cat
+        book = None if (book in (None, "", "(Tous)")) else book
+        origin = None if (origin in (None, "", "(Toutes)")) else origin
+        if cat and vm.category != cat:
+            return False
+        if book and book not in vm.books:
+            return False
+        if origin and not {origin, origin.split("/")[-1]} & set(vm.origins):
+            return False
+        return True
 
     def get_filter_sources(self) -> FilterSourcesVM:
-        ings = list(self.ingredients_repo.list_all())
-        cats = sorted({str(_get(i, "cat", "") or "") for i in ings if _get(i, "cat", "")})
+        with self._lock:
+            cats = sorted(c for c in self._cache.get().count_by_category() if c)
         books = list(self.data_repo.get_books())
         # Tous les libellés présents dans l'arbre (parents + feuilles)
         origins = self._list_labels(self.data_repo.get_origin_tree())
@@ -219,12 +294,9 @@ class IngredientsPresenter:
     # ---- Utilitaires ----
 
     def get_ingredients_by_category(self, category: str) -> List[str]:
-        names = [
-            str(_get(i, "name", ""))
-            for i in self.ingredients_repo.list_all()
-            if str(_get(i, "cat", "")) == category
-        ]
-        return sorted([n for n in names if n])
+        with self._lock:
+            table = self._cache.get()
+            return sorted(n for n in table.names(table.filter(cat=category)) if n)
 
     def _list_leaves(self, node: dict, prefix: str = "") -> List[str]:
         out: List[str] = []
@@ -253,51 +325,66 @@ class RecipesPresenter:
     Liste et met en forme les recettes pour l'UI.
     """
 
-    def __init__(self, recipes_repo, ingredients_repo) -> None:
+    def __init__(self, recipes_repo, ingredients_repo, search_service=None) -> None:
         self.recipes_repo = recipes_repo
         self.ingredients_repo = ingredients_repo
+        self.search_service = search_service
+        self._choices = _ComboChoicesCache(ingredients_repo)
 
     def list_recipes(self, *, query: str = "") -> List[RecipeRowVM]:
-        q = (query or "").strip().lower()
-        out: List[RecipeRowVM] = []
-        for r in self.recipes_repo.list_all():
-            name = _get(r, "name", "")
-            emoji = _get(r, "emoji", None)
-            bonus = _coerce_number(_get(r, "bonus", None))
-            combos = self._read_combos(r)  # alternatives de taille variable
-            books = list(_get(r, "books", []) or [])
-
-            if q:
-                hay_parts = [name or "", emoji or ""]
-                for c in combos:
-                    hay_parts.extend(c)
-                if q not in " ".join(hay_parts).lower():
-                    continue
-
-            title = f"{(emoji or '')} {name}".strip()
-            out.append(RecipeRowVM(
-                name=name,
-                title=title,
-                emoji=emoji,
-                bonus=bonus,
-                combos=combos,
-                books=books,
-            ))
+        q = fold((query or "").strip())   # insensible aux accents et à la casse
+        rows = [(r, self._read_combos(r)) for r in self.recipes_repo.list_all()]  # alternatives de taille variable
+        fuzzy: List[tuple] = []
+        scores: Dict[str, float] = {}
+        if q:
+            hits = [q in _recipe_haystack(r, c) for r, c in rows]
+            # fautes de frappe : noms approchés, classés après les correspondances exactes
+            scores = dict(_fuzzy_names(self.search_service, "recipes", query, sum(hits)))
+            fuzzy = [row for row, hit in zip(rows, hits) if not hit and _get(row[0], "name", "") in scores]
+            rows = [row for row, hit in zip(rows, hits) if hit]
+
         # tri alpha par nom
-        out.sort(key=lambda vm: vm.name.lower())
+        out = sorted((self._row_vm(r, c) for r, c in rows), key=lambda vm: vm.name.lower())
+        out += sorted((self._row_vm(r, c) for r, c in fuzzy), key=lambda vm: (-scores[vm.name], vm.name.lower()))
         return out
 
-
     def get_ingredients_by_category(self, category: str) -> List[str]:
-        names = [
-            str(_get(i, "name", ""))
-            for i in self.ingredients_repo.list_all()
-            if str(_get(i, "cat", "")) == category
-        ]
-        return sorted([n for n in names if n])
+        return [c.name for c in self._choices.get().get(category, [])]
+
+    def get_combo_choices(self, category: str) -> List[ComboChoiceVM]:
+        """Choix du dialog d'alternative (triés par nom), index par catégorie mis en cache."""
+        return list(self._choices.get().get(category, []))
+
+    def get_difficulty_stats(self) -> Dict[str, RecipeDifficultyVM]:
+        """Difficultés de toutes les alternatives (DifficultyEngine), par nom de recette."""
+        engine = DifficultyEngine(self.ingredients_repo.list_all(), self.recipes_repo.list_all())
+        return {name: _difficulty_vm(st) for name, st in engine.report().by_name().items()}
+
+    # ---- Mise à jour ligne à ligne (après sauvegarde) ----
+
+    def row(self, recipe: Any) -> RecipeRowVM:
+        """VM d'une recette (entité renvoyée par un use-case), sans relire le repo."""
+        return self._row_vm(recipe, self._read_combos(recipe))
+
+    def get_recipe_difficulty(self, recipe: Any) -> Optional[RecipeDifficultyVM]:
+        """Difficultés de cette seule recette (au lieu de tout recalculer)."""
+        report = DifficultyEngine(self.ingredients_repo.list_all(), [recipe]).report()
+        return _difficulty_vm(report.recipes[0]) if report.recipes else None
 
     # --- private ---
 
+    def _row_vm(self, r: Any, combos: List[List[str]]) -> RecipeRowVM:
+        name = _get(r, "name", "")
+        emoji = _get(r, "emoji", None)
+        return RecipeRowVM(
+            name=name,
+            title=f"{(emoji or '')} {name}".strip(),
+            emoji=emoji,
+            bonus=_coerce_number(_get(r, "bonus", None)),
+            combos=combos,
+            books=list(_get(r, "books", []) or []),
+        )
+
     def _read_combos(self, recipe_obj: Any) -> List[List[str]]:
         """
         Lit recipe.combos (domain) ou recipe['ingredients'] (DTO) et
@@ -315,6 +402,73 @@ class RecipesPresenter:
         return norm
 
 
+class _ComboChoicesCache:
+    """
+    Catégorie -> ComboChoiceVM triés par nom (effet court inclus), reconstruit en une
+    passe quand la version du repo d'ingrédients change.
+    """
+
+    def __init__(self, ingredients_repo) -> None:
+        self.ingredients_repo = ingredients_repo
+        self._version: Optional[tuple] = None
+        self._by_cat: Optional[Dict[str, List[ComboChoiceVM]]] = None
+
+    def get(self) -> Dict[str, List[ComboChoiceVM]]:
+        version = repo_version(self.ingredients_repo)
+        if self._by_cat is None or version is None or version != self._version:
+            self._by_cat = self._build(self.ingredients_repo.list_all())
+            self._version = version
+        return self._by_cat
+
+    @staticmethod
+    def _build(ingredients) -> Dict[str, List[ComboChoiceVM]]:
+        names: Dict[str, set] = {}
+        effects: Dict[str, str] = {}
+        for ing in ingredients:
+            name = str(_get(ing, "name", "") or "")
+            if not name:
+                continue
+            names.setdefault(str(_get(ing, "cat", "") or ""), set()).add(name)
+            se = str(_get(ing, "short_effect", None) or _get(ing, "shortEffect", None) or "").strip()
+            if se:
+                effects[name] = se
+        out: Dict[str, List[ComboChoiceVM]] = {}
+        for cat, cat_names in names.items():
+            choices = []
+            for name in sorted(cat_names):
+                label = f"{name} ({effects[name]})" if name in effects else name
+                choices.append(ComboChoiceVM(name=name, label=label, key=fold(label)))
+            out[cat] = choices
+        return out
+
+
+class _IngredientTableCache:
+    """
+    IngredientTable des ingrédients (colonnes), rechargée quand la version du repo change,
+    + index plein texte mis à jour par différence (seuls les contenus modifiés sont réindexés).
+    """
+
+    def __init__(self, ingredients_repo) -> None:
+        self.ingredients_repo = ingredients_repo
+        self._version: Optional[tuple] = None
+        self._table: Optional[IngredientTable] = None
+        self.text = TextIndex()
+        self.positions: Dict[int, List[int]] = {}   # document -> lignes de la table
+
+    def get(self) -> IngredientTable:
+        version = repo_version(self.ingredients_repo)
+        if self._table is None or version is None or version != self._version:
+            self._rebuild(_load_table(self.ingredients_repo))
+            self._version = version
+        return self._table
+
+    def _rebuild(self, table: IngredientTable) -> None:
+        self._table = table
+        self.positions = {}
+        for pos, doc in enumerate(self.text.sync(_search_fields(table, i) for i in range(len(table)))):
+            self.positions.setdefault(doc, []).append(pos)
+
+
 class InspectionPresenter:
     """
     Fournit des sources annexes utiles pour les corrections (liste des livres, feuilles d'origines).
@@ -323,6 +477,43 @@ class InspectionPresenter:
 
     def __init__(self, integrity_service) -> None:
         self.integrity = integrity_service
+        # analyse() peut tourner hors du thread GUI
+        self._lock = threading.Lock()
+        self._cache: Optional[tuple] = None    # (version du dataset, InspectionVM)
+
+    # --- analyse complète (onglet Analyse) ---
+
+    def dataset_version(self) -> Optional[tuple]:
+        """Versions des trois repos ; None si l'un n'en expose pas (pas de cache)."""
+        versions = tuple(repo_version(r) for r in (
+            self.integrity.ingredients_repo, self.integrity.recipes_repo, self.integrity.data_repo,
+        ))
+        return None if None in versions else versions
+
+    def cached_analysis(self, version: Optional[tuple] = None) -> Optional[InspectionVM]:
+        """Dernière analyse si le dataset n'a pas changé depuis, sinon None."""
+        version = version if version is not None else self.dataset_version()
+        with self._lock:
+            if version is not None and self._cache is not None and self._cache[0] == version:
+                return self._cache[1]
+        return None
+
+    def analyse(self, progress: Optional[Progress] = None) -> InspectionVM:
+        """
+        Un seul snapshot pour toutes les règles et les livres sans ingrédient ;
+        résultat mis en cache par version du dataset. progress : cf. RuleEngine.run.
+        """
+        version = self.dataset_version()  # lue avant le snapshot : une écriture concurrente invalide le cache
+        cached = self.cached_analysis(version)
+        if cached is not None:
+            return cached
+        snapshot = self.integrity.snapshot()
+        report = self.integrity.run(snapshot, progress=progress)
+        vm = InspectionVM(report=report, unused_books=_unused_books(snapshot, report))
+        if version is not None:
+            with self._lock:
+                self._cache = (version, vm)
+        return vm
 
     def get_all_books(self) -> List[str]:
         books = list(self.integrity.data_repo.get_books())
@@ -337,6 +528,20 @@ class InspectionPresenter:
 # Internals
 # ---------------------------
 
+def _unused_books(snapshot, report: RuleReport) -> List[str]:
+    """Livres sans ingrédient (règle unused_books), + recettes qui les citent encore."""
+    unused = set(report.findings("unused_books"))
+    recipe_counts: Dict[str, int] = {}
+    for rec in snapshot.recipes:
+        for b in set(rec.books or []):
+            if b in unused:
+                recipe_counts[b] = recipe_counts.get(b, 0) + 1
+    return [
+        f"{b} — {recipe_counts[b]} recette(s)" if recipe_counts.get(b) else b
+        for b in sorted(unused)
+    ]
+
+
 def _list_leaves(node: dict, prefix: str = "") -> List[str]:
     out: List[str] = []
     for label, children in (node or {}).items():
@@ -348,6 +553,73 @@ def _list_leaves(node: dict, prefix: str = "") -> List[str]:
     return out
 
 
+_FUZZY_RANK = 99   # après tous les champs de TextIndex
+
+
+def _fuzzy_names(search_service, kind: str, query: str, exact_count: int) -> List[tuple]:
+    """(nom, score) approchés (non exacts) si les résultats exacts sont rares."""
+    if search_service is None or exact_count >= FUZZY_BELOW or len(fold(query).strip()) < 3:
+        return []
+    hits = search_service.search(query, kinds=[kind], limit=FUZZY_LIMIT + exact_count)
+    return [(h.label, h.score) for h in hits if not h.exact][:FUZZY_LIMIT]
+
+
+def _recipe_haystack(recipe: Any, combos: List[List[str]]) -> str:
+    parts = [_get(recipe, "name", "") or "", _get(recipe, "emoji", None) or ""]
+    for c in combos:
+        parts.extend(c)
+    return fold(" ".join(parts))
+
+
+def _difficulty_vm(st) -> RecipeDifficultyVM:
+    return RecipeDifficultyVM(
+        name=st.name,
+        alternatives=st.alternatives,
+        bonus=st.bonus,
+        min_total=st.min_total,
+        max_total=st.max_total,
+        mean_total=st.mean_total,
+        combo_totals=st.combo_totals,
+        missing=st.missing,
+    )
+
+
+def _load_table(ingredients_repo) -> IngredientTable:
+    """repo.load_table() (colonnes directement depuis les DTOs) si disponible."""
+    load = getattr(ingredients_repo, "load_table", None)
+    if callable(load):
+        return load()
+    return IngredientTable.from_ingredients(ingredients_repo.list_all())
+
+
+def _search_fields(table: IngredientTable, i: int) -> tuple:
+    """Champs recherchés, par importance (nom d'abord)."""
+    return (
+        table.name(i),
+        table.category(i),
+        table.short_effect(i) or "",
+        table.effect(i) or "",
+        " ".join(table.book_titles(i)),
+        " ".join(table.origin_labels(i)),
+    )
+
+
+def _card_vm(table: IngredientTable, i: int) -> IngredientCardVM:
+    name = table.name(i)
+    category = table.category(i)
+    difficulty = table.difficulty(i)
+    return IngredientCardVM(
+        name=name,
+        title=f"{name} — {category} • Diff {difficulty}",
+        category=category,
+        difficulty=difficulty,
+        short_effect=table.short_effect(i),
+        effect=table.effect(i),
+        books=table.book_titles(i),
+        origins=table.origin_labels(i),   # devrait être des libellés simples
+    )
+
+
 def _coerce_number(value: Any) -> Optional[float]:
     if value in (None, ""):
         return None
@@ -0,0 +1,173 @@
+"""
+DifficultyEngine : difficulté totale de TOUTES les alternatives de toutes les recettes,
+en une passe vectorisée (NumPy), pour l'équilibrage.
+
+Même calcul que PotionBuilder (compute.js) :
+    total = somme des difficultés des ingrédients (inconnu = 0)
+    si bonus de recette : total = max(0, total - bonus)
+
+Encodage :
+- ingrédients -> ids entiers, difficultés dans un tableau (id sentinelle = inconnu, 0)
+- alternatives -> CSR (indptr / indices), recettes -> plages d'alternatives
+
+NumPy est optionnel (importé au premier rapport) : sans lui, le même calcul tourne en pur Python.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from domain.models import Ingredient, Recipe
+from domain.optional_numpy import np, numpy_available
+
+
+@dataclass(frozen=True)
+class RecipeDifficultyStats:
+    name: str
+    alternatives: int
+    bonus: float
+    min_total: Optional[float]        # None si aucune alternative
+    max_total: Optional[float]
+    mean_total: Optional[float]
+    mean_raw: Optional[float]         # avant bonus
+    combo_totals: List[float]         # ordre des alternatives
+    missing: int                      # références d'ingrédients inconnues
+
+
+@dataclass(frozen=True)
+class DifficultyReport:
+    recipes: List[RecipeDifficultyStats]     # ordre du fichier
+
+    def by_name(self) -> Dict[str, RecipeDifficultyStats]:
+        out: Dict[str, RecipeDifficultyStats] = {}
+        for st in self.recipes:
+            out.setdefault(st.name, st)
+        return out
+
+
+class DifficultyEngine:
+    def __init__(self, ingredients: Sequence[Ingredient], recipes: Sequence[Recipe]) -> None:
+        self.recipes: List[Recipe] = list(recipes)
+
+        ids: Dict[str, int] = {}
+        diffs: List[int] = []
+        for ing in ingredients:
+            if ing.name not in ids:
+                ids[ing.name] = len(diffs)
+                diffs.append(int(ing.difficulty or 0))
+        self._missing_id = len(diffs)
+        diffs.append(0)  # sentinelle : ingrédient inconnu
+        self._ids = ids
+        self._diffs = diffs
+
+        # CSR des alternatives + plages par recette
+        indices: List[int] = []
+        indptr: List[int] = [0]
+        recipe_ptr: List[int] = [0]
+        bonuses: List[float] = []
+        for rec in self.recipes:
+            for combo in rec.combos or []:
+                indices.extend(ids.get(n, self._missing_id) for n in combo)
+                indptr.append(len(indices))
+            recipe_ptr.append(len(indptr) - 1)
+            bonuses.append(float(rec.bonus or 0))
+        self._indices = indices
+        self._indptr = indptr
+        self._recipe_ptr = recipe_ptr
+        self._bonuses = bonuses
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "DifficultyEngine":
+        return cls(snapshot.ingredients, snapshot.recipes)
+
+    def report(self) -> DifficultyReport:
+        if numpy_available():
+            totals, agg = self._compute_numpy()
+        else:
+            totals, agg = self._compute_python()
+        mins, maxs, means, raw_means, missing = agg
+
+        rows: List[RecipeDifficultyStats] = []
+        ptr = self._recipe_ptr
+        for r, rec in enumerate(self.recipes):
+            n = ptr[r + 1] - ptr[r]
+            rows.append(RecipeDifficultyStats(
+                name=rec.name,
+                alternatives=n,
+                bonus=self._bonuses[r],
+                min_total=mins[r] if n else None,
+                max_total=maxs[r] if n else None,
+                mean_total=means[r] if n else None,
+                mean_raw=raw_means[r] if n else None,
+                combo_totals=totals[ptr[r]:ptr[r + 1]],
+                missing=int(missing[r]),
+            ))
+        return DifficultyReport(recipes=rows)
+
+    # --- calcul ---
+    # Les deux variantes renvoient (totaux par alternative, agrégats par recette) ;
+    # agrégats = (min, max, moyenne, moyenne avant bonus, inconnus), indexés par recette.
+
+    def _compute_numpy(self):
+        diffs = np.asarray(self._diffs, dtype=np.float64)
+        indices = np.asarray(self._indices, dtype=np.int64)
+        indptr = np.asarray(self._indptr, dtype=np.int64)
+        recipe_ptr = np.asarray(self._recipe_ptr, dtype=np.int64)
+        n_combos = len(indptr) - 1
+        n_recipes = len(recipe_ptr) - 1
+        per_recipe = np.diff(recipe_ptr)
+
+        # alternative de chaque référence, puis somme par alternative (robuste aux vides)
+        owner = np.repeat(np.arange(n_combos), np.diff(indptr))
+        raw = np.bincount(owner, weights=diffs[indices], minlength=n_combos)
+
+        # bonus de la recette propriétaire ; plancher à 0 seulement si bonus (comme le JS)
+        bonus = np.repeat(np.asarray(self._bonuses, dtype=np.float64), per_recipe)
+        totals = np.where(bonus != 0, np.maximum(0.0, raw - bonus), raw)
+
+        # agrégats par recette : reduceat sur les recettes non vides uniquement
+        rec_of_combo = np.repeat(np.arange(n_recipes), per_recipe)
+        counts = np.maximum(per_recipe, 1)
+        means = np.bincount(rec_of_combo, weights=totals, minlength=n_recipes) / counts
+        raw_means = np.bincount(rec_of_combo, weights=raw, minlength=n_recipes) / counts
+        mins = np.zeros(n_recipes)
+        maxs = np.zeros(n_recipes)
+        filled = per_recipe > 0
+        if n_combos:
+            starts = recipe_ptr[:-1][filled]
+            mins[filled] = np.minimum.reduceat(totals, starts)
+            maxs[filled] = np.maximum.reduceat(totals, starts)
+        unknown = np.bincount(
+            rec_of_combo[owner], weights=(indices == self._missing_id), minlength=n_recipes,
+        ) if len(indices) else np.zeros(n_recipes)
+
+        return totals.tolist(), (
+            mins.tolist(), maxs.tolist(), means.tolist(), raw_means.tolist(),
+            unknown.astype(np.int64).tolist(),
+        )
+
+    def _compute_python(self):
+        totals: List[float] = []
+        mins: List[float] = []
+        maxs: List[float] = []
+        means: List[float] = []
+        raw_means: List[float] = []
+        missing: List[int] = []
+        for r in range(len(self.recipes)):
+            bonus = self._bonuses[r]
+            raws: List[float] = []
+            unknown = 0
+            for c in range(self._recipe_ptr[r], self._recipe_ptr[r + 1]):
+                refs = self._indices[self._indptr[c]:self._indptr[c + 1]]
+                raws.append(float(sum(self._diffs[i] for i in refs)))
+                unknown += sum(1 for i in refs if i == self._missing_id)
+            t = [max(0.0, s - bonus) if bonus else s for s in raws]
+            totals.extend(t)
+            n = max(len(t), 1)
+            mins.append(min(t) if t else 0.0)
+            maxs.append(max(t) if t else 0.0)
+            means.append(sum(t) / n)
+            raw_means.append(sum(raws) / n)
+            missing.append(unknown)
+        return totals, (mins, maxs, means, raw_means, missing)
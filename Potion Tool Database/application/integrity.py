@@ -1,19 +1,30 @@
 """
 IntegrityService : produit un rapport d'inspection transversal du dataset.
 - livres manquants (référencés par ingrédients mais absents du référentiel)
-- origines invalides (non-feuilles ou absentes)
+- livres sans ingrédient, doublons de livres
+- origines invalides (non-feuilles ou absentes), doublons d'origine dans un ingrédient
 - ingrédients non utilisés par des recettes
 - recettes invalides (références cassées ou combos incorrects)
-- doublons de noms (ingrédients/recettes)
+- doublons de noms (ingrédients/recettes), exacts ou quasi identiques (casse, accents,
+  espaces, fautes de frappe)
+- combinaisons ambiguës (même ensemble d'ingrédients revendiqué par plusieurs recettes)
+  et alternatives en double dans une même recette
+
+Chaque contrôle est une règle du RuleEngine : une seule passe sur le snapshot,
+éventuellement répartie sur plusieurs cœurs (workers > 1).
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Set
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
 
-from domain.errors import NotFoundError, RecipeError
+from domain.errors import NotFoundError, ValidationError
 from domain import rules
+from domain.matching import ComboSignature, combo_signature
+from application.near_duplicates import find_near_duplicates
+from application.rule_engine import Progress, Rule, RuleEngine, RuleReport
+from application.snapshot import DatasetSnapshot, take_snapshot
 
 
 @dataclass(frozen=True)
@@ -23,6 +34,7 @@ class InspectionReport:
     unused_ingredients: List[str]
     invalid_recipes: List[str]
     duplicate_names: List[str]
+    near_duplicate_names: List[str] = field(default_factory=list)
 
 
 class IntegrityService:
@@ -30,85 +42,308 @@ class IntegrityService:
         self.ingredients_repo = ingredients_repo
         self.recipes_repo = recipes_repo
         self.data_repo = data_repo
+        self.engine = RuleEngine(default_rules())
+
+    def snapshot(self) -> DatasetSnapshot:
+        return take_snapshot(self.ingredients_repo, self.recipes_repo, self.data_repo)
 
-    def inspect(self) -> InspectionReport:
-        ings = list(self.ingredients_repo.list_all())
-        recs = list(self.recipes_repo.list_all())
-        books_ref = set(self.data_repo.get_books() or [])
-
-        # Prépare référentiels d'origines
-        nodes = set(_list_all_nodes(self.data_repo.get_origin_tree()))  # chemins complets
-        labels = {n.split("/")[-1] for n in nodes}                      # libellés uniques
-
-        # ---- Livres manquants ----
-        referenced_books: Set[str] = set()
-        for ing in ings:
-            for b in (ing.books or []):
-                if b:
-                    referenced_books.add(b)
-        missing_books = sorted(list(referenced_books - books_ref))
-
-        # ---- Origines invalides (on s'attend à des libellés en base) ----
-        referenced_origins: Set[str] = set()
-        for ing in ings:
-            for o in (ing.origins or []):
-                if o:
-                    referenced_origins.add(o)
-
-        invalid_origins = sorted([
-            o for o in referenced_origins
-            if not (
-                o in labels   # libellé valide
-                or o in nodes # tolérance: si quelqu'un a stocké un chemin complet
-            )
-        ])
-
-        # ---- Ingrédients non utilisés ----
-        used_ing: Set[str] = set()
-        for r in recs:
-            combos = getattr(r, "combos", None)
-            if combos is None:
-                combos = getattr(r, "ingredients", [])  # tolérance DTO
-            for c in combos or []:
-                for name in (list(c) if isinstance(c, (list, tuple)) else []):
-                    if name:
-                        used_ing.add(name)
-        unused_ingredients = sorted([i.name for i in ings if i.name not in used_ing])
-
-        # ---- Recettes invalides (utilise la règle assouplie) ----
-        invalid_recipes: Set[str] = set()
-        for r in recs:
-            combos = getattr(r, "combos", None)
-            if combos is None:
-                combos = getattr(r, "ingredients", [])
-            for c in combos or []:
-                try:
-                    rules.validate_combo(c, self.ingredients_repo)
-                except (NotFoundError, RecipeError):
-                    invalid_recipes.add(r.name)
-                    break
-
-        # ---- Doublons ----
-        dup_ing = rules.find_duplicates([i.name for i in ings])
-        dup_rec = rules.find_duplicates([r.name for r in recs])
-        duplicate_names = sorted(list(set(dup_ing) | set(dup_rec)))
+    def run(self, snapshot: Optional[DatasetSnapshot] = None, *, workers: int = 1,
+            progress: Optional[Progress] = None) -> RuleReport:
+        """Rapport complet (toutes les règles enregistrées, avec timings)."""
+        snap = snapshot if snapshot is not None else self.snapshot()
+        return self.engine.run(snap, workers=workers, progress=progress)
 
+    def inspect(self, snapshot: Optional[DatasetSnapshot] = None, *, workers: int = 1) -> InspectionReport:
+        report = self.run(snapshot, workers=workers)
         return InspectionReport(
-            missing_books=missing_books,
-            invalid_origins=invalid_origins,
-            unused_ingredients=unused_ingredients,
-            invalid_recipes=sorted(list(invalid_recipes)),
-            duplicate_names=duplicate_names,
+            missing_books=report.findings("missing_books"),
+            invalid_origins=report.findings("invalid_origins"),
+            unused_ingredients=report.findings("unused_ingredients"),
+            invalid_recipes=report.findings("invalid_recipes"),
+            duplicate_names=report.findings("duplicate_names"),
+            near_duplicate_names=report.findings("near_duplicate_names"),
         )
 
 
+# ---------------------------
+# Règles intégrées
+# ---------------------------
+
+class MissingBooksRule(Rule):
+    name = "missing_books"
+    category = "books"
+    title = "Livres manquants"
+    partitionable = True
+
+    def begin(self, snapshot):
+        self._known = set(snapshot.books)
+        self._referenced: Set[str] = set()
+
+    def visit_ingredient(self, ing):
+        for b in (ing.books or []):
+            if b:
+                self._referenced.add(b)
+
+    def finish(self):
+        return sorted(self._referenced - self._known)
+
+
+class UnusedBooksRule(Rule):
+    """Livres du référentiel qu'aucun ingrédient ne référence."""
+    name = "unused_books"
+    category = "books"
+    title = "Livres sans ingrédient"
+
+    def begin(self, snapshot):
+        self._books: List[str] = []
+        self._used: Set[str] = set()
+
+    def visit_book(self, title):
+        self._books.append(title)
+
+    def visit_ingredient(self, ing):
+        self._used.update(ing.books or [])
+
+    def finish(self):
+        return sorted({b for b in self._books if b not in self._used})
+
+
+class DuplicateBooksRule(Rule):
+    name = "duplicate_books"
+    category = "books"
+    title = "Doublons — Livres"
+
+    def begin(self, snapshot):
+        self._books: List[str] = []
+
+    def visit_book(self, title):
+        self._books.append(title)
+
+    def finish(self):
+        return rules.find_duplicates(self._books)
+
+
+class InvalidOriginsRule(Rule):
+    """On s'attend à des libellés en base (tolérance : chemin complet)."""
+    name = "invalid_origins"
+    category = "origins"
+    title = "Origines invalides"
+    partitionable = True
+
+    def begin(self, snapshot):
+        self._nodes = set(snapshot.origin_nodes)
+        self._labels = snapshot.origin_labels
+        self._invalid: Set[str] = set()
+
+    def visit_ingredient(self, ing):
+        for o in (ing.origins or []):
+            if o and o not in self._labels and o not in self._nodes:
+                self._invalid.add(o)
+
+    def finish(self):
+        return sorted(self._invalid)
+
+
+class DuplicateOriginsRule(Rule):
+    """Une même origine apparaît plusieurs fois dans ing.origins."""
+    name = "duplicate_origins"
+    category = "origins"
+    title = "Doublons — Origines (dans un même ingrédient)"
+    partitionable = True
+
+    def begin(self, snapshot):
+        self._out: List[str] = []
+
+    def visit_ingredient(self, ing):
+        seen: Set[str] = set()
+        dups: Set[str] = set()
+        for o in (ing.origins or []):
+            if o in seen:
+                dups.add(o)
+            else:
+                seen.add(o)
+        for d in sorted(dups):
+            self._out.append(f"{ing.name} — {d}")
+
+    def finish(self):
+        return self._out
+
+    def merge(self, parts):
+        # morceaux contigus, dans l'ordre : même résultat qu'une passe unique
+        return [f for part in parts for f in part]
+
+
+class UnusedIngredientsRule(Rule):
+    name = "unused_ingredients"
+    category = "ingredients"
+    title = "Ingrédients non utilisés"
+
+    def begin(self, snapshot):
+        self._names: List[str] = []
+        self._used: Set[str] = set()
+
+    def visit_ingredient(self, ing):
+        self._names.append(ing.name)
+
+    def visit_recipe(self, rec):
+        for c in _combos_of(rec):
+            for name in c:
+                if name:
+                    self._used.add(name)
+
+    def finish(self):
+        return sorted(n for n in self._names if n not in self._used)
+
+
+class InvalidRecipesRule(Rule):
+    """Références cassées ou combos hors règle (domain.rules.validate_combo)."""
+    name = "invalid_recipes"
+    category = "recipes"
+    title = "Recettes invalides"
+    partitionable = True
+
+    def begin(self, snapshot):
+        self._lookup = snapshot
+        self._invalid: Set[str] = set()
+
+    def visit_recipe(self, rec):
+        for c in _combos_of(rec):
+            try:
+                rules.validate_combo(c, self._lookup)
+            except (NotFoundError, ValidationError):
+                self._invalid.add(rec.name)
+                break
+
+    def finish(self):
+        return sorted(self._invalid)
+
+
+class ConflictingCombosRule(Rule):
+    """
+    Même ensemble d'ingrédients (ordre indifférent) revendiqué par plusieurs recettes :
+    PotionBuilder ne retient que la 1re, les autres sont masquées.
+    Index signature -> 1re recette ; la liste n'est créée qu'en cas de collision.
+    """
+    name = "conflicting_combos"
+    category = "recipes"
+    title = "Combinaisons revendiquées par plusieurs recettes"
+
+    def begin(self, snapshot):
+        self._owner: Dict[ComboSignature, str] = {}
+        self._conflicts: Dict[ComboSignature, List[str]] = {}
+
+    def visit_recipe(self, rec):
+        seen: Set[ComboSignature] = set()
+        for c in _combos_of(rec):
+            sig = combo_signature(c)
+            if sig in seen:
+                continue  # doublon interne : cf. DuplicateAlternativesRule
+            seen.add(sig)
+            owner = self._owner.setdefault(sig, rec.name)
+            if owner != rec.name:
+                self._conflicts.setdefault(sig, [owner]).append(rec.name)
+
+    def finish(self):
+        return sorted(
+            f"{' • '.join(sorted(sig[1]))} — {' ⇄ '.join(names)}"
+            for sig, names in self._conflicts.items()
+        )
+
+
+class DuplicateAlternativesRule(Rule):
+    name = "duplicate_alternatives"
+    category = "recipes"
+    title = "Doublons — Alternatives (dans une même recette)"
+    partitionable = True
+
+    def begin(self, snapshot):
+        self._out: List[str] = []
+
+    def visit_recipe(self, rec):
+        first: Dict[ComboSignature, int] = {}
+        for i, c in enumerate(_combos_of(rec), start=1):
+            sig = combo_signature(c)
+            if sig in first:
+                self._out.append(f"{rec.name} — alternative {i} = alternative {first[sig]}")
+            else:
+                first[sig] = i
+
+    def finish(self):
+        return self._out
+
+    def merge(self, parts):
+        return [f for part in parts for f in part]
+
+
+class DuplicateNamesRule(Rule):
+    name = "duplicate_names"
+    category = "names"
+    title = "Doublons — Ingrédients & Recettes"
+
+    def begin(self, snapshot):
+        self._ing: List[str] = []
+        self._rec: List[str] = []
+
+    def visit_ingredient(self, ing):
+        self._ing.append(ing.name)
+
+    def visit_recipe(self, rec):
+        self._rec.append(rec.name)
+
+    def finish(self):
+        dup_ing = rules.find_duplicates(self._ing)
+        dup_rec = rules.find_duplicates(self._rec)
+        return sorted(set(dup_ing) | set(dup_rec))
+
+
+class NearDuplicateNamesRule(Rule):
+    """
+    Noms quasi identiques (« Eau pure » / « eau  pure » / « Éau pure ») :
+    clé normalisée puis MinHash/LSH (application.near_duplicates), sans comparer
+    toutes les paires. Ingrédients et recettes séparément.
+    """
+    name = "near_duplicate_names"
+    category = "names"
+    title = "Noms quasi identiques — Ingrédients & Recettes"
+
+    def begin(self, snapshot):
+        self._ing: List[str] = []
+        self._rec: List[str] = []
+
+    def visit_ingredient(self, ing):
+        self._ing.append(ing.name)
+
+    def visit_recipe(self, rec):
+        self._rec.append(rec.name)
+
+    def finish(self):
+        out: List[str] = []
+        for label, names in (("Ingrédients", self._ing), ("Recettes", self._rec)):
+            for cluster in find_near_duplicates(names):
+                out.append(f"{label} : " + " ≈ ".join(f"« {n} »" for n in cluster))
+        return out
+
+
+def default_rules() -> List[Rule]:
+    return [
+        MissingBooksRule(),
+        UnusedBooksRule(),
+        DuplicateBooksRule(),
+        InvalidOriginsRule(),
+        DuplicateOriginsRule(),
+        UnusedIngredientsRule(),
+        InvalidRecipesRule(),
+        ConflictingCombosRule(),
+        DuplicateAlternativesRule(),
+        DuplicateNamesRule(),
+        NearDuplicateNamesRule(),
+    ]
+
+
 # --- Utils ---
 
-def _list_all_nodes(node: dict, prefix: str = "") -> List[str]:
-    out: List[str] = []
-    for label, children in (node or {}).items():
-        key = f"{prefix}/{label}" if prefix else label
-        out.append(key)
-        if isinstance(children, dict) and children:
-            out.extend(_list_all_nodes(children, key))
-    return out
+def _combos_of(rec) -> Iterable[list]:
+    combos = getattr(rec, "combos", None)
+    if combos is None:
+        combos = getattr(rec, "ingredients", [])  # tolérance DTO
+    return [c for c in (combos or []) if isinstance(c, (list, tuple))]
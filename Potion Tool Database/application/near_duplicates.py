@@ -0,0 +1,166 @@
+"""
+Noms quasi identiques (« Eau pure » / « eau  pure » / « Eau Pure  » / « Éau pure »),
+en temps quasi linéaire : aucune comparaison de toutes les paires.
+
+1. clé normalisée (fold : casse et accents, espaces réduits, apostrophes unifiées) :
+   même clé = même groupe, sans comparaison ;
+2. variantes proches (fautes de frappe) : signature MinHash des trigrammes de la clé,
+   LSH par bandes ; les seaux de plus de _MAX_BUCKET clés (noms structurés du type
+   « Ingrédient 0001 », « Ingrédient 0002 »…) sont ignorés ;
+3. chaque clé, dans l'ordre, est comparée aux *représentants* des groupes de ses
+   voisins de seau (Jaccard exact des trigrammes, >= min_similarity) et rejoint le
+   plus proche ; sinon elle devient représentante. Tout membre ressemble directement
+   à son représentant : pas de chaînage A ≈ B ≈ C … qui fusionnerait tout.
+Travail borné par clé (bandes x _MAX_BUCKET) : linéaire en nombre de noms
+(cf. benchmarks/bench_near_duplicates.py).
+
+NumPy est optionnel (importé au premier appel) : il calcule les signatures et les seaux d'un bloc ;
+sans lui, même calcul en pur Python.
+"""
+
+from __future__ import annotations
+
+import random
+import zlib
+from typing import Dict, Iterable, List, Set, Tuple
+
+from application.search_index import GRAM, fold
+from domain.optional_numpy import np, numpy_available
+
+NEAR_DUP_MIN_SIMILARITY = 0.7
+
+# 20 bandes de 5 lignes : paire à 0.7 de Jaccard candidate à ~97 %, à 0.5 à ~47 %, à 0.3 à ~5 %
+_BANDS = 20
+_ROWS = 5
+_PRIME = 4294967291          # < 2**32 : a * x + b tient dans un uint64
+_CHUNK = 2048               # clés par bloc (variante NumPy)
+_MAX_BUCKET = 50            # au-delà, seau trop générique : ignoré
+_rng = random.Random(0x5EED)
+_COEFFS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(_BANDS * _ROWS)]
+
+_APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "ʼ": "'", "`": "'"})
+
+
+def name_key(name: str) -> str:
+    """Clé de regroupement : « Cendre d’Osseux  » -> « cendre d'osseux »."""
+    return " ".join(fold(name).translate(_APOSTROPHES).split())
+
+
+def find_near_duplicates(
+    names: Iterable[str],
+    *,
+    min_similarity: float = NEAR_DUP_MIN_SIMILARITY,
+    fuzzy: bool = True,
+) -> List[List[str]]:
+    """
+    Groupes (>= 2 noms distincts) de noms quasi identiques, triés.
+    Les doublons exacts d'une même chaîne ne forment pas un groupe (cf. find_duplicates).
+    """
+    groups: Dict[str, List[str]] = {}
+    for n in dict.fromkeys(names):
+        key = name_key(n or "")
+        if key:
+            groups.setdefault(key, []).append(n)
+    keys = list(groups)
+
+    rep = list(range(len(keys)))   # représentant du groupe de chaque clé
+    if fuzzy and len(keys) > 1:
+        shingles = [_shingles(k) for k in keys]
+        buckets = _buckets_numpy(shingles) if numpy_available() else _buckets_python(shingles)
+        buckets = [m for m in buckets if len(m) <= _MAX_BUCKET]
+        neighbours: List[List[int]] = [[] for _ in keys]
+        for b, members in enumerate(buckets):
+            for i in members:
+                neighbours[i].append(b)
+        for i in range(len(keys)):
+            best, best_sim = i, 0.0
+            seen: Set[int] = set()
+            for b in neighbours[i]:
+                for j in buckets[b]:
+                    if j >= i:
+                        break           # seaux triés : seules les clés déjà placées comptent
+                    r = rep[j]
+                    if r in seen:
+                        continue
+                    seen.add(r)
+                    sim = _jaccard(shingles[i], shingles[r])
+                    # le plus proche ; à égalité le plus ancien (indépendant de l'ordre des seaux)
+                    if sim >= min_similarity and (sim, -r) > (best_sim, -best):
+                        best, best_sim = r, sim
+            rep[i] = best
+
+    clusters: Dict[int, List[str]] = {}
+    for i, key in enumerate(keys):
+        clusters.setdefault(rep[i], []).extend(groups[key])
+    out = [sorted(c, key=lambda n: (name_key(n), n)) for c in clusters.values() if len(c) > 1]
+    out.sort(key=lambda c: (name_key(c[0]), c[0]))
+    return out
+
+
+# --- LSH ---
+# Les deux variantes renvoient les seaux d'au moins 2 clés (indices croissants).
+
+def _buckets_python(shingles: List[Set[str]]) -> Iterable[List[int]]:
+    hashes: Dict[str, Tuple[int, ...]] = {}   # trigramme -> ses hachages (partagés entre clés)
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+    for i, sh in enumerate(shingles):
+        rows = []
+        for s in sh:
+            h = hashes.get(s)
+            if h is None:
+                x = zlib.crc32(s.encode("utf-8"))
+                h = hashes[s] = tuple((a * x + b) % _PRIME for a, b in _COEFFS)
+            rows.append(h)
+        sig = rows[0] if len(rows) == 1 else tuple(map(min, *rows))
+        for b in range(_BANDS):
+            buckets.setdefault((b, sig[b * _ROWS:(b + 1) * _ROWS]), []).append(i)
+    return [m for m in buckets.values() if len(m) > 1]
+
+
+def _buckets_numpy(shingles: List[Set[str]]) -> Iterable[List[int]]:
+    # trigrammes distincts -> ids ; trigrammes de chaque clé en CSR
+    ids: Dict[str, int] = {}
+    indices: List[int] = []
+    indptr: List[int] = [0]
+    for sh in shingles:
+        indices.extend(ids.setdefault(s, len(ids)) for s in sh)
+        indptr.append(len(indices))
+
+    x = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in ids), dtype=np.uint64, count=len(ids))
+    a = np.asarray([c[0] for c in _COEFFS], dtype=np.uint64)
+    b = np.asarray([c[1] for c in _COEFFS], dtype=np.uint64)
+    hashes = ((x[:, None] * a + b) % np.uint64(_PRIME)).astype(np.uint32)   # < 2**32 : moitié moins de mémoire
+    # minimum par clé, par blocs de clés (la matrice trigramme x hachage n'est jamais dupliquée en entier)
+    indices_arr = np.asarray(indices, dtype=np.int64)
+    indptr_arr = np.asarray(indptr, dtype=np.int64)
+    sig = np.empty((len(shingles), len(_COEFFS)), dtype=np.uint32)
+    for lo in range(0, len(shingles), _CHUNK):
+        hi = min(lo + _CHUNK, len(shingles))
+        start, stop = indptr_arr[lo], indptr_arr[hi]
+        sig[lo:hi] = np.minimum.reduceat(hashes[indices_arr[start:stop]], indptr_arr[lo:hi] - start, axis=0)
+
+    out: List[List[int]] = []
+    for band in range(_BANDS):
+        cols = sig[:, band * _ROWS:(band + 1) * _ROWS].astype(np.uint64)
+        key = cols[:, 0].copy()
+        for k in range(1, _ROWS):
+            key = key * np.uint64(1000003) ^ cols[:, k]   # débordement voulu (modulo 2**64)
+        order = np.argsort(key, kind="stable")
+        ranked = key[order]
+        starts = np.flatnonzero(np.r_[True, ranked[1:] != ranked[:-1]])
+        ends = np.r_[starts[1:], len(ranked)]
+        for s, e in zip(starts[ends - starts > 1].tolist(), ends[ends - starts > 1].tolist()):
+            out.append(order[s:e].tolist())
+    return out
+
+
+# --- Utils ---
+
+def _shingles(key: str) -> Set[str]:
+    padded = f" {key} "
+    return {padded[i:i + GRAM] for i in range(max(len(padded) - GRAM + 1, 1))}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter) if inter else 0.0
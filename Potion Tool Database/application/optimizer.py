@@ -0,0 +1,281 @@
+"""
+ComboOptimizer : alternatives les moins difficiles sous contraintes de livres et d'origines.
+
+- recette ciblée : ses alternatives réalisables, triées par difficulté finale ;
+- recherche ouverte : toutes les alternatives valides (domain.rules.validate_combo :
+  >= 1 Réactif, au plus 1 Liant et 1 Catalyseur), k meilleures.
+
+Difficulté = calcul de PotionBuilder (domain.matching.RecipeMatcher.compute) :
+somme des difficultés, moins le bonus de la recette reconnue (plancher à 0).
+
+Recherche ouverte en deux temps :
+1. alternatives des recettes (bonus possible) : ensemble fini, évaluées une par une ;
+2. autres alternatives (sans bonus) : séparation-évaluation sur des listes triées par
+   difficulté ; une branche est coupée dès que sa borne inférieure dépasse le k-ième
+   meilleur total, ou l'égale avec des noms classés après lui (clé de _rank), ce qui
+   évite l'énumération même avec des milliers d'ingrédients.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from domain.matching import ComboSignature, RecipeMatcher, combo_signature, is_unlocked_by_books
+from domain.membership import MembershipIndex
+from domain.models import Ingredient, Recipe
+from domain.value_objects import Category
+
+DEFAULT_MAX_REACTANTS = 3
+
+
+@dataclass(frozen=True)
+class ComboCandidate:
+    ingredients: List[str]           # Liant, Catalyseur puis Réactifs
+    raw_difficulty: int              # avant bonus
+    total_difficulty: float          # après bonus (plancher à 0)
+    recipe: Optional[Recipe]         # recette reconnue par PotionBuilder, sinon None
+
+
+class ComboOptimizer:
+    def __init__(self, ingredients: Sequence[Ingredient], matcher: RecipeMatcher) -> None:
+        self.matcher = matcher
+        self._by_name: Dict[str, Ingredient] = {}
+        for ing in ingredients:
+            self._by_name.setdefault(ing.name, ing)  # 1re occurrence, comme le repo
+        self._membership = MembershipIndex(list(self._by_name.values()))
+
+        # listes triées par (difficulté, nom) : ordre de parcours de la séparation-évaluation
+        self._sorted: Dict[str, List[Ingredient]] = {c.value: [] for c in Category}
+        for ing in self._by_name.values():
+            if ing.cat in self._sorted:
+                self._sorted[ing.cat].append(ing)
+        for items in self._sorted.values():
+            items.sort(key=lambda ing: (ing.difficulty, ing.name.lower()))
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "ComboOptimizer":
+        return cls(snapshot.ingredients, snapshot.recipe_matcher)
+
+    # ---------------------------
+    # API
+    # ---------------------------
+
+    def best_for_recipe(
+        self,
+        recipe_name: str,
+        *,
+        owned_books: Optional[Iterable[str]] = None,
+        allowed_origins: Optional[Iterable[str]] = None,
+        k: int = 5,
+    ) -> List[ComboCandidate]:
+        """Alternatives réalisables de la recette, qui la déclenchent bien (pas masquées)."""
+        owned = None if owned_books is None else list(owned_books)
+        available = self._availability(owned, allowed_origins)
+        out: List[ComboCandidate] = []
+        for rec in self.matcher.recipes:
+            if rec.name != recipe_name:
+                continue
+            for cand in self._recipe_candidates([rec], owned, available):
+                if cand.recipe is rec:
+                    out.append(cand)
+        out.sort(key=_rank)
+        return _dedupe(out)[:max(k, 0)]
+
+    def best_combos(
+        self,
+        *,
+        owned_books: Optional[Iterable[str]] = None,
+        allowed_origins: Optional[Iterable[str]] = None,
+        k: int = 5,
+        max_reactants: int = DEFAULT_MAX_REACTANTS,
+    ) -> List[ComboCandidate]:
+        """k alternatives valides les moins difficiles (recette reconnue ou non)."""
+        if k <= 0:
+            return []
+        owned = None if owned_books is None else list(owned_books)
+        available = self._availability(owned, allowed_origins)
+
+        top = _TopK(k)
+        # 1) alternatives de recettes : total avec bonus
+        recognized: Set[ComboSignature] = set()
+        for cand in self._recipe_candidates(self.matcher.recipes, owned, available):
+            if cand.recipe is None:
+                continue
+            sig = combo_signature(cand.ingredients)
+            if sig not in recognized:
+                recognized.add(sig)
+                top.push(cand)
+
+        # 2) le reste : séparation-évaluation sur les listes triées
+        pool = {cat: [i for i in items if i.name in available] for cat, items in self._sorted.items()}
+        self._search(pool, max(max_reactants, 1), recognized, top)
+        return top.items()
+
+    # ---------------------------
+    # internals
+    # ---------------------------
+
+    def _availability(self, owned: Optional[List[str]], allowed_origins: Optional[Iterable[str]]) -> Set[str]:
+        """Noms des ingrédients utilisables (None = pas de contrainte)."""
+        index = self._membership
+        owned_mask = index.owned_mask(owned) if owned is not None else None
+        origin_mask = None
+        if allowed_origins is not None:
+            labels = {_label(o) for o in allowed_origins if o}
+            origin_mask = index.origins.mask_where(lambda o: _label(o) in labels)
+        out: Set[str] = set()
+        for pos, ing in enumerate(index.ingredients):
+            if owned_mask is not None and not index.is_unlocked(pos, owned_mask):
+                continue
+            if origin_mask is not None and not index.has_any_origin(pos, origin_mask):
+                continue
+            out.add(ing.name)
+        return out
+
+    def _recipe_candidates(self, recipes: Iterable[Recipe], owned, available: Set[str]) -> List[ComboCandidate]:
+        out: List[ComboCandidate] = []
+        for rec in recipes:
+            if owned is not None and not is_unlocked_by_books(rec.books, owned):
+                continue
+            for combo in rec.combos or []:
+                if not all(n in available for n in combo) or not self._is_valid(combo):
+                    continue
+                out.append(self._evaluate(_ordered(combo, self._by_name), owned))
+        return out
+
+    def _is_valid(self, combo: Sequence[str]) -> bool:
+        cats = [self._by_name[n].cat for n in combo]
+        return (cats.count(Category.REACTIF.value) >= 1
+                and cats.count(Category.LIANT.value) <= 1
+                and cats.count(Category.CATALYSEUR.value) <= 1)
+
+    def _evaluate(self, names: List[str], owned) -> ComboCandidate:
+        raw = sum(int(self._by_name[n].difficulty or 0) for n in names)
+        matched = self._match(names, owned)
+        total = max(0, raw - matched.bonus) if matched is not None and matched.bonus else raw
+        return ComboCandidate(ingredients=names, raw_difficulty=raw, total_difficulty=total, recipe=matched)
+
+    def _match(self, names: List[str], owned) -> Optional[Recipe]:
+        if owned is None:  # pas de contrainte de livres : toutes les recettes sont débloquées
+            found = self.matcher.candidates(names)
+            return found[0] if found else None
+        return self.matcher.match(names, owned)
+
+    def _search(self, pool, max_reactants: int, skip: Set[ComboSignature], top: "_TopK") -> None:
+        reac = pool[Category.REACTIF.value]
+        if not reac:
+            return
+        reac_diffs = [int(i.difficulty or 0) for i in reac]
+        prefix = [0]
+        for d in reac_diffs:
+            prefix.append(prefix[-1] + d)
+
+        def reac_bound(start: int, need: int, room: int) -> Optional[int]:
+            """Meilleure somme de j réactifs pris à partir de start, need <= j <= room."""
+            best = None
+            for j in range(need, room + 1):
+                if start + j > len(reac):
+                    break
+                s = prefix[start + j] - prefix[start]
+                best = s if best is None or s < best else best
+            return best
+
+        def options(cat: str) -> List[Tuple[int, Optional[Ingredient]]]:
+            # "aucun" (0) inséré à sa place dans l'ordre croissant
+            opts = [(int(i.difficulty or 0), i) for i in pool[cat]]
+            opts.insert(bisect.bisect_left([d for d, _ in opts], 0), (0, None))
+            return opts
+
+        liants = options(Category.LIANT.value)
+        catas = options(Category.CATALYSEUR.value)
+        best_reac = reac_bound(0, 1, max_reactants)
+        best_cata = catas[0][0]
+
+        def walk_reactants(base: int, picked: List[str], start: int, count: int):
+            for i in range(start, len(reac)):
+                rest = reac_bound(i + 1, 0, max_reactants - count - 1)
+                s = base + reac_diffs[i]
+                if top.full() and s + rest > top.bound():
+                    break  # liste triée : les suivants ne font pas mieux
+                names = picked + [reac[i].name]
+                if top.excludes(s + rest, names):
+                    continue  # même total au mieux, noms classés après le k-ième
+                if combo_signature(names) not in skip:  # toute alternative reconnue y est déjà
+                    top.push(ComboCandidate(ingredients=names, raw_difficulty=s, total_difficulty=s, recipe=None))
+                if count + 1 < max_reactants:
+                    walk_reactants(s, names, i + 1, count + 1)
+
+        for d_li, li in liants:
+            if top.full() and d_li + best_cata + best_reac > top.bound():
+                break
+            if top.excludes(d_li + best_cata + best_reac, [li.name] if li is not None else []):
+                continue
+            for d_ca, ca in catas:
+                if top.full() and d_li + d_ca + best_reac > top.bound():
+                    break
+                picked = [x.name for x in (li, ca) if x is not None]
+                if not top.excludes(d_li + d_ca + best_reac, picked):
+                    walk_reactants(d_li + d_ca, picked, 0, 0)
+
+
+class _TopK:
+    """k meilleurs candidats, triés par (total, noms) ; bound() = total du k-ième."""
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self._keys: List[tuple] = []
+        self._items: List[ComboCandidate] = []
+
+    def full(self) -> bool:
+        return len(self._items) >= self.k
+
+    def bound(self) -> float:
+        return self._keys[-1][0]
+
+    def excludes(self, total: float, prefix: Sequence[str]) -> bool:
+        """Plein, et aucun candidat de total >= total dont les noms commencent par prefix n'y entrerait."""
+        if not self.full():
+            return False
+        worst_total, worst_names = self._keys[-1]
+        return total > worst_total or (total == worst_total and [n.lower() for n in prefix] >= worst_names)
+
+    def push(self, cand: ComboCandidate) -> None:
+        key = _rank(cand)
+        if self.full() and key >= self._keys[-1]:
+            return
+        pos = bisect.bisect_left(self._keys, key)
+        self._keys.insert(pos, key)
+        self._items.insert(pos, cand)
+        if len(self._items) > self.k:
+            self._keys.pop()
+            self._items.pop()
+
+    def items(self) -> List[ComboCandidate]:
+        return list(self._items)
+
+
+def _rank(cand: ComboCandidate) -> tuple:
+    return (cand.total_difficulty, [n.lower() for n in cand.ingredients])
+
+
+def _dedupe(cands: List[ComboCandidate]) -> List[ComboCandidate]:
+    seen: Set[ComboSignature] = set()
+    out: List[ComboCandidate] = []
+    for c in cands:
+        sig = combo_signature(c.ingredients)
+        if sig not in seen:
+            seen.add(sig)
+            out.append(c)
+    return out
+
+
+def _ordered(names: Sequence[str], by_name: Dict[str, Ingredient]) -> List[str]:
+    """Liant, Catalyseur puis Réactifs (ordre d'origine conservé dans chaque groupe)."""
+    order = {Category.LIANT.value: 0, Category.CATALYSEUR.value: 1, Category.REACTIF.value: 2}
+    return sorted(names, key=lambda n: order.get(by_name[n].cat, 3))
+
+
+def _label(origin: str) -> str:
+    return str(origin).split("/")[-1]
@@ -0,0 +1,217 @@
+"""
+Index de l'arbre d'origines pour l'onglet Origines (pur, pas de Qt).
+
+- chemins "A/B/C" -> libellé, parent, enfants ordonnés, chaîne d'ancêtres précalculée ;
+- libellé -> chemins (+ libellé replié par fold) : un filtre teste chaque libellé
+  distinct une fois, résout directement les nœuds qui matchent, puis on ne révèle
+  qu'eux et leurs ancêtres ;
+- sync(arbre) compare au dernier état et renvoie un OriginTreeDiff (ajouts,
+  suppressions, sous-arbres renommés, frères réordonnés) pour ne toucher que les
+  items concernés. L'ordre suit le dict : data.js est réécrit clés triées, donc
+  l'ordre peut changer sans ajout ni suppression.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from application.search_index import fold
+
+ROOT = ""   # chemin de la racine (parent des nœuds de premier niveau)
+
+
+@dataclass(frozen=True)
+class OriginTreeDiff:
+    removed: List[str] = field(default_factory=list)               # anciens chemins disparus
+    added: List[str] = field(default_factory=list)                 # nouveaux chemins, ordre préfixe
+    moved: List[Tuple[str, str]] = field(default_factory=list)     # (ancien, nouveau) : renommages, sous-arbre compris
+    reordered: List[str] = field(default_factory=list)             # parents dont la liste d'enfants a changé
+
+    def __bool__(self) -> bool:
+        return bool(self.removed or self.added or self.moved or self.reordered)
+
+    def removed_roots(self) -> List[str]:
+        """Racines des sous-arbres supprimés (leurs descendants partent avec elles)."""
+        gone = set(self.removed)
+        return [p for p in self.removed if parent_path(p) not in gone]
+
+
+def parent_path(path: str) -> str:
+    return path.rsplit("/", 1)[0] if "/" in path else ROOT
+
+
+def flatten_origin_tree(tree: dict) -> List[Tuple[str, str, str]]:
+    """(chemin, chemin parent, libellé) en ordre préfixe, dans l'ordre du dict."""
+    out: List[Tuple[str, str, str]] = []
+
+    def walk(node: dict, prefix: str) -> None:
+        for label, children in (node or {}).items():
+            label = str(label)
+            path = f"{prefix}/{label}" if prefix else label
+            out.append((path, prefix, label))
+            if isinstance(children, dict) and children:
+                walk(children, path)
+
+    walk(tree or {}, ROOT)
+    return out
+
+
+class OriginTreeIndex:
+    def __init__(self) -> None:
+        self.labels: Dict[str, str] = {}                 # chemin -> libellé
+        self.parents: Dict[str, str] = {}                # chemin -> chemin parent
+        self.children: Dict[str, List[str]] = {ROOT: []}
+        self._chains: Dict[str, Tuple[str, ...]] = {}    # chemin -> ancêtres (racine d'abord)
+        self._by_label: Dict[str, Set[str]] = {}         # libellé -> chemins
+        self._folded: Dict[str, str] = {}                # libellé -> fold(libellé)
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.parents
+
+    # --- maintenance ---
+
+    def sync(self, tree: dict) -> OriginTreeDiff:
+        """Aligne l'index sur `tree` ; renvoie ce qui a changé depuis le dernier sync."""
+        rows = flatten_origin_tree(tree)
+        new_parents = {path: parent for path, parent, _ in rows}
+        new_children: Dict[str, List[str]] = {ROOT: []}
+        for path, parent, _ in rows:
+            new_children.setdefault(parent, []).append(path)
+
+        removed = [p for p in self.parents if p not in new_parents]
+        added = [path for path, _, _ in rows if path not in self.parents]
+        moved = self._match_renames(removed, added, new_parents, new_children)
+        if moved:
+            old_moved = {o for o, _ in moved}
+            new_moved = {n for _, n in moved}
+            removed = [p for p in removed if p not in old_moved]
+            added = [p for p in added if p not in new_moved]
+
+        reordered = self._changed_parents(removed, moved, new_children)
+
+        # libellés + chaînes : seuls les chemins qui changent sont touchés
+        for old in removed + [o for o, _ in moved]:
+            self._unlabel(old)
+            self._chains.pop(old, None)
+        fresh = set(added) | {n for _, n in moved}
+        if fresh:
+            for path, parent, label in rows:
+                if path in fresh:
+                    self.labels[path] = label
+                    if label not in self._by_label:
+                        self._by_label[label] = set()
+                        self._folded[label] = fold(label)
+                    self._by_label[label].add(path)
+                    self._chains[path] = (self._chains[parent] + (parent,)) if parent else ()
+        self.parents = new_parents
+        self.children = new_children
+        return OriginTreeDiff(removed=removed, added=added, moved=moved, reordered=reordered)
+
+    def _unlabel(self, path: str) -> None:
+        label = self.labels.pop(path, None)
+        paths = self._by_label.get(label)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del self._by_label[label]
+                del self._folded[label]
+
+    def _changed_parents(self, removed: List[str], moved: List[Tuple[str, str]],
+                         new_children: Dict[str, List[str]]) -> List[str]:
+        """Parents déjà connus dont les enfants (après renommages) diffèrent ; nouveaux parents exclus."""
+        gone = set(removed)
+        renames = dict(moved)
+        back = {new: old for old, new in moved}
+        out: List[str] = []
+        for parent, kids in new_children.items():
+            old = self.children.get(back.get(parent, parent))
+            if old is None:
+                continue
+            if [renames.get(p, p) for p in old if p not in gone] != kids:
+                out.append(parent)
+        return out
+
+    def _match_renames(self, removed: List[str], added: List[str],
+                       new_parents: Dict[str, str], new_children: Dict[str, List[str]]) -> List[Tuple[str, str]]:
+        """Sous-arbre disparu + sous-arbre apparu sous le même parent, de même forme = renommage."""
+        if not removed or not added:
+            return []
+        gone, new = set(removed), set(added)
+        by_parent: Dict[str, List[str]] = {}
+        for r in removed:
+            if parent_path(r) not in gone:
+                by_parent.setdefault(self.parents[r], []).append(r)
+
+        pairs: List[Tuple[str, str]] = []
+        for a in added:
+            parent = new_parents[a]
+            if parent in new or not by_parent.get(parent):
+                continue
+            shape = [p[len(a):] for p in _descendants(new_children, a)]
+            for r in by_parent[parent]:
+                old_sub = _descendants(self.children, r)
+                if [p[len(r):] for p in old_sub] == shape:
+                    by_parent[parent].remove(r)
+                    pairs.append((r, a))
+                    pairs.extend((r + s, a + s) for s in shape)
+                    break
+        return pairs
+
+    # --- requêtes ---
+
+    def ancestors(self, path: str) -> Tuple[str, ...]:
+        return self._chains.get(path, ())
+
+    def paths_for_label(self, label: str) -> List[str]:
+        return sorted(self._by_label.get(label, ()))
+
+    def all_labels(self) -> List[str]:
+        return sorted(self._by_label)
+
+    def visible_paths(self, query: str) -> Optional[Set[str]]:
+        """Nœuds dont le libellé contient la requête, plus leurs ancêtres (None : tout)."""
+        q = fold((query or "").strip())
+        if not q:
+            return None
+        out: Set[str] = set()
+        for label, folded in self._folded.items():
+            if q not in folded:
+                continue
+            for path in self._by_label[label]:
+                out.add(path)
+                out.update(self._chains[path])
+        return out
+
+    def hidden_frontier(self, visible: Optional[Set[str]]) -> Set[str]:
+        """
+        Nœuds à masquer : non visibles dont le parent est visible (ou la racine).
+        Masquer un item cache son sous-arbre : inutile de descendre plus bas.
+        """
+        if visible is None:
+            return set()
+        out: Set[str] = set()
+        for parent in _with_root(visible):
+            for child in self.children.get(parent, ()):
+                if child not in visible:
+                    out.add(child)
+        return out
+
+
+def _with_root(paths: Iterable[str]) -> Iterable[str]:
+    yield ROOT
+    yield from paths
+
+
+def _descendants(children: Dict[str, List[str]], root: str) -> List[str]:
+    """Descendants de root en ordre préfixe (root exclu)."""
+    out: List[str] = []
+    stack = list(reversed(children.get(root, ())))
+    while stack:
+        path = stack.pop()
+        out.append(path)
+        stack.extend(reversed(children.get(path, ())))
+    return out
@@ -0,0 +1,117 @@
+"""
+Exécution parallèle par morceaux (chunks) pour les gros datasets.
+
+- Découpe déterministe en plages contiguës [début, fin).
+- Threads sur les builds free-threaded (GIL désactivé), processus sinon.
+- Le contexte partagé (snapshot, règles…) est transmis une seule fois par worker,
+  via l'initializer (forkserver / spawn). fork (hérité sans pickling) seulement si
+  l'appelant l'autorise explicitement (allow_fork : scripts CLI, benchmarks) :
+  threading.active_count() ne voit pas les threads natifs (QThreadPool, rendu Qt),
+  et forker un processus multi-thread peut bloquer l'enfant.
+- Les résultats reviennent dans l'ordre des chunks : la fusion reste déterministe.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+Range = Tuple[int, int]
+
+# Contexte du worker courant (posé par l'initializer ou hérité par fork)
+_context: Any = None
+
+_fork_allowed = False
+
+
+def free_threaded() -> bool:
+    """True si l'interpréteur tourne sans GIL (PEP 703)."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return bool(is_gil_enabled is not None and not is_gil_enabled())
+
+
+def default_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def partition(total: int, chunks: int) -> List[Range]:
+    """Découpe [0, total) en `chunks` plages contiguës de tailles quasi égales."""
+    chunks = max(1, min(int(chunks), total)) if total > 0 else 1
+    size, extra = divmod(total, chunks)
+    out: List[Range] = []
+    start = 0
+    for i in range(chunks):
+        end = start + size + (1 if i < extra else 0)
+        out.append((start, end))
+        start = end
+    return out
+
+
+def allow_fork(enabled: bool = True) -> None:
+    """
+    Autorise le démarrage par fork pour tout le processus. À n'appeler que depuis un
+    point d'entrée CLI / benchmark sans threads natifs — jamais depuis la GUI.
+    """
+    global _fork_allowed
+    _fork_allowed = bool(enabled)
+
+
+def worker_context() -> Any:
+    """Contexte partagé, lisible depuis une fonction de chunk."""
+    return _context
+
+
+def run_chunks(
+    fn: Callable[[Any], T],
+    jobs: Sequence[Any],
+    *,
+    context: Any,
+    workers: int,
+) -> List[T]:
+    """
+    Exécute fn(job) pour chaque job et retourne les résultats dans l'ordre des jobs.
+    `fn` doit être une fonction de module (picklable) qui lit worker_context().
+    """
+    global _context
+    workers = max(1, min(int(workers), len(jobs) or 1))
+    try:
+        with _make_executor(workers, context) as ex:
+            return list(ex.map(fn, jobs))
+    finally:
+        _context = None  # ne pas retenir le snapshot dans le processus principal
+
+
+# --- internals ---
+
+def _init_worker(context: Any) -> None:
+    global _context
+    _context = context
+
+
+def _make_executor(workers: int, context: Any) -> Executor:
+    if free_threaded():
+        _init_worker(context)
+        return ThreadPoolExecutor(max_workers=workers)
+
+    # importés ici : coûteux, et inutiles au démarrage de l'application
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    methods = multiprocessing.get_all_start_methods()
+    # opt-in explicite ; le test des threads Python n'est qu'un garde-fou de plus
+    if _fork_allowed and "fork" in methods and threading.active_count() == 1:
+        _init_worker(context)  # hérité par les enfants, sans pickling
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+
+    method = "forkserver" if "forkserver" in methods else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(method),
+        initializer=_init_worker,
+        initargs=(context,),
+    )
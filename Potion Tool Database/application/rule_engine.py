@@ -0,0 +1,316 @@
+"""
+RuleEngine : contrôles du dataset en une seule passe.
+
+Chaque contrôle est une règle *visiteur* (livres, origines, ingrédients, recettes).
+Le moteur parcourt un DatasetSnapshot une seule fois, distribue chaque entité
+aux règles enregistrées, puis regroupe leurs constats par catégorie avec le
+temps passé dans chaque règle. Ajouter un contrôle = enregistrer une règle,
+pas ajouter une passe.
+
+Les règles *partitionnables* (constats indépendants d'une entité à l'autre)
+peuvent être exécutées par morceaux sur plusieurs cœurs (workers > 1).
+
+progress(fait, total), optionnel, est appelé par tranches de PROGRESS_STEP entités
+et après chaque finish() de la passe locale ; une exception levée par ce rappel
+interrompt la passe (annulation).
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from domain.models import Ingredient, Recipe
+from application.snapshot import DatasetSnapshot
+from application import parallel
+
+# En dessous de ce volume (ingrédients + recettes), le coût des processus l'emporte.
+PARALLEL_MIN_ITEMS = 20_000
+
+# Entités visitées entre deux appels de progress (le test n'est pas fait par entité).
+PROGRESS_STEP = 2_000
+
+Progress = Callable[[int, int], None]
+
+
+# ---------------------------
+# Règle (visiteur)
+# ---------------------------
+
+class Rule:
+    """
+    Règle de base. Surcharger uniquement les visit_* utiles :
+    le moteur ne distribue une entité qu'aux règles qui la visitent.
+    """
+    name: str = ""        # identifiant unique dans le rapport
+    category: str = ""    # 'books' | 'origins' | 'ingredients' | 'recipes' | ...
+    title: str = ""       # libellé lisible (UI)
+    # True si les constats ne dépendent que des entités visitées :
+    # la règle peut alors tourner par morceaux puis être fusionnée (merge).
+    partitionable: bool = False
+
+    def begin(self, snapshot: DatasetSnapshot) -> None:
+        """Appelé avant la passe (réinitialiser l'état ici)."""
+
+    def visit_book(self, title: str) -> None:
+        pass
+
+    def visit_origin(self, path: str) -> None:
+        pass
+
+    def visit_ingredient(self, ing: Ingredient) -> None:
+        pass
+
+    def visit_recipe(self, rec: Recipe) -> None:
+        pass
+
+    def finish(self) -> List[str]:
+        """Constats de la règle (liste de libellés, ordre stable)."""
+        return []
+
+    def spawn(self) -> "Rule":
+        """
+        Copie sans état de passe, envoyée aux workers.
+        Convention : attributs publics = configuration, attributs `_` = état de passe.
+        """
+        clone = object.__new__(type(self))
+        clone.__dict__.update({k: v for k, v in vars(self).items() if not k.startswith("_")})
+        return clone
+
+    def merge(self, parts: List[List[str]]) -> List[str]:
+        """Fusionne les constats des morceaux (reçus dans l'ordre des morceaux)."""
+        return sorted({f for part in parts for f in part})
+
+
+# ---------------------------
+# Rapport
+# ---------------------------
+
+@dataclass(frozen=True)
+class RuleResult:
+    name: str
+    category: str
+    title: str
+    findings: List[str]
+    elapsed: float        # secondes passées dans la règle (visites + finish, cumul des morceaux)
+
+
+@dataclass(frozen=True)
+class RuleReport:
+    results: Dict[str, RuleResult]    # ordre d'enregistrement
+    counts: Dict[str, int]            # books / origins / ingredients / recipes
+    elapsed: float                    # durée totale de la passe
+
+    def findings(self, name: str) -> List[str]:
+        res = self.results.get(name)
+        return list(res.findings) if res else []
+
+    def by_category(self) -> Dict[str, List[RuleResult]]:
+        out: Dict[str, List[RuleResult]] = {}
+        for res in self.results.values():
+            out.setdefault(res.category, []).append(res)
+        return out
+
+    def timings(self) -> Dict[str, float]:
+        return {name: res.elapsed for name, res in self.results.items()}
+
+
+# ---------------------------
+# Moteur
+# ---------------------------
+
+class RuleEngine:
+    def __init__(self, rules: Optional[Iterable[Rule]] = None) -> None:
+        self._rules: List[Rule] = []
+        for r in rules or []:
+            self.register(r)
+
+    def register(self, rule: Rule) -> Rule:
+        if not rule.name:
+            raise ValueError("Une règle doit avoir un nom.")
+        if any(r.name == rule.name for r in self._rules):
+            raise ValueError(f"Règle déjà enregistrée: {rule.name!r}")
+        self._rules.append(rule)
+        return rule
+
+    @property
+    def rules(self) -> List[Rule]:
+        return list(self._rules)
+
+    def run(self, snapshot: DatasetSnapshot, *, workers: int = 1,
+            progress: Optional[Progress] = None) -> RuleReport:
+        t_start = time.perf_counter()
+        elapsed: Dict[str, float] = {r.name: 0.0 for r in self._rules}
+        findings: Dict[str, List[str]] = {}
+
+        remote: List[Rule] = []
+        if workers > 1 and len(snapshot.ingredients) + len(snapshot.recipes) >= PARALLEL_MIN_ITEMS:
+            remote = [r for r in self._rules if r.partitionable]
+        local = [r for r in self._rules if r not in remote]
+
+        if remote:
+            findings.update(self._run_partitioned(remote, snapshot, workers, elapsed))
+
+        tracker = _Tracker(progress, extra=len(local)) if progress is not None else None
+        _run_pass(
+            local, snapshot, elapsed,
+            books=snapshot.books,
+            origins=snapshot.origin_nodes,
+            ingredients=snapshot.ingredients,
+            recipes=snapshot.recipes,
+            tracker=tracker,
+        )
+        for r in local:
+            t0 = time.perf_counter()
+            findings[r.name] = list(r.finish() or [])
+            elapsed[r.name] += time.perf_counter() - t0
+            if tracker is not None:
+                tracker.advance(1)
+
+        results: Dict[str, RuleResult] = {}
+        for r in self._rules:
+            results[r.name] = RuleResult(
+                name=r.name,
+                category=r.category,
+                title=r.title or r.name,
+                findings=findings[r.name],
+                elapsed=elapsed[r.name],
+            )
+
+        return RuleReport(
+            results=results,
+            counts={
+                "books": len(snapshot.books),
+                "origins": len(snapshot.origin_nodes),
+                "ingredients": len(snapshot.ingredients),
+                "recipes": len(snapshot.recipes),
+            },
+            elapsed=time.perf_counter() - t_start,
+        )
+
+    def _run_partitioned(
+        self,
+        rules: List[Rule],
+        snapshot: DatasetSnapshot,
+        workers: int,
+        elapsed: Dict[str, float],
+    ) -> Dict[str, List[str]]:
+        """Découpe ingrédients et recettes en morceaux, puis fusionne dans l'ordre."""
+        n_chunks = workers * 4  # petits morceaux = meilleur équilibrage
+        ing_ranges = parallel.partition(len(snapshot.ingredients), n_chunks)
+        rec_ranges = parallel.partition(len(snapshot.recipes), n_chunks)
+        n = max(len(ing_ranges), len(rec_ranges))
+        jobs = [
+            (
+                ing_ranges[i] if i < len(ing_ranges) else (0, 0),
+                rec_ranges[i] if i < len(rec_ranges) else (0, 0),
+                i == 0,  # livres + origines : visités une seule fois
+            )
+            for i in range(n)
+        ]
+        protos = [r.spawn() for r in rules]
+        chunks = parallel.run_chunks(_run_chunk, jobs, context=(snapshot, protos), workers=workers)
+
+        out: Dict[str, List[str]] = {}
+        for r in rules:
+            parts = [chunk[r.name][0] for chunk in chunks]
+            elapsed[r.name] += sum(chunk[r.name][1] for chunk in chunks)
+            t0 = time.perf_counter()
+            out[r.name] = list(r.merge(parts))
+            elapsed[r.name] += time.perf_counter() - t0
+        return out
+
+
+# --- internals ---
+
+def _run_pass(
+    rules: Sequence[Rule],
+    snapshot: DatasetSnapshot,
+    elapsed: Dict[str, float],
+    *,
+    books: Sequence[str],
+    origins: Sequence[str],
+    ingredients: Sequence[Ingredient],
+    recipes: Sequence[Recipe],
+    tracker: Optional["_Tracker"] = None,
+) -> None:
+    """begin + une seule passe par type d'entité, seulement vers les règles concernées."""
+    for r in rules:
+        t0 = time.perf_counter()
+        r.begin(snapshot)
+        elapsed[r.name] += time.perf_counter() - t0
+
+    sources = (
+        ("visit_book", books),
+        ("visit_origin", origins),
+        ("visit_ingredient", ingredients),
+        ("visit_recipe", recipes),
+    )
+    passes = []
+    for method, items in sources:
+        visitors = [(r.name, getattr(r, method)) for r in rules if _overrides(r, method)]
+        if visitors:
+            passes.append((visitors, items))
+    if tracker is not None:
+        tracker.start(sum(len(items) for _, items in passes))
+
+    for visitors, items in passes:
+        if tracker is None:
+            _visit(visitors, items, elapsed)
+            continue
+        for start in range(0, len(items), PROGRESS_STEP):
+            chunk = items[start:start + PROGRESS_STEP]
+            _visit(visitors, chunk, elapsed)
+            tracker.advance(len(chunk))
+
+
+def _visit(visitors, items: Sequence, elapsed: Dict[str, float]) -> None:
+    for item in items:
+        for name, visit in visitors:
+            t0 = time.perf_counter()
+            visit(item)
+            elapsed[name] += time.perf_counter() - t0
+
+
+def _run_chunk(job: Tuple[Tuple[int, int], Tuple[int, int], bool]) -> Dict[str, Tuple[List[str], float]]:
+    """Exécuté dans un worker : règles fraîches sur une tranche du snapshot partagé."""
+    (i0, i1), (r0, r1), first = job
+    snapshot, protos = parallel.worker_context()
+    rules = [p.spawn() for p in protos]
+    elapsed = {r.name: 0.0 for r in rules}
+    _run_pass(
+        rules, snapshot, elapsed,
+        books=snapshot.books if first else (),
+        origins=snapshot.origin_nodes if first else (),
+        ingredients=snapshot.ingredients[i0:i1],
+        recipes=snapshot.recipes[r0:r1],
+    )
+    out: Dict[str, Tuple[List[str], float]] = {}
+    for r in rules:
+        t0 = time.perf_counter()
+        found = list(r.finish() or [])
+        out[r.name] = (found, elapsed[r.name] + time.perf_counter() - t0)
+    return out
+
+
+class _Tracker:
+    """Compte les unités de travail (entités visitées + finish) et les publie via progress."""
+
+    def __init__(self, progress: Progress, extra: int) -> None:
+        self.progress = progress
+        self.extra = extra
+        self.done = 0
+        self.total = extra
+
+    def start(self, items: int) -> None:
+        self.total = items + self.extra
+        self.progress(self.done, self.total)
+
+    def advance(self, n: int) -> None:
+        self.done += n
+        self.progress(self.done, self.total)
+
+
+def _overrides(rule: Rule, method: str) -> bool:
+    return getattr(type(rule), method, None) is not getattr(Rule, method)
@@ -0,0 +1,86 @@
+"""
+SearchService : recherche tolérante (accents, casse, fautes de frappe) sur les
+ingrédients, recettes, livres et libellés d'origine.
+
+Un FuzzyIndex par type d'entité, reconstruit seulement quand la version du
+repository concerné change.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from application.search_index import FUZZY_MIN_SCORE, FuzzyIndex
+from application.snapshot import repo_version
+
+KINDS = ("ingredients", "recipes", "books", "origins")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    kind: str          # ingredients | recipes | books | origins
+    label: str
+    score: float       # 1.0 = sous-chaîne exacte (après normalisation)
+
+    @property
+    def exact(self) -> bool:
+        return self.score >= 1.0
+
+
+class SearchService:
+    def __init__(self, ingredients_repo, recipes_repo, data_repo) -> None:
+        self._sources: Dict[str, Tuple[object, Callable[[], List[str]]]] = {
+            "ingredients": (ingredients_repo, lambda: _unique(i.name for i in ingredients_repo.list_all())),
+            "recipes": (recipes_repo, lambda: _unique(r.name for r in recipes_repo.list_all())),
+            "books": (data_repo, lambda: _unique(data_repo.get_books())),
+            "origins": (data_repo, lambda: _unique(_origin_labels(data_repo.get_origin_tree()))),
+        }
+        self._indexes: Dict[str, Tuple[Optional[tuple], FuzzyIndex]] = {}
+
+    def search(
+        self,
+        query: str,
+        *,
+        kinds: Optional[Sequence[str]] = None,
+        limit: int = 20,
+        min_score: float = FUZZY_MIN_SCORE,
+    ) -> List[SearchHit]:
+        """Meilleures correspondances, tous types confondus (exactes d'abord)."""
+        hits: List[SearchHit] = []
+        for kind in (kinds or KINDS):
+            index = self.index(kind)
+            hits.extend(
+                SearchHit(kind=kind, label=index.labels[i], score=score)
+                for i, score in index.search(query, limit=limit, min_score=min_score)
+            )
+        hits.sort(key=lambda h: -h.score)   # tri stable : l'ordre de chaque index est conservé
+        return hits[:limit]
+
+    def index(self, kind: str) -> FuzzyIndex:
+        if kind not in self._sources:
+            raise ValueError(f"Type inconnu : {kind!r} (attendu : {', '.join(KINDS)})")
+        repo, labels = self._sources[kind]
+        version = repo_version(repo)
+        cached = self._indexes.get(kind)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1]
+        index = FuzzyIndex(labels())
+        self._indexes[kind] = (version, index)
+        return index
+
+
+# --- internals ---
+
+def _unique(labels) -> List[str]:
+    return list(dict.fromkeys(l for l in labels if l))
+
+
+def _origin_labels(node: dict) -> List[str]:
+    """Tous les libellés de l'arbre (parents + feuilles)."""
+    out: List[str] = []
+    for label, children in (node or {}).items():
+        out.append(str(label))
+        if isinstance(children, dict) and children:
+            out.extend(_origin_labels(children))
+    return out
@@ -0,0 +1,240 @@
+"""
+Index de recherche à la frappe, insensibles aux accents et à la casse (fold).
+
+TextIndex : index inversé plein texte pour la recherche à la frappe.
+
+- documents = tuples de champs ordonnés par importance (nom d'abord) ;
+- postings de trigrammes : une requête (>= 3 caractères) intersecte les listes de
+  ses trigrammes, puis chaque candidat est vérifié par sous-chaîne (mêmes résultats
+  que le scan linéaire) ;
+- postings de tokens : les mots entiers priment sur les fragments dans le classement.
+
+Les documents sont adressés par contenu : sync() ne (ré)indexe que les contenus
+nouveaux et retire ceux qui ont disparu, ce qui suit le repository à moindre coût.
+
+FuzzyIndex : libellés courts (noms, titres, origines) ; sous-chaîne exacte d'abord,
+puis correspondances approchées par trigrammes (tolérance aux fautes de frappe).
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+GRAM = 3
+_TOKEN_RE = re.compile(r"\w+")
+
+FUZZY_MIN_SCORE = 0.5    # part des trigrammes de la requête retrouvés dans le libellé
+
+Rank = Tuple[int, int]   # (champ le plus important qui contient la requête, 0 si mots entiers)
+
+
+def fold(text: str) -> str:
+    """« Forêt Céleste » -> « foret celeste » : NFKD sans diacritiques, casefold."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class TextIndex:
+    def __init__(self) -> None:
+        self._ids: Dict[Tuple[str, ...], int] = {}      # contenu brut -> id
+        self._fields: Dict[int, Tuple[str, ...]] = {}   # id -> champs normalisés
+        self._hay: Dict[int, str] = {}                  # id -> champs joints (sémantique du scan)
+        self._grams: Dict[str, Set[int]] = {}
+        self._tokens: Dict[str, Set[int]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    # --- maintenance ---
+
+    def sync(self, docs: Iterable[Sequence[str]]) -> List[int]:
+        """Aligne l'index sur `docs` ; renvoie l'id de chaque document (même ordre)."""
+        out: List[int] = []
+        alive: Set[int] = set()
+        for fields in docs:
+            key = tuple(fields)
+            doc = self._ids.get(key)
+            if doc is None:
+                doc = self._add(key)
+            alive.add(doc)
+            out.append(doc)
+        for key, doc in list(self._ids.items()):
+            if doc not in alive:
+                self._remove(key, doc)
+        return out
+
+    def _add(self, key: Tuple[str, ...]) -> int:
+        doc = self._next_id
+        self._next_id += 1
+        fields = tuple(self.normalize(f) for f in key)
+        hay = " ".join(fields)
+        self._ids[key] = doc
+        self._fields[doc] = fields
+        self._hay[doc] = hay
+        for g in _grams(hay):
+            self._grams.setdefault(g, set()).add(doc)
+        for t in set(_TOKEN_RE.findall(hay)):
+            self._tokens.setdefault(t, set()).add(doc)
+        return doc
+
+    def _remove(self, key: Tuple[str, ...], doc: int) -> None:
+        hay = self._hay.pop(doc)
+        del self._ids[key]
+        del self._fields[doc]
+        for g in _grams(hay):
+            _discard(self._grams, g, doc)
+        for t in set(_TOKEN_RE.findall(hay)):
+            _discard(self._tokens, t, doc)
+
+    # --- requêtes ---
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return fold(text)
+
+    def search(self, query: str, *, within: Optional[Set[int]] = None) -> Dict[int, Rank]:
+        """Documents contenant `query` (sous-chaîne), avec leur rang."""
+        q = self.normalize(query).strip()
+        if not q:
+            return {}
+        candidates = self._candidates(q)
+        if within is not None:
+            candidates = candidates & within if candidates is not None else set(within)
+        if candidates is None:
+            candidates = set(self._hay)
+
+        whole = self._whole_word_docs(q)
+        hay = self._hay
+        out: Dict[int, Rank] = {}
+        for doc in candidates:
+            if q not in hay[doc]:
+                continue
+            fields = self._fields[doc]
+            field = next((i for i, f in enumerate(fields) if q in f), len(fields))
+            out[doc] = (field, 0 if doc in whole else 1)
+        return out
+
+    def _candidates(self, q: str) -> Optional[Set[int]]:
+        """Intersection des postings de trigrammes ; None si la requête est trop courte."""
+        grams = _grams(q)
+        if not grams:
+            return None
+        postings = sorted((self._grams.get(g, set()) for g in grams), key=len)
+        out = set(postings[0])
+        for p in postings[1:]:
+            if not out:
+                break
+            out &= p
+        return out
+
+    def _whole_word_docs(self, q: str) -> Set[int]:
+        """Documents contenant tous les mots de la requête en tant que mots entiers."""
+        tokens = _TOKEN_RE.findall(q)
+        if not tokens:
+            return set()
+        postings = sorted((self._tokens.get(t, set()) for t in tokens), key=len)
+        out = set(postings[0])
+        for p in postings[1:]:
+            out &= p
+        return out
+
+
+class FuzzyIndex:
+    """
+    Libellés courts indexés par trigrammes (avec bords de mots).
+    search() renvoie (id, score) : 1.0 pour une sous-chaîne exacte, sinon la part des
+    trigrammes de la requête présents dans le libellé (>= min_score).
+    """
+
+    def __init__(self, labels: Iterable[str] = ()) -> None:
+        self.labels: List[str] = []
+        self._folded: List[str] = []
+        self._grams: List[Set[str]] = []
+        self._postings: Dict[str, List[int]] = {}
+        for label in labels:
+            self.add(label)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def add(self, label: str) -> int:
+        i = len(self.labels)
+        folded = fold(label)
+        grams = _grams(f" {folded} ")
+        self.labels.append(label)
+        self._folded.append(folded)
+        self._grams.append(grams)
+        for g in grams:
+            self._postings.setdefault(g, []).append(i)
+        return i
+
+    def search(self, query: str, *, limit: int = 20, min_score: float = FUZZY_MIN_SCORE) -> List[Tuple[int, float]]:
+        q = fold(query).strip()
+        if not q or limit <= 0:
+            return []
+        exact = self._exact(q)
+        ranked = heapq.nsmallest(limit, exact, key=lambda i: self._exact_rank(q, i))
+        out = [(i, 1.0) for i in ranked]
+        if len(out) < limit:
+            out.extend(self._fuzzy(q, min_score, limit - len(out), exclude=set(exact)))
+        return out
+
+    # --- internals ---
+
+    def _exact(self, q: str) -> List[int]:
+        grams = _grams(q)
+        if not grams:
+            # requête trop courte : début de mot via le trigramme de bord, sinon scan
+            if len(q) == 2:
+                return [i for i in self._postings.get(f" {q}", []) if q in self._folded[i]]
+            return [i for i, f in enumerate(self._folded) if q in f]
+        postings = sorted((self._postings.get(g, []) for g in grams), key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(p)
+        return [i for i in candidates if q in self._folded[i]]
+
+    def _exact_rank(self, q: str, i: int) -> tuple:
+        f = self._folded[i]
+        pos = f.find(q)
+        where = 0 if pos == 0 else (1 if f[pos - 1] == " " else 2)   # début, début de mot, milieu
+        return (where, len(f), f)
+
+    def _fuzzy(self, q: str, min_score: float, k: int, *, exclude: Set[int]) -> List[Tuple[int, float]]:
+        """k meilleurs libellés approchés : trigrammes partagés comptés en C (Counter.update)."""
+        grams = _grams(f" {q} ")
+        if not grams:
+            return []
+        n = len(grams)
+        need = max(1, math.ceil(min_score * n))
+        counts: Counter = Counter()
+        for g in grams:
+            posting = self._postings.get(g)
+            if posting:
+                counts.update(posting)
+        hits = [(i, c) for i, c in counts.items() if c >= need and i not in exclude]
+        folded = self._folded
+        best = heapq.nsmallest(k, hits, key=lambda h: (-h[1], abs(len(folded[h[0]]) - len(q)), folded[h[0]]))
+        return [(i, c / n) for i, c in best]
+
+
+# --- internals ---
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _discard(postings: Dict[str, Set[int]], key: str, doc: int) -> None:
+    bucket = postings.get(key)
+    if bucket is not None:
+        bucket.discard(doc)
+        if not bucket:
+            del postings[key]
@@ -0,0 +1,94 @@
+"""
+DatasetSnapshot : vue figée du dataset complet (ingrédients, recettes, livres, origines).
+Lue une seule fois depuis les repositories puis partagée par les services
+d'analyse, sans relire les fichiers à chaque contrôle.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from domain.errors import NotFoundError
+from domain.matching import RecipeMatcher
+from domain.models import Ingredient, Recipe
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    ingredients: Tuple[Ingredient, ...]
+    recipes: Tuple[Recipe, ...]
+    books: Tuple[str, ...]
+    origin_tree: dict
+
+    # --- index dérivés (calculés à la demande, une seule fois) ---
+
+    @cached_property
+    def ingredients_by_name(self) -> Dict[str, Ingredient]:
+        out: Dict[str, Ingredient] = {}
+        for ing in self.ingredients:
+            out.setdefault(ing.name, ing)  # même sémantique que repo.get_by_name (1re occurrence)
+        return out
+
+    @cached_property
+    def origin_nodes(self) -> Tuple[str, ...]:
+        """Chemins complets de tous les nœuds (parents + feuilles)."""
+        return tuple(_list_all_nodes(self.origin_tree))
+
+    @cached_property
+    def origin_labels(self) -> FrozenSet[str]:
+        return frozenset(n.split("/")[-1] for n in self.origin_nodes)
+
+    @cached_property
+    def recipe_matcher(self) -> RecipeMatcher:
+        """Index signature -> recette (cf. domain.matching)."""
+        difficulties = {name: ing.difficulty for name, ing in self.ingredients_by_name.items()}
+        return RecipeMatcher(self.recipes, difficulties)
+
+    # --- Protocole IngredientLookup (domain.rules) ---
+
+    def get_by_name(self, name: str) -> Ingredient:
+        ing = self.ingredients_by_name.get(name)
+        if ing is None:
+            raise NotFoundError(f"Ingrédient introuvable: {name!r}")
+        return ing
+
+    def list_all(self) -> List[Ingredient]:
+        return list(self.ingredients)
+
+    # --- Lecture façon data_repo (ValidationService hors-ligne, workers) ---
+
+    def get_books(self) -> List[str]:
+        return list(self.books)
+
+    def get_origin_tree(self) -> dict:
+        return self.origin_tree
+
+
+def take_snapshot(ingredients_repo, recipes_repo, data_repo) -> DatasetSnapshot:
+    """Lit chaque source une seule fois."""
+    return DatasetSnapshot(
+        ingredients=tuple(ingredients_repo.list_all()),
+        recipes=tuple(recipes_repo.list_all()),
+        books=tuple(data_repo.get_books() or []),
+        origin_tree=data_repo.get_origin_tree() or {},
+    )
+
+
+def repo_version(repo) -> Optional[tuple]:
+    """Version du repo (repo.version()) ; None s'il n'en expose pas : pas de cache possible."""
+    version = getattr(repo, "version", None)
+    return version() if callable(version) else None
+
+
+# --- Utils ---
+
+def _list_all_nodes(node: dict, prefix: str = "") -> List[str]:
+    out: List[str] = []
+    for label, children in (node or {}).items():
+        key = f"{prefix}/{label}" if prefix else label
+        out.append(key)
+        if isinstance(children, dict) and children:
+            out.extend(_list_all_nodes(children, key))
+    return out
@@ -1,19 +1,38 @@
 """
 SuggestionsService : utilitaires non-critiques pour assister la saisie
 (auto-complétion d'alternatives, tri par difficulté, presets).
+Les alternatives optimales (recettes, bonus, livres/origines) passent par ComboOptimizer.
+
+Index par catégorie pré-triés par (difficulté, nom), reconstruits uniquement quand la
+version du dataset change (repo.version()) : les requêtes parcourent ces listes et
+s'arrêtent dès que k candidats compatibles sont trouvés.
 """
 
 from __future__ import annotations
 
-from typing import Iterable, List, Optional, Sequence, Tuple
+import heapq
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from domain.matching import RecipeMatcher
+from domain.membership import MembershipIndex
 from domain.models import Ingredient
 from domain.value_objects import Category
+from application.optimizer import DEFAULT_MAX_REACTANTS, ComboCandidate, ComboOptimizer
+from application.snapshot import repo_version
 
 
 class SuggestionsService:
-    def __init__(self, ingredients_repo) -> None:
+    def __init__(self, ingredients_repo, recipes_repo=None) -> None:
         self.ingredients_repo = ingredients_repo
+        self.recipes_repo = recipes_repo
+        self._index_version: Optional[tuple] = None
+        self._ascending: Dict[str, List[int]] = {}     # positions dans self._all
+        self._descending: Dict[str, List[int]] = {}
+        self._all: List[Ingredient] = []
+        self._membership = MembershipIndex([])
+        self._optimizer_version: Optional[tuple] = None
+        self._optimizer_cache: Optional[ComboOptimizer] = None
 
     # ---------------------------
     # Sélections par catégorie
@@ -21,10 +40,30 @@ class SuggestionsService:
 
     def list_by_category(self, category: str) -> List[Ingredient]:
         cat = Category.normalize(category)
-        return sorted(
-            [i for i in self.ingredients_repo.list_all() if i.cat == cat],
-            key=lambda ing: (ing.difficulty, ing.name.lower()),
-        )
+        return [self._all[p] for p in self._sorted(cat)]
+
+    def top_k(
+        self,
+        k: int,
+        *,
+        categories: Optional[Sequence[str]] = None,
+        prefer_low_difficulty: bool = True,
+        restrict_books: Optional[Sequence[str]] = None,
+        restrict_origins: Optional[Sequence[str]] = None,
+    ) -> List[Ingredient]:
+        """
+        k meilleurs ingrédients compatibles, sur une ou plusieurs catégories.
+        Fusion paresseuse (heapq.merge) des listes triées : rien n'est re-trié.
+        """
+        if k <= 0:
+            return []
+        cats = [Category.normalize(c) for c in (categories or [c.value for c in Category])]
+        sign = 1 if prefer_low_difficulty else -1
+        lists = [self._sorted(c, prefer_low_difficulty) for c in cats]
+        items = self._all
+        merged = heapq.merge(*lists, key=lambda p: (sign * items[p].difficulty, items[p].name.lower()))
+        picked = islice(self._filtered(merged, restrict_books, restrict_origins), k)
+        return [items[p] for p in picked]
 
     # ---------------------------
     # Compléter une alternative
@@ -46,43 +85,101 @@ class SuggestionsService:
         - stratégie par défaut : prend la difficulté la plus basse compatible
         - restrictions possibles : livres et origines
         """
-        restrict_books = list(restrict_books or [])
-        restrict_origins = list(restrict_origins or [])
-
-        def _match(ing: Ingredient, wanted_cat: str) -> bool:
-            if ing.cat != wanted_cat:
-                return False
-            if restrict_books and not any(b in ing.books for b in restrict_books):
-                return False
-            if restrict_origins and not any(o in ing.origins for o in restrict_origins):
-                return False
-            return True
-
-        li = liant
-        ca = catalyseur
-        re = reactif
-
-        # pickers
-        if not li:
-            li_candidates = [i for i in self.ingredients_repo.list_all() if _match(i, Category.LIANT.value)]
-            li = _pick(li_candidates, prefer_low_difficulty)
-        if not ca:
-            ca_candidates = [i for i in self.ingredients_repo.list_all() if _match(i, Category.CATALYSEUR.value)]
-            ca = _pick(ca_candidates, prefer_low_difficulty)
-        if not re:
-            re_candidates = [i for i in self.ingredients_repo.list_all() if _match(i, Category.REACTIF.value)]
-            re = _pick(re_candidates, prefer_low_difficulty)
+        def _pick(cat: str) -> Optional[str]:
+            best = self.top_k(
+                1, categories=[cat], prefer_low_difficulty=prefer_low_difficulty,
+                restrict_books=restrict_books, restrict_origins=restrict_origins,
+            )
+            return best[0].name if best else None
+
+        li = liant or _pick(Category.LIANT.value)
+        ca = catalyseur or _pick(Category.CATALYSEUR.value)
+        re = reactif or _pick(Category.REACTIF.value)
 
         return (li or "", ca or "", re or "")
 
+    # ---------------------------
+    # Alternatives optimales
+    # ---------------------------
 
-# --- internals ---
+    def best_combos(
+        self,
+        *,
+        recipe: Optional[str] = None,
+        owned_books: Optional[Sequence[str]] = None,
+        allowed_origins: Optional[Sequence[str]] = None,
+        k: int = 5,
+        max_reactants: int = DEFAULT_MAX_REACTANTS,
+    ) -> List[ComboCandidate]:
+        """
+        k alternatives les moins difficiles (bonus de recette déduit).
+        - recipe : limite la recherche aux alternatives de cette recette
+        - owned_books / allowed_origins : None = pas de contrainte
+        """
+        optimizer = self._optimizer()
+        if recipe:
+            return optimizer.best_for_recipe(
+                recipe, owned_books=owned_books, allowed_origins=allowed_origins, k=k,
+            )
+        return optimizer.best_combos(
+            owned_books=owned_books, allowed_origins=allowed_origins, k=k, max_reactants=max_reactants,
+        )
 
-def _pick(candidates: List[Ingredient], prefer_low_diff: bool) -> Optional[str]:
-    if not candidates:
-        return None
-    if prefer_low_diff:
-        candidates = sorted(candidates, key=lambda ing: (ing.difficulty, ing.name.lower()))
-    else:
-        candidates = sorted(candidates, key=lambda ing: (-ing.difficulty, ing.name.lower()))
-    return candidates[0].name
+    # ---------------------------
+    # Index (par version du dataset)
+    # ---------------------------
+
+    def _sorted(self, cat: str, ascending: bool = True) -> List[int]:
+        self._refresh_index()
+        return (self._ascending if ascending else self._descending).get(cat, [])
+
+    def _filtered(
+        self,
+        positions: Iterable[int],
+        restrict_books: Optional[Sequence[str]],
+        restrict_origins: Optional[Sequence[str]],
+    ) -> Iterator[int]:
+        index = self._membership
+        books = index.books.mask(restrict_books) if restrict_books else None
+        origins = index.origins.mask(restrict_origins) if restrict_origins else None
+        for p in positions:
+            if books is not None and not index.has_any_book(p, books):
+                continue
+            if origins is not None and not index.has_any_origin(p, origins):
+                continue
+            yield p
+
+    def _refresh_index(self) -> None:
+        version = repo_version(self.ingredients_repo)
+        if version is not None and version == self._index_version:
+            return
+        ingredients = self.ingredients_repo.list_all()
+        asc: Dict[str, List[int]] = {}
+        for p, ing in enumerate(ingredients):
+            asc.setdefault(ing.cat, []).append(p)
+        desc: Dict[str, List[int]] = {}
+        for cat, positions in asc.items():
+            desc[cat] = sorted(positions, key=lambda p: (-ingredients[p].difficulty, ingredients[p].name.lower()))
+            positions.sort(key=lambda p: (ingredients[p].difficulty, ingredients[p].name.lower()))
+        self._all = ingredients
+        self._membership = MembershipIndex(ingredients)
+        self._ascending = asc
+        self._descending = desc
+        self._index_version = version
+
+    def _optimizer(self) -> ComboOptimizer:
+        ing_version = repo_version(self.ingredients_repo)
+        rec_version = repo_version(self.recipes_repo) if self.recipes_repo is not None else ()
+        version = None if ing_version is None or rec_version is None else (ing_version, rec_version)
+        if version is not None and version == self._optimizer_version and self._optimizer_cache is not None:
+            return self._optimizer_cache
+
+        self._refresh_index()
+        ingredients = self._all
+        recipes = self.recipes_repo.list_all() if self.recipes_repo is not None else []
+        difficulties: Dict[str, int] = {}
+        for ing in ingredients:
+            difficulties.setdefault(ing.name, ing.difficulty)
+        self._optimizer_cache = ComboOptimizer(ingredients, RecipeMatcher(recipes, difficulties))
+        self._optimizer_version = version
+        return self._optimizer_cache
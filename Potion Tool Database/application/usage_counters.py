@@ -0,0 +1,140 @@
+"""
+UsageCounters : usages des livres (ingrédients et recettes) et des origines (par libellé).
+
+Compteurs tenus à jour par deltas : chaque repo notifie ses écritures (subscribe),
+seules les références de l'entité modifiée sont retirées puis rajoutées.
+Chaque repo a sa partie : une écriture externe (version inattendue) ou la
+suppression d'un nom en double ne reconstruit que la partie de ce repo.
+
+Une entité compte une fois par clé, même si elle la référence plusieurs fois.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from application.snapshot import repo_version
+
+
+@dataclass(frozen=True)
+class BookUsage:
+    title: str
+    ingredients: List[str]
+    recipes: List[str]
+
+    @property
+    def total(self) -> int:
+        return len(self.ingredients) + len(self.recipes)
+
+
+class UsageCounters:
+    def __init__(self, ingredients_repo, recipes_repo=None) -> None:
+        self._ingredients = _Tally(ingredients_repo, {
+            "books": lambda ing: ing.books or [],
+            "origins": lambda ing: (_label(o) for o in ing.origins or []),
+        })
+        self._recipes = _Tally(recipes_repo, {
+            "books": lambda rec: rec.books or [],
+        }) if recipes_repo is not None else None
+
+    # --- livres ---
+
+    def book_counts(self) -> Dict[str, int]:
+        """Titre -> nb d'ingrédients qui le référencent."""
+        return self._ingredients.counts("books")
+
+    def recipe_book_counts(self) -> Dict[str, int]:
+        """Titre -> nb de recettes qui le référencent."""
+        return self._recipes.counts("books") if self._recipes is not None else {}
+
+    def book_usage(self, title: str) -> BookUsage:
+        return BookUsage(
+            title=title,
+            ingredients=self._ingredients.refs("books", title),
+            recipes=self._recipes.refs("books", title) if self._recipes is not None else [],
+        )
+
+    # --- origines ---
+
+    def origin_counts(self) -> Dict[str, int]:
+        """Libellé -> nb d'ingrédients qui le référencent."""
+        return self._ingredients.counts("origins")
+
+    def origin_usage(self, label: str) -> List[str]:
+        return self._ingredients.refs("origins", _label(label))
+
+
+class _Tally:
+    """Pour un repo : champ -> clé -> {nom d'entité: multiplicité} (+ nb d'entités par clé)."""
+
+    def __init__(self, repo, fields: Dict[str, Callable[[Any], Iterable[str]]]) -> None:
+        self.repo = repo
+        self.fields = fields
+        self._built = False
+        self._version: Optional[tuple] = None
+        self._names: Dict[str, int] = {}
+        self._refs: Dict[str, Dict[str, Dict[str, int]]] = {f: {} for f in fields}
+        self._counts: Dict[str, Dict[str, int]] = {f: {} for f in fields}
+        subscribe = getattr(repo, "subscribe", None)
+        if callable(subscribe):
+            subscribe(self._on_change)
+
+    def counts(self, field: str) -> Dict[str, int]:
+        self._ensure()
+        return dict(self._counts[field])
+
+    def refs(self, field: str, key: str) -> List[str]:
+        self._ensure()
+        return sorted(self._refs[field].get(key) or {}, key=str.lower)
+
+    def _ensure(self) -> None:
+        version = repo_version(self.repo)
+        if not self._built or version is None or version != self._version:
+            self._rebuild(version)
+
+    def _rebuild(self, version: Optional[tuple]) -> None:
+        self._names = {}
+        self._refs = {f: {} for f in self.fields}
+        self._counts = {f: {} for f in self.fields}
+        for entity in self.repo.list_all():
+            self._apply(entity, 1)
+        self._version = version
+        self._built = True
+
+    def _on_change(self, change) -> None:
+        if not self._built or change.base != self._version:
+            return  # déjà périmé : reconstruit à la prochaine lecture
+        if change.after is None and self._names.get(change.before.name, 0) > 1:
+            self._built = False  # le repo a supprimé toutes les occurrences du nom
+            return
+        if change.before is not None:
+            self._apply(change.before, -1)
+        if change.after is not None:
+            self._apply(change.after, 1)
+        self._version = change.version
+
+    def _apply(self, entity: Any, sign: int) -> None:
+        name = entity.name
+        _bump(self._names, name, sign)
+        for field, keys_of in self.fields.items():
+            refs = self._refs[field]
+            counts = self._counts[field]
+            for key in dict.fromkeys(k for k in keys_of(entity) if k):
+                holders = refs.setdefault(key, {})
+                _bump(holders, name, sign)
+                if not holders:
+                    del refs[key]
+                _bump(counts, key, sign)
+
+
+def _bump(counter: Dict[str, int], key: str, delta: int) -> None:
+    n = counter.get(key, 0) + delta
+    if n:
+        counter[key] = n
+    else:
+        counter.pop(key, None)
+
+
+def _label(origin: str) -> str:
+    return str(origin).split("/")[-1]
@@ -5,17 +5,23 @@ Orchestration de la logique métier + validation + accès aux dépôts.
 
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass
 from typing import Iterable, List, Optional
 
 from domain.models import Ingredient, Recipe
 from domain.value_objects import Category
 from domain.errors import (
+    PotionDBError,
     NotFoundError,
     DuplicateNameError,
     ValidationError,
+    InUseError,
 )
 from application.validators import ValidationService
+from application.snapshot import DatasetSnapshot, take_snapshot
+from application.usage_counters import BookUsage, UsageCounters
+from application import parallel
 
 
 # ---------------------------
@@ -66,7 +72,7 @@ class CreateIngredient:
 
     def execute(self, *, name: str, cat: str, difficulty: int,
                 shortEffect: Optional[str], effect: Optional[str],
-                books: list[str], origins: list[str]) -> None:
+                books: list[str], origins: list[str]) -> Ingredient:
         category = Category.normalize(cat)
         ing = Ingredient(
             name=name.strip(),
@@ -79,6 +85,7 @@ class CreateIngredient:
         )
         self.validator.validate_ingredient(ing, check_unique=True)
         self.repo.add(ing)
+        return ing
 
 
 @dataclass
@@ -92,7 +99,7 @@ class UpdateIngredient:
 
     def execute(self, *, name: str, cat: str, difficulty: int,
                 shortEffect: Optional[str], effect: Optional[str],
-                books: list[str], origins: list[str]) -> None:
+                books: list[str], origins: list[str]) -> Ingredient:
         category = Category.normalize(cat)
         ing = Ingredient(
             name=name.strip(),
@@ -107,22 +114,36 @@ class UpdateIngredient:
         if _find_by_name(self.repo.list_all(), ing.name) is None:
             raise NotFoundError(f"Ingrédient introuvable: {ing.name!r}")
         self.repo.update(ing)
+        return ing
 
 
 @dataclass
 class DeleteIngredient:
+    """
+    Refuse (InUseError) de supprimer un ingrédient encore utilisé par des recettes,
+    sauf force=True. Sans index where_used, pas de contrôle.
+    """
     repo: any
     validator: ValidationService
+    where_used: any
 
-    def __init__(self, repo, validator: ValidationService) -> None:
+    def __init__(self, repo, validator: ValidationService, where_used=None) -> None:
         self.repo = repo
         self.validator = validator
+        self.where_used = where_used
 
-    def execute(self, name: str) -> None:
+    def execute(self, name: str, *, force: bool = False) -> None:
         if not name:
             raise ValidationError("Nom d'ingrédient vide.")
         if _find_by_name(self.repo.list_all(), name) is None:
             raise NotFoundError(f"Ingrédient introuvable: {name!r}")
+        if not force and self.where_used is not None:
+            usages = self.where_used.where_used(name)
+            if usages:
+                recipes = sorted({u.recipe for u in usages}, key=str.lower)
+                raise InUseError(
+                    f"Ingrédient {name!r} utilisé par : {', '.join(recipes)}.", usages
+                )
         self.repo.delete(name)
 
 
@@ -174,7 +195,7 @@ class CreateRecipe:
         self.validator = validator
 
     def execute(self, *, name: str, desc: str, emoji: Optional[str], bonus: Optional[float],
-                combos: list[list[str]], books: Optional[list[str]] = None) -> None:
+                combos: list[list[str]], books: Optional[list[str]] = None) -> Recipe:
         recipe = Recipe(
             name=name.strip(),
             desc=desc.strip(),
@@ -186,6 +207,7 @@ class CreateRecipe:
         self.validator.validate_recipe(recipe, check_unique=True)
         # ✅ persiste la création
         self.repo.add(recipe)
+        return recipe
 
 
 @dataclass
@@ -200,7 +222,7 @@ class UpdateRecipe:
         self.validator = validator
 
     def execute(self, *, name: str, desc: str, emoji: Optional[str], bonus: Optional[float],
-                combos: list[list[str]], books: Optional[list[str]] = None) -> None:
+                combos: list[list[str]], books: Optional[list[str]] = None) -> Recipe:
         recipe = Recipe(
             name=name.strip(),
             desc=desc.strip(),
@@ -213,6 +235,7 @@ class UpdateRecipe:
         if _find_by_name(self.repo.list_all(), recipe.name) is None:
             raise NotFoundError(f"Recette introuvable: {recipe.name!r}")
         self.repo.update(recipe)
+        return recipe
 
 
 @dataclass
@@ -319,33 +342,45 @@ class RenameBook:
 
 @dataclass
 class RemoveBook:
+    """
+    Retire le livre du référentiel et renvoie les entités qui le référençaient
+    (BookUsage, lu dans les compteurs d'usage : pas de parcours du dataset).
+    Les références des ingrédients sont nettoyées, celles des recettes signalées.
+    """
     data_repo: any
     ingredients_repo: any
     validator: ValidationService
+    usage: any
 
-    def __init__(self, data_repo, validator: ValidationService) -> None:
+    def __init__(self, data_repo, validator: ValidationService, usage: UsageCounters) -> None:
         self.data_repo = data_repo
         self.validator = validator
+        self.usage = usage   # partagé avec les presenters (composition root)
 
-    def execute(self, title: str) -> None:
+    def execute(self, title: str) -> Optional[BookUsage]:
         t = (title or "").strip()
         if not t:
             raise ValidationError("Titre de livre vide.")
         books = list(self.data_repo.get_books())
         if t not in books:
             # idempotent
-            return
+            return None
+        affected = self.usage.book_usage(t)
         books = [b for b in books if b != t]
         self.data_repo.set_books(books)
         # Défensif : supprimer les références restantes dans les ingrédients (si l'UI n'a pas migré)
+        if not affected.ingredients:
+            return affected
+        targets = set(affected.ingredients)
         try:
             ingredients_repo = getattr(self, "ingredients_repo", None) or self.validator.ingredients_repo
             for ing in list(ingredients_repo.list_all()):
-                if t in ing.books:
+                if ing.name in targets and t in ing.books:
                     ing.books = [b for b in ing.books if b != t]
                     ingredients_repo.update(ing)
         except Exception:
             pass
+        return affected
 
 
 @dataclass
@@ -489,10 +524,21 @@ class ValidateDataset:
     def __init__(self, validator: ValidationService) -> None:
         self.validator = validator
 
-    def execute(self) -> None:
+    def execute(self, *, workers: int = 1) -> None:
         """
         Valide tout le dataset ou lève ValidationError détaillée au premier problème détecté.
+        workers > 1 : validation par morceaux sur plusieurs cœurs ; l'erreur levée
+        reste celle qu'aurait levée la passe séquentielle (la plus en amont).
         """
+        if workers > 1:
+            snapshot = take_snapshot(
+                self.validator.ingredients_repo,
+                self.validator.recipes_repo,
+                self.validator.data_repo,
+            )
+            self._execute_parallel(snapshot, workers)
+            return
+
         # ingrédients
         seen_ing = set()
         for ing in self.validator.ingredients_repo.list_all():
@@ -509,6 +555,52 @@ class ValidateDataset:
                 raise DuplicateNameError(f"Doublon de recette: {r.name!r}")
             seen_rec.add(r.name)
 
+    def _execute_parallel(self, snapshot: DatasetSnapshot, workers: int) -> None:
+        n_chunks = workers * 4
+        jobs = [("ingredients", r) for r in parallel.partition(len(snapshot.ingredients), n_chunks)]
+        jobs += [("recipes", r) for r in parallel.partition(len(snapshot.recipes), n_chunks)]
+        results = parallel.run_chunks(_validate_chunk, jobs, context=snapshot, workers=workers)
+
+        for kind, items, dup_msg in (
+            ("ingredients", snapshot.ingredients, "Doublon d'ingrédient: {!r}"),
+            ("recipes", snapshot.recipes, "Doublon de recette: {!r}"),
+        ):
+            # 1re erreur de validation (les morceaux sont contigus et ordonnés)
+            first = next(
+                (res for (k, _), res in zip(jobs, results) if k == kind and res is not None),
+                None,
+            )
+            # 1er doublon : passe séquentielle légère
+            dup_index = None
+            seen = set()
+            for i, x in enumerate(items):
+                if x.name in seen:
+                    dup_index = i
+                    break
+                seen.add(x.name)
+            # même ordre que la passe séquentielle : validation puis doublon, élément par élément
+            if first is not None and (dup_index is None or first[0] <= dup_index):
+                raise first[1]
+            if dup_index is not None:
+                raise DuplicateNameError(dup_msg.format(items[dup_index].name))
+
+
+def _validate_chunk(job):
+    """Worker : retourne (index, erreur) de la 1re entité invalide du morceau, sinon None."""
+    kind, (start, end) = job
+    snapshot = parallel.worker_context()
+    validator = ValidationService(ingredients_repo=snapshot, recipes_repo=None, data_repo=snapshot)
+    for i in range(start, end):
+        try:
+            if kind == "ingredients":
+                # copie : la validation normalise les origines en place
+                validator.validate_ingredient(copy.copy(snapshot.ingredients[i]), check_unique=False)
+            else:
+                validator.validate_recipe(copy.copy(snapshot.recipes[i]), check_unique=False)
+        except PotionDBError as e:
+            return (i, e)
+    return None
+
 
 @dataclass
 class InspectDataset:
@@ -119,9 +119,16 @@ class ValidationService:
         tree = self.data_repo.get_origin_tree()
         return _list_labels(tree)
 
+    def _origin_label_set(self):
+        # un snapshot expose ses libellés pré-calculés ; sinon on parcourt l'arbre
+        labels = getattr(self.data_repo, "origin_labels", None)
+        if labels is not None:
+            return labels
+        return set(self.list_origin_labels())
+
     def _ensure_origin_labels_exist(self, origins: Sequence[str]) -> None:
         """Chaque élément de `origins` doit être un libellé existant dans l'arbre."""
-        labels = set(self.list_origin_labels())
+        labels = self._origin_label_set()
         for o in origins or []:
             if not o:
                 # on ignore les vides déjà nettoyés en amont, mais si tu préfères: raise ValidationError
@@ -142,7 +149,7 @@ class ValidationService:
         label = origin.split("/")[-1].strip()
         if not label:
             raise OriginError("Origine vide.")
-        if label in set(self.list_origin_labels()):
+        if label in self._origin_label_set():
             return label
         raise OriginError(f"Origine inconnue: {origin!r}")
 
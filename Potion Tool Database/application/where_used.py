@@ -0,0 +1,111 @@
+"""
+WhereUsedIndex : index inverse ingrédient -> (recette, alternative).
+
+- "où est utilisé" un ingrédient, test "non utilisé" en O(1) ;
+- tenu à jour par deltas : le repo de recettes notifie chaque écriture (subscribe),
+  seules les alternatives de la recette modifiée sont retirées puis réindexées ;
+- écriture externe (version du repo inattendue) ou noms de recettes en double :
+  reconstruction complète, à la lecture suivante.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from domain.models import Recipe
+from application.snapshot import repo_version
+
+
+@dataclass(frozen=True)
+class Usage:
+    recipe: str
+    alternative: int      # index dans recipe.combos (0 = 1re alternative)
+
+
+class WhereUsedIndex:
+    def __init__(self, recipes_repo) -> None:
+        self.recipes_repo = recipes_repo
+        self._built = False
+        self._version: Optional[tuple] = None
+        self._postings: Dict[str, Dict[str, List[int]]] = {}   # ingrédient -> recette -> alternatives
+        self._recipe_counts: Dict[str, int] = {}                # doublons de noms de recettes
+        subscribe = getattr(recipes_repo, "subscribe", None)
+        if callable(subscribe):
+            subscribe(self._on_change)
+
+    # ---------------------------
+    # API
+    # ---------------------------
+
+    def where_used(self, name: str) -> List[Usage]:
+        """Alternatives qui utilisent l'ingrédient, triées par recette puis alternative."""
+        by_recipe = self._index().get(name) or {}
+        return [
+            Usage(recipe=r, alternative=a)
+            for r in sorted(by_recipe, key=str.lower)
+            for a in by_recipe[r]
+        ]
+
+    def recipes_using(self, name: str) -> List[str]:
+        return sorted(self._index().get(name) or {}, key=str.lower)
+
+    def is_used(self, name: str) -> bool:
+        return name in self._index()
+
+    def unused(self, names: Iterable[str]) -> List[str]:
+        postings = self._index()
+        return [n for n in names if n not in postings]
+
+    # ---------------------------
+    # internals
+    # ---------------------------
+
+    def _index(self) -> Dict[str, Dict[str, List[int]]]:
+        version = repo_version(self.recipes_repo)
+        if not self._built or version is None or version != self._version:
+            self._rebuild(version)
+        return self._postings
+
+    def _rebuild(self, version: Optional[tuple]) -> None:
+        self._postings = {}
+        self._recipe_counts = {}
+        for rec in self.recipes_repo.list_all():
+            self._put(rec)
+        self._version = version
+        self._built = True
+
+    def _on_change(self, change) -> None:
+        if not self._built or change.base != self._version:
+            return  # déjà périmé : reconstruit à la prochaine lecture
+        name = (change.after or change.before).name
+        if self._recipe_counts.get(name, 0) > 1:
+            self._built = False  # quelle occurrence a changé ? on ne sait pas
+            return
+        if change.before is not None:
+            self._drop(change.before)
+        if change.after is not None:
+            self._put(change.after)
+        self._version = change.version
+
+    def _put(self, rec: Recipe) -> None:
+        self._recipe_counts[rec.name] = self._recipe_counts.get(rec.name, 0) + 1
+        for i, combo in enumerate(rec.combos or []):
+            for ing in dict.fromkeys(combo):  # un ingrédient répété compte une fois
+                if ing:
+                    self._postings.setdefault(ing, {}).setdefault(rec.name, []).append(i)
+
+    def _drop(self, rec: Recipe) -> None:
+        count = self._recipe_counts.get(rec.name, 0) - 1
+        if count > 0:
+            self._recipe_counts[rec.name] = count
+        else:
+            self._recipe_counts.pop(rec.name, None)
+        for combo in rec.combos or []:
+            for ing in combo:
+                by_recipe = self._postings.get(ing)
+                if by_recipe is None:
+                    continue
+                by_recipe.pop(rec.name, None)
+                if not by_recipe:
+                    del self._postings[ing]
@@ -0,0 +1,87 @@
+"""
+Benchmark : mémoire des ingrédients / recettes chargés, avec et sans StringPool.
+
+Écrit un dataset synthétique (bench_parallel.make_snapshot) en JSON dans un dossier
+temporaire, le recharge par les mappers DTO et mesure avec tracemalloc la mémoire
+retenue par les objets chargés, puis le temps d'un filtre par livre / origine.
+
+    python benchmarks/bench_interning.py
+    python benchmarks/bench_interning.py --ingredients 500000 --recipes 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adapters.mapping import (  # noqa: E402
+    StringPool, ingredient_from_dto, ingredient_to_dto, recipe_from_dto, recipe_to_dto,
+)
+from bench_parallel import make_snapshot  # noqa: E402
+
+
+def _load(path: str, from_dto, shared: bool):
+    """
+    Chargement comme le repo (pool partagé) ou un pool par enregistrement (sans internement).
+    Mesure la mémoire retenue une fois les DTOs et le pool libérés.
+    """
+    tracemalloc.start()
+    with open(path, "r", encoding="utf-8") as f:
+        dtos = json.load(f)
+    pool = StringPool()
+    items = [from_dto(d, pool if shared else StringPool()) for d in dtos]
+    del dtos, pool
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return items, size
+
+
+def _filter_time(ingredients, books, labels) -> float:
+    t0 = time.perf_counter()
+    for title in books:
+        sum(1 for ing in ingredients if title in ing.books)
+    for label in labels:
+        sum(1 for ing in ingredients if label in ing.origins)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--ingredients", type=int, default=200_000)
+    ap.add_argument("--recipes", type=int, default=50_000)
+    args = ap.parse_args()
+
+    snap = make_snapshot(args.ingredients, args.recipes)
+    with tempfile.TemporaryDirectory() as tmp:
+        ing_path = os.path.join(tmp, "ingredients.json")
+        rec_path = os.path.join(tmp, "recipes.json")
+        with open(ing_path, "w", encoding="utf-8") as f:
+            json.dump([ingredient_to_dto(i) for i in snap.ingredients], f, ensure_ascii=False)
+        with open(rec_path, "w", encoding="utf-8") as f:
+            json.dump([recipe_to_dto(r) for r in snap.recipes], f, ensure_ascii=False)
+
+        print(f"Dataset : {args.ingredients} ingrédients, {args.recipes} recettes")
+        print(f"{'':>12} | {'ingrédients':>11} | {'recettes':>9} | {'filtres':>8}")
+        print("-" * 50)
+        # les titres / libellés cherchés viennent d'ailleurs (data.js) : instances distinctes
+        books = [str(b).encode().decode() for b in snap.books]
+        labels = sorted({o.encode().decode() for i in snap.ingredients[:1000] for o in i.origins})
+        for shared in (False, True):
+            ings, ing_size = _load(ing_path, ingredient_from_dto, shared)
+            recs, rec_size = _load(rec_path, recipe_from_dto, shared)
+            elapsed = _filter_time(ings, books, labels)
+            name = "pool" if shared else "sans pool"
+            print(f"{name:>12} | {ing_size / 1e6:>9.1f}MB | {rec_size / 1e6:>7.1f}MB | {elapsed:>7.2f}s")
+            del ings, recs
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Benchmark : passage à l'échelle de find_near_duplicates (noms quasi identiques).
+
+Noms synthétiques : moitié structurés (« Ingrédient 0000042 », le pire cas des seaux
+LSH), moitié mots aléatoires dont ~5 % reçoivent une variante à une faute de frappe.
+Mesure chaque taille et compare le temps *par nom* de la plus grande à celui de la
+plus petite ; code de sortie 1 si le rapport dépasse --max-ratio (croissance non linéaire).
+
+    python benchmarks/bench_near_duplicates.py
+    python benchmarks/bench_near_duplicates.py --sizes 5000,20000,80000 --max-ratio 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from application.near_duplicates import find_near_duplicates  # noqa: E402
+
+
+def make_names(n: int, *, seed: int = 7) -> List[str]:
+    rnd = random.Random(seed)
+    out = [f"Ingrédient {i:07d}" for i in range(n // 2)]
+    letters = string.ascii_lowercase + "éèà"
+    while len(out) < n:
+        word = " ".join("".join(rnd.choice(letters) for _ in range(rnd.randint(4, 9)))
+                        for _ in range(rnd.randint(1, 3))).capitalize()
+        out.append(word)
+        if rnd.random() < 0.05 and len(out) < n:
+            pos = rnd.randrange(len(word))
+            out.append(word[:pos] + rnd.choice(letters) + word[pos + 1:])
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="2000,4000,8000,16000,32000")
+    ap.add_argument("--max-ratio", type=float, default=2.5,
+                    help="rapport maximal du temps par nom (plus grande / plus petite taille)")
+    args = ap.parse_args()
+
+    per_name: List[float] = []
+    for n in [int(s) for s in args.sizes.split(",")]:
+        names = make_names(n)
+        t0 = time.perf_counter()
+        clusters = find_near_duplicates(names)
+        dt = time.perf_counter() - t0
+        per_name.append(dt / n)
+        biggest = max((len(c) for c in clusters), default=0)
+        print(f"{n:>8} noms : {dt * 1000:8.1f} ms ({dt / n * 1e6:6.1f} µs/nom), "
+              f"{len(clusters)} groupes, le plus grand : {biggest}")
+
+    ratio = per_name[-1] / per_name[0]
+    print(f"temps par nom : x{ratio:.2f} entre la plus petite et la plus grande taille "
+          f"(max {args.max_ratio})")
+    return 0 if ratio <= args.max_ratio else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Benchmark : inspection (RuleEngine) et validation (ValidateDataset) en parallèle.
+
+Génère un dataset synthétique en mémoire (par défaut 1M ingrédients / 200k recettes)
+puis mesure chaque nombre de workers pour tracer la courbe de passage à l'échelle.
+
+    python benchmarks/bench_parallel.py
+    python benchmarks/bench_parallel.py --ingredients 200000 --recipes 40000 --workers 1,2,4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.models import Ingredient, Recipe  # noqa: E402
+from application import parallel  # noqa: E402
+from application.integrity import IntegrityService  # noqa: E402
+from application.snapshot import DatasetSnapshot  # noqa: E402
+from application.use_cases import ValidateDataset  # noqa: E402
+from application.validators import ValidationService  # noqa: E402
+
+CATS = ("Liant", "Catalyseur", "Réactif")
+
+
+def make_snapshot(n_ingredients: int, n_recipes: int, *, seed: int = 42) -> DatasetSnapshot:
+    rnd = random.Random(seed)
+    books = tuple(f"Livre {i:03d}" for i in range(60))
+    origin_tree = {
+        f"Région {r}": {f"Zone {r}-{z}": {f"Lieu {r}-{z}-{l}": {} for l in range(8)} for z in range(6)}
+        for r in range(5)
+    }
+    labels = [f"Lieu {r}-{z}-{l}" for r in range(5) for z in range(6) for l in range(8)]
+
+    ingredients: List[Ingredient] = []
+    by_cat = {c: [] for c in CATS}
+    for i in range(n_ingredients):
+        cat = CATS[i % 3]
+        name = f"Ingrédient {i:07d}"
+        by_cat[cat].append(name)
+        ingredients.append(Ingredient(
+            name=name,
+            cat=cat,
+            difficulty=rnd.randint(-3, 12),
+            short_effect="Effet court",
+            effect=None,
+            origins=rnd.sample(labels, 2),
+            books=rnd.sample(books, 1),
+        ))
+
+    recipes: List[Recipe] = []
+    for i in range(n_recipes):
+        combos = []
+        for _ in range(rnd.randint(1, 3)):
+            combos.append([
+                rnd.choice(by_cat["Liant"]),
+                rnd.choice(by_cat["Catalyseur"]),
+                *rnd.sample(by_cat["Réactif"], rnd.randint(1, 2)),
+            ])
+        recipes.append(Recipe(
+            name=f"Recette {i:06d}",
+            desc="",
+            bonus=float(rnd.randint(0, 5)),
+            books=rnd.sample(books, 1),
+            combos=combos,
+        ))
+
+    return DatasetSnapshot(
+        ingredients=tuple(ingredients),
+        recipes=tuple(recipes),
+        books=books,
+        origin_tree=origin_tree,
+    )
+
+
+class _SnapshotRecipes:
+    """Expose snapshot.recipes avec l'API list_all() d'un repo de recettes."""
+
+    def __init__(self, snapshot: DatasetSnapshot) -> None:
+        self.snapshot = snapshot
+
+    def list_all(self):
+        return list(self.snapshot.recipes)
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--ingredients", type=int, default=1_000_000)
+    ap.add_argument("--recipes", type=int, default=200_000)
+    ap.add_argument("--workers", default="1,2,4,8", help="liste séparée par des virgules")
+    args = ap.parse_args()
+    counts = [int(w) for w in args.workers.split(",") if w.strip()]
+    parallel.allow_fork()  # script sans threads natifs : contexte hérité, sans pickling
+
+    t0 = time.perf_counter()
+    snap = make_snapshot(args.ingredients, args.recipes)
+    print(f"Dataset : {args.ingredients} ingrédients, {args.recipes} recettes "
+          f"(généré en {time.perf_counter() - t0:.1f}s, {os.cpu_count()} cœurs)")
+
+    integrity = IntegrityService(snap, _SnapshotRecipes(snap), snap)
+    validate = ValidateDataset(ValidationService(snap, _SnapshotRecipes(snap), snap))
+
+    print(f"{'workers':>7} | {'inspection':>10} | {'x':>5} | {'validation':>10} | {'x':>5}")
+    print("-" * 50)
+    base_i = base_v = None
+    for w in counts:
+        ti = _timed(lambda: integrity.run(snap, workers=w))
+        tv = _timed(lambda: validate.execute(workers=w))
+        base_i = base_i or ti
+        base_v = base_v or tv
+        print(f"{w:>7} | {ti:>9.2f}s | {base_i / ti:>5.2f} | {tv:>9.2f}s | {base_v / tv:>5.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
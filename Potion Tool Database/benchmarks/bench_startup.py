@@ -0,0 +1,59 @@
+"""
+Benchmark : temps jusqu'à la première fenêtre (Start.py avec POTION_PROFILE_STARTUP=exit).
+
+Lance l'application plusieurs fois dans un processus neuf (plateforme Qt offscreen par
+défaut), relève la phase 'premier affichage' du rapport de startup_profile et compare
+la médiane à STARTUP_TARGET_MS ; code de sortie 1 si l'objectif est dépassé.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --report
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from startup_profile import ENV_FLAG, STARTUP_TARGET_MS  # noqa: E402
+
+_FIRST_PAINT = re.compile(r"premier affichage\s+([\d.]+) ms")
+
+
+def run_once(show_report: bool) -> float:
+    env = dict(os.environ)
+    env[ENV_FLAG] = "exit"
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "Start.py")],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    m = _FIRST_PAINT.search(proc.stderr)
+    if m is None:
+        raise RuntimeError(f"pas de rapport de démarrage (code {proc.returncode}) :\n{proc.stderr}")
+    if show_report:
+        print(proc.stderr)
+    return float(m.group(1))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--report", action="store_true", help="affiche le rapport complet du dernier lancement")
+    args = ap.parse_args()
+
+    times = [run_once(args.report and i == args.runs - 1) for i in range(args.runs)]
+    median = statistics.median(times)
+    print(f"première fenêtre : médiane {median:.0f} ms, min {min(times):.0f} ms, max {max(times):.0f} ms "
+          f"({args.runs} lancements) ; objectif {STARTUP_TARGET_MS:.0f} ms")
+    return 0 if median <= STARTUP_TARGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
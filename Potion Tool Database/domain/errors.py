@@ -45,6 +45,14 @@ class RecipeError(ValidationError):
     """Recette invalide (combos, ingrédients manquants…)."""
 
 
+class InUseError(ValidationError):
+    """Suppression refusée : encore référencé (cf. references)."""
+
+    def __init__(self, message: str, references=()) -> None:
+        super().__init__(message)
+        self.references = list(references)
+
+
 # Infrastructure
 class RepositoryError(PotionDBError):
     """Erreur d'accès dépôt (I/O, parsing…)."""
@@ -0,0 +1,339 @@
+"""
+IngredientTable : ingrédients en colonnes, pour les gros datasets (pur, pas d'I/O).
+
+- colonnes parallèles compactes (array) : difficulté, code de catégorie, ids de chaînes
+  (nom, résumé, effet : chaque valeur distincte n'est stockée qu'une fois) ;
+- livres et origines en CSR : ids concaténés + offsets par ligne (ordre et doublons
+  d'origine conservés) ;
+- filtres, tris et agrégats vectorisés (NumPy, vues sans copie sur les colonnes) ;
+- les `Ingredient` ne sont construits qu'à la demande (row / rows).
+
+NumPy est optionnel (importé au premier filtre / tri / agrégat) : sans lui, mêmes opérations en pur Python sur les mêmes colonnes.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from domain.membership import LabelIds
+from domain.models import Ingredient
+from domain.optional_numpy import np, numpy_available
+from domain.value_objects import Category
+
+SORT_KEYS = ("name", "difficulty", "category")
+
+_NONE = 0   # id de chaîne réservé : valeur absente (None)
+
+
+class IngredientTable:
+    def __init__(self) -> None:
+        self.strings = LabelIds()          # noms, résumés, effets
+        self.strings.intern("")            # id 0 = None
+        self.categories = LabelIds()       # codes stables : Liant, Catalyseur, Réactif, puis inconnues
+        for c in Category:
+            self.categories.intern(c.value)
+        self.books = LabelIds()
+        self.origins = LabelIds()
+
+        self.name_ids = array("i")
+        self.cat_codes = array("h")
+        self.difficulties = array("q")
+        self.short_ids = array("i")
+        self.effect_ids = array("i")
+        self.book_ids = array("i")
+        self.book_ptr = array("q", [0])
+        self.origin_ids = array("i")
+        self.origin_ptr = array("q", [0])
+        self._derived: Dict[str, object] = {}   # caches (vues NumPy, rangs...) : vidés avant chaque ajout
+
+    @classmethod
+    def from_ingredients(cls, ingredients: Iterable[Ingredient]) -> "IngredientTable":
+        table = cls()
+        for ing in ingredients:
+            table.append(
+                name=ing.name, cat=ing.cat, difficulty=ing.difficulty,
+                short_effect=ing.short_effect, effect=ing.effect,
+                origins=ing.origins, books=ing.books,
+            )
+        return table
+
+    def append(
+        self, *, name: str, cat: str, difficulty: int = 0,
+        short_effect: Optional[str] = None, effect: Optional[str] = None,
+        origins: Sequence[str] = (), books: Sequence[str] = (),
+    ) -> int:
+        """Ajoute une ligne (valeurs déjà normalisées) ; renvoie son index."""
+        # valeurs calculées avant toute écriture : une erreur ne désaligne pas les colonnes
+        row = (
+            self.strings.intern(name), self.categories.intern(cat), int(difficulty or 0),
+            self._text_id(short_effect), self._text_id(effect),
+        )
+        book_ids = [self.books.intern(b) for b in books or ()]
+        origin_ids = [self.origins.intern(o) for o in origins or ()]
+        # les vues NumPy (frombuffer) bloquent le redimensionnement des array : à lâcher d'abord
+        self._derived.clear()
+        for col, value in zip(
+            (self.name_ids, self.cat_codes, self.difficulties, self.short_ids, self.effect_ids), row,
+        ):
+            col.append(value)
+        self.book_ids.extend(book_ids)
+        self.book_ptr.append(len(self.book_ids))
+        self.origin_ids.extend(origin_ids)
+        self.origin_ptr.append(len(self.origin_ids))
+        return len(self.name_ids) - 1
+
+    def __len__(self) -> int:
+        return len(self.name_ids)
+
+    # ---------------------------
+    # Accès par ligne
+    # ---------------------------
+
+    def name(self, i: int) -> str:
+        return self.strings.labels[self.name_ids[i]]
+
+    def category(self, i: int) -> str:
+        return self.categories.labels[self.cat_codes[i]]
+
+    def difficulty(self, i: int) -> int:
+        return self.difficulties[i]
+
+    def short_effect(self, i: int) -> Optional[str]:
+        return self._text(self.short_ids[i])
+
+    def effect(self, i: int) -> Optional[str]:
+        return self._text(self.effect_ids[i])
+
+    def book_titles(self, i: int) -> List[str]:
+        labels = self.books.labels
+        return [labels[b] for b in self.book_ids[self.book_ptr[i]:self.book_ptr[i + 1]]]
+
+    def origin_labels(self, i: int) -> List[str]:
+        labels = self.origins.labels
+        return [labels[o] for o in self.origin_ids[self.origin_ptr[i]:self.origin_ptr[i + 1]]]
+
+    def names(self, rows: Optional[Iterable[int]] = None) -> List[str]:
+        labels = self.strings.labels
+        ids = self.name_ids if rows is None else (self.name_ids[i] for i in rows)
+        return [labels[n] for n in ids]
+
+    def positions(self, name: str) -> List[int]:
+        """Lignes portant ce nom (index construit à la 1re demande)."""
+        by_name = self._derived.get("by_name")
+        if by_name is None:
+            by_name = {}
+            for i, n in enumerate(self.name_ids):
+                by_name.setdefault(n, []).append(i)
+            self._derived["by_name"] = by_name
+        sid = self.strings.ids.get(name)
+        return list(by_name.get(sid, ())) if sid is not None else []
+
+    def row(self, i: int) -> Ingredient:
+        return Ingredient(
+            name=self.name(i),
+            cat=self.category(i),
+            difficulty=self.difficulties[i],
+            short_effect=self.short_effect(i),
+            effect=self.effect(i),
+            origins=self.origin_labels(i),
+            books=self.book_titles(i),
+        )
+
+    def rows(self, rows: Optional[Iterable[int]] = None) -> List[Ingredient]:
+        return [self.row(i) for i in (range(len(self)) if rows is None else rows)]
+
+    # ---------------------------
+    # Requêtes
+    # ---------------------------
+
+    def filter(
+        self,
+        *,
+        cat: Optional[str] = None,
+        books: Optional[Iterable[str]] = None,
+        origins: Optional[Iterable[str]] = None,
+        min_difficulty: Optional[int] = None,
+        max_difficulty: Optional[int] = None,
+        rows: Optional[Sequence[int]] = None,
+    ) -> List[int]:
+        """
+        Lignes qui passent tous les critères donnés (None = pas de critère) :
+        books / origins = « référence au moins une de ces chaînes exactes ».
+        Ordre : croissant, ou celui de `rows` si fourni.
+        """
+        code = self.categories.ids.get(cat, -1) if cat is not None else None
+        book_set = _known_ids(self.books, books)
+        origin_set = _known_ids(self.origins, origins)
+        if numpy_available():
+            return self._filter_numpy(code, book_set, origin_set, min_difficulty, max_difficulty, rows)
+        return self._filter_python(code, book_set, origin_set, min_difficulty, max_difficulty, rows)
+
+    def sort(self, rows: Optional[Sequence[int]] = None, *, by: str = "name", descending: bool = False) -> List[int]:
+        """Lignes triées par nom (casse ignorée), difficulté ou catégorie ; le nom départage."""
+        if by not in SORT_KEYS:
+            raise ValueError(f"Tri inconnu: {by!r} (attendu: {', '.join(SORT_KEYS)})")
+        rows = list(range(len(self))) if rows is None else list(rows)
+        if numpy_available():
+            idx = np.asarray(rows, dtype=np.int64)
+            keys = [self._name_rank_np()[idx]]
+            if by == "difficulty":
+                keys.append(self._np("difficulties")[idx])
+            elif by == "category":
+                keys.append(self._np("cat_codes")[idx])
+            order = np.lexsort(keys)
+            if descending:
+                order = order[::-1]
+            return idx[order].tolist()
+        rank = self._name_rank()
+        if by == "difficulty":
+            key = lambda i: (self.difficulties[i], rank[i])
+        elif by == "category":
+            key = lambda i: (self.cat_codes[i], rank[i])
+        else:
+            key = rank.__getitem__
+        return sorted(rows, key=key, reverse=descending)
+
+    def count_by_category(self, rows: Optional[Sequence[int]] = None) -> Dict[str, int]:
+        labels = self.categories.labels
+        if numpy_available():
+            codes = self._np("cat_codes")
+            if rows is not None:
+                codes = codes[np.asarray(rows, dtype=np.int64)]
+            counts = np.bincount(codes, minlength=len(labels)).tolist()
+        else:
+            counts = [0] * len(labels)
+            for i in (range(len(self)) if rows is None else rows):
+                counts[self.cat_codes[i]] += 1
+        return {labels[c]: n for c, n in enumerate(counts) if n}
+
+    def difficulty_stats(self, rows: Optional[Sequence[int]] = None) -> Optional[Tuple[int, int, float]]:
+        """(min, max, moyenne) des difficultés ; None si aucune ligne."""
+        if numpy_available():
+            d = self._np("difficulties")
+            if rows is not None:
+                d = d[np.asarray(rows, dtype=np.int64)]
+            if not len(d):
+                return None
+            return int(d.min()), int(d.max()), float(d.mean())
+        d = list(self.difficulties) if rows is None else [self.difficulties[i] for i in rows]
+        if not d:
+            return None
+        return min(d), max(d), sum(d) / len(d)
+
+    def book_counts(self) -> Dict[str, int]:
+        """Titre -> nb de lignes qui le référencent (une fois par ligne)."""
+        return self._usage("book_ids", "book_ptr", self.books)
+
+    def origin_counts(self) -> Dict[str, int]:
+        return self._usage("origin_ids", "origin_ptr", self.origins)
+
+    # ---------------------------
+    # internals
+    # ---------------------------
+
+    def _text_id(self, value: Optional[str]) -> int:
+        return _NONE if value is None else self.strings.intern(value)
+
+    def _text(self, sid: int) -> Optional[str]:
+        return None if sid == _NONE else self.strings.labels[sid]
+
+    def _name_rank(self) -> List[int]:
+        """Rang de chaque ligne dans l'ordre des noms (casse ignorée, puis ordre des lignes)."""
+        rank = self._derived.get("name_rank")
+        if rank is None:
+            labels = self.strings.labels
+            lowered = [labels[n].lower() for n in self.name_ids]
+            rank = [0] * len(lowered)
+            for r, i in enumerate(sorted(range(len(lowered)), key=lowered.__getitem__)):
+                rank[i] = r
+            self._derived["name_rank"] = rank
+        return rank
+
+    def _name_rank_np(self):
+        view = self._derived.get("name_rank_np")
+        if view is None:
+            view = np.asarray(self._name_rank(), dtype=np.int64)
+            self._derived["name_rank_np"] = view
+        return view
+
+    def _np(self, column: str):
+        """Vue NumPy (sans copie) d'une colonne array."""
+        view = self._derived.get(column)
+        if view is None:
+            col = getattr(self, column)
+            view = np.frombuffer(col, dtype=f"i{col.itemsize}") if len(col) else np.zeros(0, dtype=np.int64)
+            self._derived[column] = view
+        return view
+
+    def _owners(self, ptr: str):
+        """Ligne propriétaire de chaque référence CSR."""
+        key = f"{ptr}_owner"
+        owner = self._derived.get(key)
+        if owner is None:
+            owner = np.repeat(np.arange(len(self)), np.diff(self._np(ptr)))
+            self._derived[key] = owner
+        return owner
+
+    def _filter_numpy(self, code, book_set, origin_set, lo, hi, rows) -> List[int]:
+        mask = np.ones(len(self), dtype=bool)
+        if code is not None:
+            mask &= self._np("cat_codes") == code
+        if lo is not None:
+            mask &= self._np("difficulties") >= lo
+        if hi is not None:
+            mask &= self._np("difficulties") <= hi
+        for ids, col, ptr in ((book_set, "book_ids", "book_ptr"), (origin_set, "origin_ids", "origin_ptr")):
+            if ids is None:
+                continue
+            hit = np.zeros(len(self), dtype=bool)
+            if ids:
+                refs = np.isin(self._np(col), np.fromiter(ids, dtype=np.int64, count=len(ids)))
+                hit[self._owners(ptr)[refs]] = True
+            mask &= hit
+        if rows is None:
+            return np.flatnonzero(mask).tolist()
+        idx = np.asarray(rows, dtype=np.int64)
+        return idx[mask[idx]].tolist()
+
+    def _filter_python(self, code, book_set, origin_set, lo, hi, rows) -> List[int]:
+        out: List[int] = []
+        for i in (range(len(self)) if rows is None else rows):
+            if code is not None and self.cat_codes[i] != code:
+                continue
+            d = self.difficulties[i]
+            if (lo is not None and d < lo) or (hi is not None and d > hi):
+                continue
+            if book_set is not None and not _refs_any(self.book_ids, self.book_ptr, i, book_set):
+                continue
+            if origin_set is not None and not _refs_any(self.origin_ids, self.origin_ptr, i, origin_set):
+                continue
+            out.append(i)
+        return out
+
+    def _usage(self, col: str, ptr: str, labels: LabelIds) -> Dict[str, int]:
+        if numpy_available():
+            refs = self._np(col)
+            if not len(refs):
+                return {}
+            n_labels = len(labels.labels)
+            pairs = np.unique(self._owners(ptr).astype(np.int64) * n_labels + refs)  # (ligne, id) distincts
+            counts = np.bincount(pairs % n_labels, minlength=n_labels).tolist()
+        else:
+            counts = [0] * len(labels.labels)
+            ids, offsets = getattr(self, col), getattr(self, ptr)
+            for i in range(len(self)):
+                for x in set(ids[offsets[i]:offsets[i + 1]]):
+                    counts[x] += 1
+        return {labels.labels[x]: n for x, n in enumerate(counts) if n}
+
+
+def _known_ids(labels: LabelIds, values: Optional[Iterable[str]]):
+    """None = pas de critère ; sinon ids connus (ensemble vide : rien ne passe)."""
+    if values is None:
+        return None
+    return {labels.ids[v] for v in values if v in labels.ids}
+
+
+def _refs_any(ids, ptr, i: int, wanted) -> bool:
+    return any(x in wanted for x in ids[ptr[i]:ptr[i + 1]])
@@ -0,0 +1,113 @@
+"""
+Correspondance sélection -> recette (pur, pas d'I/O), alignée sur
+PotionBuilder/js/creator/compute.js (computePotion) :
+- une sélection correspond à une alternative si elle contient EXACTEMENT ses
+  ingrédients (ordre indifférent, même longueur) ;
+- la 1re recette (ordre du fichier) débloquée par les livres possédés gagne ;
+- difficulté = somme des difficultés, moins le bonus de la recette, plancher à 0.
+
+Chaque alternative est réduite à une signature canonique indépendante de l'ordre,
+indexée une fois : une correspondance coûte O(1) au lieu d'un parcours complet.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from domain.models import Recipe
+
+# (longueur, ensemble) : même test que compute.js (length + Set)
+ComboSignature = Tuple[int, FrozenSet[str]]
+
+
+def combo_signature(names: Iterable[str]) -> ComboSignature:
+    items = [n for n in names if n]
+    return (len(items), frozenset(items))
+
+
+def normalize_book_title(title: str) -> str:
+    return str(title or "").strip().lower()
+
+
+def is_unlocked_by_books(required: Iterable[str], owned: Iterable[str]) -> bool:
+    """Même sémantique que isUnlockedByBooks (shared/data.js)."""
+    req = {normalize_book_title(b) for b in (required or [])} - {""}
+    if not req:
+        return True
+    owned_set = {normalize_book_title(b) for b in (owned or [])} - {""}
+    if not owned_set:
+        return False
+    return not req.isdisjoint(owned_set)
+
+
+@dataclass(frozen=True)
+class PotionResult:
+    total_difficulty: float
+    math_line: str
+    recipe: Optional[Recipe]
+
+
+class RecipeMatcher:
+    """
+    Index signature -> recettes (ordre du fichier conservé).
+    - difficulties : {nom ingrédient: difficulté} ; inconnu = 0 (comme le JS)
+    """
+
+    def __init__(self, recipes: Sequence[Recipe], difficulties: Optional[Mapping[str, int]] = None) -> None:
+        self.recipes: List[Recipe] = list(recipes)
+        self.difficulties: Mapping[str, int] = difficulties or {}
+        self._index: Dict[ComboSignature, List[int]] = {}
+        for pos, rec in enumerate(self.recipes):
+            for combo in rec.combos or []:
+                bucket = self._index.setdefault(combo_signature(combo), [])
+                if not bucket or bucket[-1] != pos:  # une recette par signature, une fois
+                    bucket.append(pos)
+
+    def candidates(self, names: Iterable[str]) -> List[Recipe]:
+        """Toutes les recettes (ordre du fichier) ayant une alternative égale à la sélection."""
+        return [self.recipes[i] for i in self._index.get(combo_signature(names), [])]
+
+    def match(self, names: Iterable[str], owned_books: Optional[Iterable[str]] = None) -> Optional[Recipe]:
+        owned = list(owned_books or [])
+        for rec in self.candidates(names):
+            if is_unlocked_by_books(rec.books, owned):
+                return rec
+        return None
+
+    def compute(
+        self,
+        *,
+        binder: Optional[str] = None,
+        catalyst: Optional[str] = None,
+        reactants: Sequence[str] = (),
+        owned_books: Optional[Iterable[str]] = None,
+    ) -> PotionResult:
+        """Équivalent de computePotion(sel)."""
+        bits: List[str] = []
+        total = 0
+        picked: List[str] = []
+        for name, label in [(binder, "Liant"), (catalyst, "Catalyseur")] + [(r, "Réactif") for r in reactants]:
+            if not name:
+                continue
+            diff = int(self.difficulties.get(name, 0) or 0)
+            total += diff
+            bits.append(f"{diff} ({label})")
+            picked.append(name)
+
+        matched = self.match(picked, owned_books)
+        if matched is not None and matched.bonus:
+            total = max(0, total - matched.bonus)
+            bits.append(f"- bonus de recette ({_fmt_number(matched.bonus)})")
+
+        return PotionResult(
+            total_difficulty=total,
+            math_line=" + ".join(bits).replace("+ -", "- ", 1),  # String.replace JS : 1re occurrence
+            recipe=matched,
+        )
+
+
+# --- internals ---
+
+def _fmt_number(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else str(v)
@@ -0,0 +1,112 @@
+"""
+Appartenance livres / origines en masques de bits (pur, pas d'I/O).
+
+Chaque titre de livre et chaque origine (chaîne exacte) reçoit un petit id entier ;
+chaque ingrédient porte un int dont le bit i est levé s'il référence l'id i.
+« possède un de ces livres », « débloqué par les livres possédés » et les comptages
+d'usage deviennent des opérations bit à bit au lieu de tests `x in liste`.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from domain.matching import normalize_book_title
+from domain.models import Ingredient
+
+
+class LabelIds:
+    """Interning chaîne -> id (ordre d'apparition)."""
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.labels: List[str] = []
+
+    def intern(self, label: str) -> int:
+        i = self.ids.get(label)
+        if i is None:
+            i = self.ids[label] = len(self.labels)
+            self.labels.append(label)
+        return i
+
+    def mask(self, labels: Iterable[str]) -> int:
+        """Masque des libellés connus (les inconnus ne matchent rien)."""
+        m = 0
+        for label in labels:
+            i = self.ids.get(label)
+            if i is not None:
+                m |= 1 << i
+        return m
+
+    def mask_where(self, predicate: Callable[[str], bool]) -> int:
+        m = 0
+        for i, label in enumerate(self.labels):
+            if predicate(label):
+                m |= 1 << i
+        return m
+
+
+class MembershipIndex:
+    """Masques livres/origines des ingrédients, dans l'ordre de la séquence fournie."""
+
+    def __init__(self, ingredients: Sequence[Ingredient]) -> None:
+        self.ingredients: List[Ingredient] = list(ingredients)
+        self.books = LabelIds()
+        self.origins = LabelIds()
+        self.book_masks: List[int] = []
+        self.origin_masks: List[int] = []
+        for ing in self.ingredients:
+            m = 0
+            for b in ing.books or []:
+                m |= 1 << self.books.intern(b)
+            self.book_masks.append(m)
+            m = 0
+            for o in ing.origins or []:
+                m |= 1 << self.origins.intern(o)
+            self.origin_masks.append(m)
+        # titres vides : ignorés par isUnlockedByBooks
+        self._blank_books = self.books.mask_where(lambda t: not normalize_book_title(t))
+
+    # --- requêtes ---
+
+    def has_any_book(self, pos: int, mask: int) -> bool:
+        return bool(self.book_masks[pos] & mask)
+
+    def has_any_origin(self, pos: int, mask: int) -> bool:
+        return bool(self.origin_masks[pos] & mask)
+
+    def owned_mask(self, owned_books: Iterable[str]) -> int:
+        """Masque « débloquant » : titres connus égaux (normalisés) à un livre possédé."""
+        owned = {normalize_book_title(b) for b in (owned_books or [])} - {""}
+        return self.books.mask_where(lambda t: normalize_book_title(t) in owned)
+
+    def is_unlocked(self, pos: int, owned_mask: int) -> bool:
+        """Même sémantique que domain.matching.is_unlocked_by_books."""
+        required = self.book_masks[pos] & ~self._blank_books
+        return not required or bool(required & owned_mask)
+
+    def unlocked_by(self, owned_books: Iterable[str]) -> List[Ingredient]:
+        """Ingrédients débloqués par un ensemble de livres."""
+        owned = self.owned_mask(owned_books)
+        return [ing for pos, ing in enumerate(self.ingredients) if self.is_unlocked(pos, owned)]
+
+    def book_usage(self) -> Dict[str, int]:
+        """Nombre d'ingrédients référençant chaque livre."""
+        return _bit_counts(self.book_masks, self.books.labels)
+
+    def origin_usage(self) -> Dict[str, int]:
+        return _bit_counts(self.origin_masks, self.origins.labels)
+
+
+# --- internals ---
+
+def _bit_counts(masks: Iterable[int], labels: List[str]) -> Dict[str, int]:
+    # beaucoup d'ingrédients partagent le même masque : on ne décompose que les masques distincts
+    counts = [0] * len(labels)
+    for m, n in Counter(masks).items():
+        while m:
+            low = m & -m
+            counts[low.bit_length() - 1] += n
+            m ^= low
+    return dict(zip(labels, counts))
@@ -0,0 +1,45 @@
+"""
+NumPy optionnel, importé au premier calcul vectorisé (hors du chemin de démarrage).
+
+- numpy_available() : importe NumPy au premier appel (une seule fois, sous verrou :
+  un thread concurrent attend la fin de l'import) ; False s'il manque ;
+- np : s'utilise comme le module numpy, chaque attribut étant résolu au premier
+  accès. À n'employer qu'après numpy_available() -> True.
+"""
+
+from __future__ import annotations
+
+import threading
+
+_lock = threading.Lock()
+_module = None
+_loaded = False
+
+
+def numpy_available() -> bool:
+    """True si NumPy est importable (import au premier appel) ; sinon repli pur Python."""
+    global _module, _loaded
+    if not _loaded:
+        with _lock:
+            if not _loaded:
+                try:
+                    import numpy
+                except ImportError:  # optionnel : repli pur Python
+                    numpy = None
+                _module = numpy
+                _loaded = True   # après l'import : aucun thread ne voit un module absent
+    return _module is not None
+
+
+class _LazyNumpy:
+    """Façade du module numpy ; attribut mis en cache après le premier accès."""
+
+    def __getattr__(self, attr):
+        if not numpy_available():
+            raise AttributeError(f"NumPy indisponible ({attr})")
+        value = getattr(_module, attr)
+        self.__dict__[attr] = value
+        return value
+
+
+np = _LazyNumpy()
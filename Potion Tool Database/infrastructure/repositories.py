@@ -8,29 +8,76 @@ Repositories concrets (JSON/JS) pour ingrédients, recettes et data.js.
 
 from __future__ import annotations
 
+import os
 import threading
-from typing import Iterable, List, Optional
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional
 
 from domain.models import Ingredient, Recipe
+from domain.ingredient_table import IngredientTable
 from domain.errors import RepositoryError, NotFoundError, DuplicateNameError
 from adapters.mapping import (
-    ingredient_to_dto, ingredient_from_dto,
-    recipe_to_dto, recipe_from_dto,
+    ingredient_to_dto, ingredient_from_dto, ingredient_table_from_dtos,
+    recipe_to_dto, recipe_from_dto, StringPool,
     ensure_origin_tree, ensure_books_list,
 )
 from .io_json import read_json_file, write_json_file
 from .io_jsdata import read_data_js, write_data_js
 
 
+# ---------- Notifications ----------
+
+@dataclass(frozen=True)
+class RepoChange:
+    """
+    Écriture faite par le repo (les modifications externes du fichier n'en émettent pas).
+    - before / after : entité avant / après (None pour un ajout / une suppression)
+    - base / version : version du repo avant / après l'écriture
+    """
+    before: Optional[object]
+    after: Optional[object]
+    base: tuple
+    version: tuple
+
+
 # ---------- Base thread-safe mixin ----------
 
 class _LockingRepo:
+    path: str
+
     def __init__(self) -> None:
         self._lock = threading.RLock()
+        self._writes = 0
+        self._listeners: List[Callable[[RepoChange], None]] = []
 
     def _locked(self):
         return self._lock
 
+    def version(self) -> tuple:
+        """
+        Jeton de version du fichier : change à chaque écriture (y compris externe).
+        Sert de clé aux caches/index dérivés du dataset.
+        """
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size, self._writes)
+        except OSError:
+            return (None, None, self._writes)
+
+    def _touch(self) -> None:
+        self._writes += 1
+
+    def subscribe(self, listener: Callable[[RepoChange], None]) -> None:
+        """listener(change) appelé après chaque add/update/delete effectif, sous le verrou."""
+        self._listeners.append(listener)
+
+    def _notify(self, before, after, base: tuple) -> None:
+        if not self._listeners:
+            return
+        change = RepoChange(before=before, after=after, base=base, version=self.version())
+        for listener in list(self._listeners):
+            listener(change)
+
 
 # ---------- Ingredients ----------
 
@@ -44,7 +91,13 @@ class JsonIngredientRepo(_LockingRepo):
     def list_all(self) -> List[Ingredient]:
         with self._locked():
             dtos = read_json_file(self.path, expect_list=True)
-            return [ingredient_from_dto(d) for d in dtos]
+            pool = StringPool()
+            return [ingredient_from_dto(d, pool) for d in dtos]
+
+    def load_table(self) -> IngredientTable:
+        """Même contenu que list_all(), en colonnes (pas d'objet Ingredient)."""
+        with self._locked():
+            return ingredient_table_from_dtos(read_json_file(self.path, expect_list=True))
 
     def get_by_name(self, name: str) -> Ingredient:
         with self._locked():
@@ -55,35 +108,42 @@ class JsonIngredientRepo(_LockingRepo):
 
     def add(self, ing: Ingredient) -> None:
         with self._locked():
+            base = self.version()
             items = self.list_all()
             if any(i.name == ing.name for i in items):
                 raise DuplicateNameError(f"Ingrédient déjà existant: {ing.name!r}")
             items.append(ing)
             self._save(items)
+            self._notify(None, ing, base)
 
     def update(self, ing: Ingredient) -> None:
         with self._locked():
+            base = self.version()
             items = self.list_all()
             idx = next((i for i, it in enumerate(items) if it.name == ing.name), -1)
             if idx < 0:
                 raise NotFoundError(f"Ingrédient introuvable: {ing.name!r}")
-            items[idx] = ing
+            before, items[idx] = items[idx], ing
             self._save(items)
+            self._notify(before, ing, base)
 
     def delete(self, name: str) -> None:
         with self._locked():
+            base = self.version()
             items = self.list_all()
             new_items = [i for i in items if i.name != name]
             if len(new_items) == len(items):
                 # idempotent
                 return
             self._save(new_items)
+            self._notify(next(i for i in items if i.name == name), None, base)
 
     # --- Internes ---
 
     def _save(self, items: Iterable[Ingredient]) -> None:
         dtos = [ingredient_to_dto(i) for i in items]
         write_json_file(self.path, dtos)
+        self._touch()
 
 
 # ---------- Recipes ----------
@@ -96,7 +156,8 @@ class JsonRecipeRepo(_LockingRepo):
     def list_all(self) -> List[Recipe]:
         with self._locked():
             dtos = read_json_file(self.path, expect_list=True)
-            return [recipe_from_dto(d) for d in dtos]
+            pool = StringPool()
+            return [recipe_from_dto(d, pool) for d in dtos]
 
     def get_by_name(self, name: str) -> Recipe:
         with self._locked():
@@ -107,32 +168,39 @@ class JsonRecipeRepo(_LockingRepo):
 
     def add(self, recipe: Recipe) -> None:
         with self._locked():
+            base = self.version()
             items = self.list_all()
             if any(r.name == recipe.name for r in items):
                 raise DuplicateNameError(f"Recette déjà existante: {recipe.name!r}")
             items.append(recipe)
             self._save(items)
+            self._notify(None, recipe, base)
 
     def update(self, recipe: Recipe) -> None:
         with self._locked():
+            base = self.version()
             items = self.list_all()
             idx = next((i for i, it in enumerate(items) if it.name == recipe.name), -1)
             if idx < 0:
                 raise NotFoundError(f"Recette introuvable: {recipe.name!r}")
-            items[idx] = recipe
+            before, items[idx] = items[idx], recipe
             self._save(items)
+            self._notify(before, recipe, base)
 
     def delete(self, name: str) -> None:
         with self._locked():
+            base = self.version()
             items = self.list_all()
             new_items = [r for r in items if r.name != name]
             if len(new_items) == len(items):
                 return
             self._save(new_items)
+            self._notify(next(r for r in items if r.name == name), None, base)
 
     def _save(self, items: Iterable[Recipe]) -> None:
         dtos = [recipe_to_dto(r) for r in items]
         write_json_file(self.path, dtos)
+        self._touch()
 
 
 # ---------- Data.js (ORIGIN_TREE + BOOKS) ----------
@@ -161,6 +229,7 @@ class JsDataRepo(_LockingRepo):
         with self._locked():
             origin_tree, _ = read_data_js(self.path)
             write_data_js(self.path, origin_tree=ensure_origin_tree(origin_tree), books=ensure_books_list(books))
+            self._touch()
 
     # --- origines ---
 
@@ -173,3 +242,4 @@ class JsDataRepo(_LockingRepo):
         with self._locked():
             _, books = read_data_js(self.path)
             write_data_js(self.path, origin_tree=ensure_origin_tree(tree), books=ensure_books_list(books))
+            self._touch()
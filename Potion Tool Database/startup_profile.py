@@ -0,0 +1,183 @@
+"""
+Profilage du démarrage, activé par la variable d'environnement POTION_PROFILE_STARTUP.
+
+- coût de chaque import, à la manière de `python -X importtime` (temps propre et
+  cumulé), mesuré par un chercheur placé en tête de sys.meta_path ;
+- horodatage des phases (imports, config, container, fenêtre, premier affichage) ;
+- rapport imprimé sur stderr au premier affichage de la fenêtre, comparé à
+  STARTUP_TARGET_MS (objectif de temps jusqu'à la première fenêtre).
+
+POTION_PROFILE_STARTUP=exit quitte l'application juste après le rapport (mesures
+répétées, cf. benchmarks/bench_startup.py).
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from importlib.abc import MetaPathFinder
+from typing import List, Optional, TextIO, Tuple
+
+ENV_FLAG = "POTION_PROFILE_STARTUP"
+STARTUP_TARGET_MS = 1500.0
+REPORT_TOP_IMPORTS = 25
+
+
+class _TimedLoader:
+    """Enveloppe un loader le temps d'un import ; le loader d'origine est remis en place à l'exécution."""
+
+    def __init__(self, loader, timer: "_ImportTimer", name: str) -> None:
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        self._timer.enter(self._name)
+        try:
+            create = getattr(self._loader, "create_module", None)
+            return create(spec) if create is not None else None
+        except BaseException:
+            self._timer.leave()
+            raise
+
+    def exec_module(self, module) -> None:
+        spec = getattr(module, "__spec__", None)
+        if spec is not None and spec.loader is self:
+            spec.loader = self._loader
+        if getattr(module, "__loader__", None) is self:
+            module.__loader__ = self._loader
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.leave()
+
+
+class _ImportTimer(MetaPathFinder):
+    """Ne mesure que les imports du thread qui l'a créé (le chemin de démarrage)."""
+
+    def __init__(self) -> None:
+        self._thread = threading.get_ident()   # imports des threads de travail : non mesurés
+        self._stack: List[list] = []   # [nom, début, cumul des imports enfants]
+        self.records: List[Tuple[str, float, float]] = []   # (nom, propre, cumulé) en secondes
+
+    def find_spec(self, name, path, target=None):
+        if threading.get_ident() != self._thread:
+            return None
+        for finder in sys.meta_path:
+            find = getattr(finder, "find_spec", None)
+            if finder is self or find is None:
+                continue
+            spec = find(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self, name)
+        return spec
+
+    def enter(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def leave(self) -> None:
+        name, start, children = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        self.records.append((name, cumulative - children, cumulative))
+        if self._stack:
+            self._stack[-1][2] += cumulative
+
+
+class StartupProfiler:
+    """
+    Profileur de démarrage ; inactif (méthodes sans effet) si la variable
+    d'environnement n'est pas définie.
+    """
+
+    def __init__(self, enabled: bool, exit_after_report: bool = False,
+                 target_ms: float = STARTUP_TARGET_MS) -> None:
+        self.enabled = enabled
+        self.exit_after_report = exit_after_report
+        self.target_ms = target_ms
+        self._t0 = time.perf_counter()
+        self._phases: List[Tuple[str, float]] = []
+        self._imports: Optional[_ImportTimer] = None
+        self._filter = None
+        self._reported = False
+
+    @classmethod
+    def from_env(cls) -> "StartupProfiler":
+        flag = os.environ.get(ENV_FLAG, "").strip().lower()
+        return cls(enabled=flag not in ("", "0", "false"), exit_after_report=(flag == "exit"))
+
+    def start(self) -> None:
+        """Remet le chrono à zéro et commence à mesurer les imports."""
+        if not self.enabled:
+            return
+        self._t0 = time.perf_counter()
+        self._imports = _ImportTimer()
+        sys.meta_path.insert(0, self._imports)
+
+    def mark(self, phase: str) -> None:
+        if self.enabled:
+            self._phases.append((phase, time.perf_counter() - self._t0))
+
+    def watch_first_paint(self, window, app) -> None:
+        """Marque 'premier affichage' au premier PaintEvent de la fenêtre, puis imprime le rapport."""
+        if not self.enabled:
+            return
+        from PySide6.QtCore import QEvent, QObject, QTimer
+
+        profiler = self
+
+        class _FirstPaint(QObject):
+            def eventFilter(self, obj, event):  # noqa: N802 (API Qt)
+                if event.type() == QEvent.Paint and not profiler._reported:
+                    profiler.mark("premier affichage")
+                    window.removeEventFilter(self)
+                    # rapport après la fin de la peinture en cours
+                    QTimer.singleShot(0, profiler._finish(app))
+                return False
+
+        self._filter = _FirstPaint(window)
+        window.installEventFilter(self._filter)
+
+    def _finish(self, app):
+        def run() -> None:
+            self.report()
+            if self.exit_after_report:
+                app.quit()
+        return run
+
+    def stop(self) -> None:
+        if self._imports is not None and self._imports in sys.meta_path:
+            sys.meta_path.remove(self._imports)
+
+    def report(self, out: Optional[TextIO] = None) -> None:
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        self.stop()
+        out = out or sys.stderr
+        print("=== Profil de démarrage ===", file=out)
+        prev = 0.0
+        for phase, at in self._phases:
+            print(f"  {phase:<20} {at * 1000:8.1f} ms  (+{(at - prev) * 1000:.1f} ms)", file=out)
+            prev = at
+        first_window = dict(self._phases).get("premier affichage")
+        if first_window is not None:
+            ms = first_window * 1000
+            verdict = "OK" if ms <= self.target_ms else "AU-DESSUS"
+            print(f"  objectif première fenêtre : {self.target_ms:.0f} ms -> {ms:.0f} ms ({verdict})", file=out)
+
+        records = self._imports.records if self._imports is not None else []
+        if records:
+            print(f"--- imports ({len(records)} modules, {REPORT_TOP_IMPORTS} plus coûteux) ---", file=out)
+            print(f"  {'propre [ms]':>11} | {'cumulé [ms]':>11} | module", file=out)
+            for name, own, cumulative in sorted(records, key=lambda r: r[2], reverse=True)[:REPORT_TOP_IMPORTS]:
+                print(f"  {own * 1000:11.1f} | {cumulative * 1000:11.1f} | {name}", file=out)
+        out.flush()
@@ -0,0 +1,46 @@
+"""IngredientTable : ajouts après lecture (vues NumPy mises en cache)."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.ingredient_table import IngredientTable  # noqa: E402
+
+
+def _table() -> IngredientTable:
+    table = IngredientTable()
+    table.append(name="Eau pure", cat="Liant", difficulty=1, books=["Livre A"], origins=["Lac"])
+    table.append(name="Sel marin", cat="Réactif", difficulty=3, books=["Livre B"], origins=["Côte"])
+    return table
+
+
+def _assert_aligned(table: IngredientTable) -> None:
+    n = len(table)
+    for col in (table.cat_codes, table.difficulties, table.short_ids, table.effect_ids):
+        assert len(col) == n
+    assert len(table.book_ptr) == len(table.origin_ptr) == n + 1
+
+
+def test_append_after_filter():
+    table = _table()
+    assert table.filter(cat="Réactif") == [1]
+    table.append(name="Poudre d'os", cat="Réactif", difficulty=5, books=["Livre A"])
+    _assert_aligned(table)
+    assert table.filter(cat="Réactif") == [1, 2]
+    assert table.filter(books=["Livre A"]) == [0, 2]
+
+
+def test_append_after_sort_and_aggregates():
+    table = _table()
+    table.sort(by="difficulty")
+    table.count_by_category()
+    table.difficulty_stats()
+    table.origin_counts()
+    table.append(name="Ambre", cat="Catalyseur", difficulty=2, origins=["Lac"])
+    _assert_aligned(table)
+    assert table.names(table.sort(by="difficulty")) == ["Eau pure", "Ambre", "Sel marin"]
+    assert table.difficulty_stats() == (1, 3, 2.0)
+    assert table.origin_counts() == {"Lac": 2, "Côte": 1}
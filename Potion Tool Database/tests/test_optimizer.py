@@ -0,0 +1,49 @@
+"""ComboOptimizer.best_combos : séparation-évaluation comparée à l'énumération complète."""
+
+from __future__ import annotations
+
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from application.optimizer import ComboOptimizer  # noqa: E402
+from domain.matching import RecipeMatcher  # noqa: E402
+from domain.models import Ingredient  # noqa: E402
+
+
+def _brute_force(ingredients, k, max_reactants):
+    """Toutes les alternatives valides (sans recette), classées comme _rank : (total, noms)."""
+    def by_cat(cat):
+        items = [i for i in ingredients if i.cat == cat]
+        return sorted(items, key=lambda i: (i.difficulty, i.name.lower()))
+
+    reac = by_cat("Réactif")
+    out = []
+    for li in [None] + by_cat("Liant"):
+        for ca in [None] + by_cat("Catalyseur"):
+            for n in range(1, max_reactants + 1):
+                for picked in itertools.combinations(reac, n):
+                    combo = [x for x in (li, ca) if x is not None] + list(picked)
+                    total = sum(i.difficulty for i in combo)
+                    out.append((total, [i.name.lower() for i in combo]))
+    out.sort()
+    return out[:k]
+
+
+def test_best_combos_matches_brute_force_with_ties():
+    rnd = random.Random(7)
+    for _ in range(30):
+        # peu de difficultés distinctes : beaucoup d'égalités de total
+        ingredients = [
+            Ingredient(name=f"{cat[0]}{n:02d}", cat=cat, difficulty=rnd.choice([-2, 0, 1, 1, 3]))
+            for cat, count in (("Liant", 3), ("Catalyseur", 3), ("Réactif", 6))
+            for n in rnd.sample(range(50), count)
+        ]
+        optimizer = ComboOptimizer(ingredients, RecipeMatcher([]))
+        for k in (1, 4, 10):
+            got = [(c.total_difficulty, [n.lower() for n in c.ingredients])
+                   for c in optimizer.best_combos(k=k, max_reactants=2)]
+            assert got == _brute_force(ingredients, k, 2)
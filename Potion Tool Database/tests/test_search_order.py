@@ -0,0 +1,43 @@
+"""Recherche d'ingrédients : classement du presenter (exacts d'abord, puis noms approchés)."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+from Start import build_container  # noqa: E402
+
+
+def _presenter(tmp_path):
+    ingredients = [
+        # un Liant approché passerait avant les Réactifs exacts dans l'ordre de liste
+        {"name": "Baie de Sanford", "cat": "Liant", "difficulty": 1, "books": [], "origins": []},
+        {"name": "Sang de Loup", "cat": "Réactif", "difficulty": 5, "books": [], "origins": []},
+        {"name": "Graisse de Sanglier", "cat": "Réactif", "difficulty": 3, "books": [], "origins": []},
+        {"name": "Eau pure", "cat": "Liant", "difficulty": -30, "books": [], "origins": []},
+    ]
+    (tmp_path / "ingredients.json").write_text(json.dumps(ingredients), encoding="utf-8")
+    (tmp_path / "recipes.json").write_text("[]", encoding="utf-8")
+    cfg = dataclasses.replace(
+        Config.load(),
+        ingredients_path=str(tmp_path / "ingredients.json"),
+        recipes_path=str(tmp_path / "recipes.json"),
+        data_js_path=str(tmp_path / "data.js"),
+    )
+    return build_container(cfg)["presenters"]["ingredients"]
+
+
+def test_exact_matches_before_fuzzy(tmp_path):
+    names = [vm.name for vm in _presenter(tmp_path).list_ingredients(query="sang")]
+    assert names[:2] == ["Sang de Loup", "Graisse de Sanglier"]
+    assert names[2:] == ["Baie de Sanford"]
+
+
+def test_no_query_lists_everything(tmp_path):
+    names = [vm.name for vm in _presenter(tmp_path).list_ingredients()]
+    assert sorted(names) == sorted(["Baie de Sanford", "Sang de Loup", "Graisse de Sanglier", "Eau pure"])
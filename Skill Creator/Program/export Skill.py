@@ -9,7 +9,6 @@ Extrait les compétences avec dégâts depuis skills_data.json et exporte un Exc
 
 import json, re
 from pathlib import Path
-import pandas as pd
 
 INPUT_JSON = Path("skills_data.json")
 OUTPUT_XLSX = Path("skills_degats_par_niveau.xlsx")
@@ -66,6 +65,12 @@ def main():
             "Effets": " ".join(s.get("effects", [])),
         })
 
+    if not rows:
+        print("Aucune compétence avec dégâts : rien à exporter.")
+        return
+
+    import pandas as pd  # import lourd : seulement si un export a lieu
+
     df = pd.DataFrame(rows)
     level_order = {"Niv1": 1, "Niv2": 2, "Niv3": 3}
     df["__lvl__"] = df["Niveau"].map(level_order).fillna(99).astype(int)
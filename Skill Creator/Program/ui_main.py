@@ -24,13 +24,14 @@ from PySide6.QtWidgets import (
     QToolButton,
     QFileDialog,
 )
-from qt_material import apply_stylesheet
 
 from .datastore import DataStore
 from .ui_create_family import CreateFamilyTab
 from .ui_create_skill import CreateSkillTab
 from .ui_view_skills import ViewSkillsTab
 from .ui_view_families import ViewFamiliesTab
+from .theme_cache import ThemeCache, default_cache_dir
+from .widgets import LazyTab, TabPrebuilder
 
 
 class MainWindow(QMainWindow):
@@ -49,6 +50,7 @@ class MainWindow(QMainWindow):
         self.settings = QSettings("UnifoxGameStudio", "SkillCreator")
         self._is_dark = self.settings.value("ui/is_dark", True, type=bool)
         self._theme_color = self.settings.value("ui/theme_color", "teal", type=str)
+        self._themes = ThemeCache(default_cache_dir("UnifoxGameStudio", "SkillCreator"))
         self._apply_theme_values(self._is_dark, self._theme_color)
 
         self._tabs = QTabWidget(self)
@@ -64,21 +66,25 @@ class MainWindow(QMainWindow):
         )
         self.setCentralWidget(self._tabs)
 
-        self.tab_create_family = CreateFamilyTab(self.store)
-        self.tab_create_skill = CreateSkillTab(self.store)
-        self.tab_view_skills = ViewSkillsTab(self.store)
-        self.tab_view_families = ViewFamiliesTab(self.store)
-
-        self._tabs.addTab(self.tab_view_skills, "Afficher Compétences")
-        self._tabs.addTab(self.tab_create_skill, "Créer Compétence")
-        self._tabs.addTab(self.tab_create_family, "Créer Famille")
-        self._tabs.addTab(self.tab_view_families, "Afficher Familles")
+        # Tabs are placeholders until first activation; the tab_* attributes stay
+        # None until the matching page is built (see the _build_* factories).
+        self.tab_create_family: Optional[CreateFamilyTab] = None
+        self.tab_create_skill: Optional[CreateSkillTab] = None
+        self.tab_view_skills: Optional[ViewSkillsTab] = None
+        self.tab_view_families: Optional[ViewFamiliesTab] = None
 
-        self.tab_create_family.family_created.connect(self._on_family_created)
-        self.tab_create_skill.skill_created.connect(self._on_skill_created)
+        self._tabs.addTab(LazyTab(self._build_view_skills), "Afficher Compétences")
+        self._tabs.addTab(LazyTab(self._build_create_skill), "Créer Compétence")
+        self._tabs.addTab(LazyTab(self._build_create_family), "Créer Famille")
+        self._tabs.addTab(LazyTab(self._build_view_families), "Afficher Familles")
 
+        self._tabs.currentWidget().ensure_built()
         self._tabs.currentChanged.connect(self._maybe_refresh)
 
+        self._prebuilder = TabPrebuilder(self._tabs)
+        if self.settings.value("ui/prebuild_tabs", True, type=bool):
+            self._prebuilder.start()
+
         corner = QWidget(self)
         hlay = QHBoxLayout(corner)
         hlay.setContentsMargins(0, 0, 8, 0)
@@ -102,7 +108,7 @@ class MainWindow(QMainWindow):
         corner.setFixedHeight(46)
         self._tabs.setCornerWidget(corner, Qt.TopRightCorner)
 
-        self._apply_theme()
+        # The app stylesheet applied above already covers the widgets built since.
         self._update_theme_button_caption()
 
         self._build_menu()
@@ -125,8 +131,29 @@ class MainWindow(QMainWindow):
         act.triggered.connect(slot)
         return act
 
+    def _build_create_family(self) -> CreateFamilyTab:
+        self.tab_create_family = CreateFamilyTab(self.store)
+        self.tab_create_family.family_created.connect(self._on_family_created)
+        return self.tab_create_family
+
+    def _build_create_skill(self) -> CreateSkillTab:
+        self.tab_create_skill = CreateSkillTab(self.store)
+        self.tab_create_skill.skill_created.connect(self._on_skill_created)
+        return self.tab_create_skill
+
+    def _build_view_skills(self) -> ViewSkillsTab:
+        self.tab_view_skills = ViewSkillsTab(self.store)
+        return self.tab_view_skills
+
+    def _build_view_families(self) -> ViewFamiliesTab:
+        self.tab_view_families = ViewFamiliesTab(self.store)
+        return self.tab_view_families
+
     def _maybe_refresh(self, idx: int) -> None:
         widget = self._tabs.widget(idx)
+        if isinstance(widget, LazyTab) and not widget.is_built():
+            widget.ensure_built()  # the tab constructor already refreshes
+            return
         if hasattr(widget, "refresh"):
             try:
                 widget.refresh()
@@ -149,9 +176,9 @@ class MainWindow(QMainWindow):
             chosen = "blue"
         theme_name = f"{'dark' if is_dark else 'light'}_{chosen}.xml"
         try:
-            apply_stylesheet(self.app, theme=theme_name, invert_secondary=(not is_dark and False))
+            self._themes.apply(self.app, theme_name, invert_secondary=(not is_dark and False))
         except Exception:
-            apply_stylesheet(self.app, theme='dark_blue.xml' if is_dark else 'light_blue.xml')
+            self._themes.apply(self.app, 'dark_blue.xml' if is_dark else 'light_blue.xml')
 
     def _preview_theme(self, *, is_dark: Optional[bool] = None, color: Optional[str] = None) -> None:
         tmp_dark = self._is_dark if is_dark is None else is_dark
@@ -177,20 +204,28 @@ class MainWindow(QMainWindow):
                 self._maybe_refresh(self._tabs.currentIndex())
 
     # ----- Data handling --------------------------------------------------
+    # Tabs not built yet read the current store when their factory runs.
     def _on_family_created(self) -> None:
-        self.tab_create_skill.refresh_families()
-        self.tab_view_families.refresh()
+        if self.tab_create_skill is not None:
+            self.tab_create_skill.refresh_families()
+        if self.tab_view_families is not None:
+            self.tab_view_families.refresh()
 
     def _on_skill_created(self) -> None:
-        self.tab_view_skills.refresh()
+        if self.tab_view_skills is not None:
+            self.tab_view_skills.refresh()
 
     def _set_store(self, store: DataStore) -> None:
         self.store = store
         for tab in (self.tab_create_family, self.tab_create_skill, self.tab_view_skills, self.tab_view_families):
-            tab.set_store(store)
-        self.tab_create_skill.refresh_families()
-        self.tab_view_skills.refresh()
-        self.tab_view_families.refresh()
+            if tab is not None:
+                tab.set_store(store)
+        if self.tab_create_skill is not None:
+            self.tab_create_skill.refresh_families()
+        if self.tab_view_skills is not None:
+            self.tab_view_skills.refresh()
+        if self.tab_view_families is not None:
+            self.tab_view_families.refresh()
 
     # ----- Menu actions ---------------------------------------------------
     def _load_other_file(self) -> None:
@@ -2,9 +2,10 @@
 """Reusable Qt widgets for the Skill Creator application."""
 from __future__ import annotations
 
-from typing import List
+from typing import Callable, List
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QTextEdit
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QTabWidget, QTextEdit
 
 
 class LabeledLineEdit(QWidget):
@@ -65,3 +66,72 @@ class LabeledTextEdit(QWidget):
 
     def toPlainText(self) -> str:
         return self._text.toPlainText()
+
+
+class LazyTab(QWidget):
+    """Lightweight tab placeholder; the real tab is built by ``factory`` on first use."""
+
+    built = Signal(QWidget)
+
+    def __init__(self, factory: Callable[[], QWidget], parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._factory: Callable[[], QWidget] | None = factory
+        self._widget: QWidget | None = None
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+    def is_built(self) -> bool:
+        return self._widget is not None
+
+    def widget(self) -> QWidget | None:
+        return self._widget
+
+    def ensure_built(self) -> QWidget:
+        if self._widget is None:
+            widget = self._factory()
+            self._factory = None
+            self._layout.addWidget(widget)
+            self._widget = widget
+            self.built.emit(widget)
+        return self._widget
+
+    def refresh(self) -> None:
+        """Build the tab (its constructor refreshes) or refresh the built tab."""
+        if self._widget is None:
+            self.ensure_built()
+        elif hasattr(self._widget, "refresh"):
+            self._widget.refresh()
+
+
+class TabPrebuilder(QObject):
+    """Build the remaining LazyTab pages while idle, one page per timer tick."""
+
+    def __init__(self, tabs: QTabWidget, delay_ms: int = 300, parent: QObject | None = None) -> None:
+        super().__init__(parent or tabs)
+        self._tabs = tabs
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._build_next)
+
+    def start(self) -> None:
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def _pending(self) -> List[LazyTab]:
+        pages = (self._tabs.widget(i) for i in range(self._tabs.count()))
+        return [page for page in pages if isinstance(page, LazyTab) and not page.is_built()]
+
+    def _build_next(self) -> None:
+        pending = self._pending()
+        if not pending:
+            return
+        try:
+            pending[0].ensure_built()
+        except Exception:
+            return  # retried, with the error visible, when the tab is activated
+        if len(pending) > 1:
+            self._timer.setInterval(0)
+            self._timer.start()